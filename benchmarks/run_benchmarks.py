@@ -0,0 +1,345 @@
+"""
+Benchmark runner for the main `biobalm` workloads.
+
+Each workload is executed for every model of the given corpora in a fresh
+worker process, such that the peak memory usage (RSS) can be measured and
+a workload can be terminated once it exceeds the time limit. The results
+are written as JSON, and two result files can be compared to find
+regressions.
+
+Usage (from the repository root, with `biobalm` installed):
+
+    python benchmarks/run_benchmarks.py run --output results.json
+    python benchmarks/run_benchmarks.py compare baseline.json results.json
+
+See `python benchmarks/run_benchmarks.py --help` for all options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable
+
+from biodivine_aeon import BooleanNetwork
+
+import biobalm
+from biobalm.control import succession_control
+from biobalm.succession_diagram import SuccessionDiagram
+
+try:
+    resource_available = True
+    import resource
+except ModuleNotFoundError:
+    resource_available = False
+
+DEFAULT_CORPUS = "models/bbm-bnet-inputs-true"
+
+
+def _prepare_control(sd: SuccessionDiagram) -> dict[str, Any]:
+    # The target is the first minimal trap space of the network.
+    sd.expand_minimal_spaces()
+    target = sd.node_data(sd.minimal_trap_spaces()[0])["space"]
+    return {"target": target}
+
+
+# For every workload: an (untimed) preparation step, which returns
+# the arguments of the (timed) workload.
+WORKLOADS: dict[
+    str,
+    tuple[
+        Callable[[SuccessionDiagram], dict[str, Any]],
+        Callable[..., Any],
+    ],
+] = {
+    "build": (lambda sd: {}, lambda sd: sd.build()),
+    "expand_scc": (lambda sd: {}, lambda sd: sd.expand_scc()),
+    "expand_block": (lambda sd: {}, lambda sd: sd.expand_block()),
+    "expand_attractor_seeds": (
+        lambda sd: {},
+        lambda sd: sd.expand_attractor_seeds(),
+    ),
+    "expanded_attractor_seeds": (
+        lambda sd: {"expanded": sd.expand_attractor_seeds()},
+        lambda sd, expanded: sd.expanded_attractor_seeds(),
+    ),
+    "succession_control": (
+        _prepare_control,
+        lambda sd, target: succession_control(sd, target),
+    ),
+}
+
+
+def _peak_rss() -> int | None:
+    """
+    The peak resident set size of the current process (in bytes).
+    """
+    if not resource_available:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _run_workload(path: str, workload: str) -> dict[str, Any]:
+    """
+    Run a single workload on a single model and collect the measurements.
+    """
+    bn = BooleanNetwork.from_file(path)
+    sd = SuccessionDiagram(bn)
+    (prepare, run) = WORKLOADS[workload]
+    arguments = prepare(sd)
+    sd.instrumentation.clear()
+
+    start = time.perf_counter()
+    run(sd, **arguments)
+    seconds = time.perf_counter() - start
+
+    report = sd.instrumentation.report()
+    phases = report["phases"]
+    solver_calls = sum(
+        phases.get(phase, {"calls": 0})["calls"]
+        for phase in ["trappist", "candidate_enumeration"]
+    )
+    return {
+        "seconds": seconds,
+        "peak_rss": _peak_rss(),
+        "nodes": len(sd),
+        "expanded_nodes": len(list(sd.expanded_ids())),
+        "solver_calls": solver_calls,
+        "phases": phases,
+    }
+
+
+def _worker(path: str, workload: str, queue: Any):
+    try:
+        queue.put(("ok", _run_workload(path, workload)))
+    except Exception as e:
+        queue.put(("error", f"{type(e).__name__}: {e}"))
+
+
+def run_benchmark(path: str, workload: str, timeout: float) -> dict[str, Any]:
+    """
+    Run a single workload in a fresh process. The result always contains
+    the `status` item (`ok`, `error` or `timeout`).
+    """
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_worker, args=(path, workload, queue))
+    process.start()
+    try:
+        (status, data) = queue.get(timeout=timeout)
+    except Exception:
+        (status, data) = ("timeout", None)
+    if status == "timeout":
+        process.kill()
+    process.join()
+    if status == "ok":
+        return {"status": status} | data
+    if status == "error":
+        return {"status": status, "error": data}
+    return {"status": status}
+
+
+def _model_files(corpora: list[str], network_size: int | None) -> list[str]:
+    files: list[str] = []
+    for corpus in corpora:
+        for model in sorted(os.listdir(corpus)):
+            if not model.endswith(".bnet") and not model.endswith(".aeon"):
+                continue
+            path = os.path.join(corpus, model)
+            if network_size is not None:
+                if BooleanNetwork.from_file(path).variable_count() > network_size:
+                    continue
+            files.append(path)
+    return files
+
+
+def _git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run(args: argparse.Namespace) -> int:
+    workloads: list[str] = args.workloads or list(WORKLOADS)
+    models = _model_files(args.models, args.networksize)
+    results: list[dict[str, Any]] = []
+    for path in models:
+        variables = BooleanNetwork.from_file(path).variable_count()
+        for workload in workloads:
+            # The best result (by time) of all repetitions is reported.
+            best: dict[str, Any] | None = None
+            for _ in range(args.repeat):
+                result = run_benchmark(path, workload, args.timeout)
+                if result["status"] != "ok":
+                    best = result
+                    break
+                if best is None or result["seconds"] < best["seconds"]:
+                    best = result
+            assert best is not None
+            best = {"model": path, "variables": variables, "workload": workload} | best
+            results.append(best)
+            if best["status"] == "ok":
+                print(
+                    f"{path} {workload}: {best['seconds']:.3f}s, {best['nodes']} nodes, {best['solver_calls']} solver calls."
+                )
+            else:
+                print(f"{path} {workload}: {best['status']} {best.get('error', '')}")
+
+    output = {
+        "metadata": {
+            "biobalm": biobalm.__version__,
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "timeout": args.timeout,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(output, file, indent=1)
+    return 0
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    time_threshold: float = 1.2,
+    memory_threshold: float = 1.2,
+    min_seconds: float = 0.5,
+) -> list[str]:
+    """
+    Compare two benchmark results and return a list of regressions.
+
+    A workload is reported if it failed (but did not fail in the baseline),
+    if it is slower than `time_threshold` times the baseline (and the
+    baseline took at least `min_seconds`), if its peak memory exceeds
+    `memory_threshold` times the baseline, or if it produced a different
+    number of nodes.
+    """
+    old = {(r["model"], r["workload"]): r for r in baseline["results"]}
+    regressions: list[str] = []
+    for result in current["results"]:
+        key = (result["model"], result["workload"])
+        name = f"{key[0]} {key[1]}"
+        if key not in old:
+            continue
+        previous = old[key]
+        if result["status"] != "ok":
+            if previous["status"] == "ok":
+                regressions.append(f"{name}: {result['status']} (was ok).")
+            continue
+        if previous["status"] != "ok":
+            continue
+        if (
+            previous["seconds"] >= min_seconds
+            and result["seconds"] > time_threshold * previous["seconds"]
+        ):
+            regressions.append(
+                f"{name}: {result['seconds']:.3f}s (was {previous['seconds']:.3f}s)."
+            )
+        if (
+            result["peak_rss"] is not None
+            and previous["peak_rss"] is not None
+            and result["peak_rss"] > memory_threshold * previous["peak_rss"]
+        ):
+            regressions.append(
+                f"{name}: {result['peak_rss'] >> 20}MiB peak RSS (was {previous['peak_rss'] >> 20}MiB)."
+            )
+        if result["nodes"] != previous["nodes"]:
+            regressions.append(
+                f"{name}: {result['nodes']} nodes (was {previous['nodes']})."
+            )
+    return regressions
+
+
+def compare(args: argparse.Namespace) -> int:
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+    regressions = compare_results(
+        baseline,
+        current,
+        time_threshold=args.time_threshold,
+        memory_threshold=args.memory_threshold,
+        min_seconds=args.min_seconds,
+    )
+    for regression in regressions:
+        print(regression)
+    print(f"Found {len(regressions)} regression(s).")
+    return 1 if len(regressions) > 0 else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark runner for biobalm.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument(
+        "--models",
+        nargs="+",
+        default=[DEFAULT_CORPUS],
+        help=f"Directories with `.bnet` or `.aeon` models (default: {DEFAULT_CORPUS}).",
+    )
+    run_parser.add_argument(
+        "--networksize",
+        type=int,
+        default=None,
+        help="Only run networks up to this size.",
+    )
+    run_parser.add_argument(
+        "--workloads",
+        nargs="+",
+        choices=list(WORKLOADS),
+        help="The workloads to run (default: all).",
+    )
+    run_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600.0,
+        help="Time limit of a single workload in seconds (default: 600).",
+    )
+    run_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Number of repetitions; the fastest one is reported (default: 1).",
+    )
+    run_parser.add_argument("--output", default="benchmark-results.json")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser(
+        "compare", help="Compare two benchmark results."
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--time-threshold", type=float, default=1.2)
+    compare_parser.add_argument("--memory-threshold", type=float, default=1.2)
+    compare_parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.5,
+        help="Ignore time changes of workloads faster than this (default: 0.5).",
+    )
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
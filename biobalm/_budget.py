@@ -0,0 +1,149 @@
+"""
+Wall-clock and memory budgets of individual succession diagram computations.
+
+A :class:`Budget` is created when a computation on a single node starts (e.g.
+the stable motif enumeration or the attractor detection) and is then checked
+periodically by this computation. Once the budget is exceeded, the computation
+raises `TimeoutError` or `MemoryError`, and the succession diagram marks the
+node as deferred (see `SuccessionDiagramConfiguration.node_time_limit` and
+`SuccessionDiagramConfiguration.node_memory_limit`).
+
+The memory usage is measured as the increase of the resident memory of the
+whole process since the budget was created (on Linux, the current resident
+memory is used; on other Unix systems, the peak resident memory). On systems
+where neither is available, the memory budget is not enforced.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Iterator
+
+    from clingo import Control
+
+    from biobalm.types import SuccessionDiagramConfiguration
+
+try:
+    resource_available = True
+    import resource
+except ModuleNotFoundError:
+    resource_available = False
+
+# How often (in seconds) a running solver checks whether the budget is exceeded.
+POLL_INTERVAL = 0.05
+
+
+def memory_usage() -> int | None:
+    """
+    The resident memory of the current process in bytes, or `None` if it
+    cannot be measured.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if not resource_available:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, other systems report kilobytes.
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class Budget:
+    """
+    A time and memory limit of a single computation, measured from
+    the moment the budget is created.
+
+    Parameters
+    ----------
+    time_limit : float | None
+        The maximal number of seconds the computation can take.
+    memory_limit : int | None
+        The maximal number of bytes by which the memory usage of the process
+        can increase during the computation.
+    """
+
+    __slots__ = ("time_limit", "memory_limit", "_deadline", "_memory_start")
+
+    def __init__(
+        self, time_limit: float | None = None, memory_limit: int | None = None
+    ):
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self._deadline: float | None = None
+        if time_limit is not None:
+            self._deadline = time.perf_counter() + time_limit
+        self._memory_start: int | None = None
+        if memory_limit is not None:
+            self._memory_start = memory_usage()
+
+    @staticmethod
+    def from_config(config: SuccessionDiagramConfiguration) -> Budget | None:
+        """
+        Create a new budget using the per-node limits of the given configuration,
+        or `None` if no limits are set.
+        """
+        time_limit = config["node_time_limit"]
+        memory_limit = config["node_memory_limit"]
+        if time_limit is None and memory_limit is None:
+            return None
+        return Budget(time_limit, memory_limit)
+
+    def exceeded(self) -> TimeoutError | MemoryError | None:
+        """
+        Return the error describing the exceeded limit, or `None` if the
+        computation is still within the budget.
+        """
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            return TimeoutError(
+                f"Exceeded the time limit of a single node ({self.time_limit}s; see `SuccessionDiagramConfiguration.node_time_limit`)."
+            )
+        if self._memory_start is not None:
+            assert self.memory_limit is not None
+            usage = memory_usage()
+            if usage is not None and usage - self._memory_start > self.memory_limit:
+                return MemoryError(
+                    f"Exceeded the memory limit of a single node ({self.memory_limit} bytes; see `SuccessionDiagramConfiguration.node_memory_limit`)."
+                )
+        return None
+
+    def check(self):
+        """
+        Raise `TimeoutError` or `MemoryError` if the budget is exceeded.
+        """
+        error = self.exceeded()
+        if error is not None:
+            raise error
+
+    @contextmanager
+    def interrupt(self, ctl: Control) -> Iterator[None]:
+        """
+        Interrupt the active solve call of `ctl` once the budget is exceeded
+        (checked by a background thread every `POLL_INTERVAL` seconds).
+
+        The interrupted solver simply stops producing models, hence the
+        caller should use :meth:`check` once the solver finishes.
+        """
+        stop = threading.Event()
+
+        def watchdog():
+            while not stop.wait(POLL_INTERVAL):
+                if self.exceeded() is not None:
+                    ctl.interrupt()
+                    return
+
+        thread = threading.Thread(target=watchdog, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
@@ -9,12 +9,12 @@ safely when Pint is not installed.
 from __future__ import annotations
 
 from functools import reduce
-from typing import TYPE_CHECKING, cast, Iterable
+from typing import TYPE_CHECKING
 
-from networkx import DiGraph  # type: ignore
 from pypint import Goal, InMemoryModel  # type:ignore
 
 from biobalm.petri_net_translation import (
+    PetriNet,
     place_to_variable,
     optimized_recursive_dnf_generator,
 )
@@ -25,7 +25,7 @@ if TYPE_CHECKING:
 
 
 def pint_reachability(
-    petri_net: DiGraph,
+    petri_net: PetriNet,
     initial_state: BooleanSpace,
     target_states: Bdd,
     config: SuccessionDiagramConfiguration,
@@ -93,53 +93,41 @@ def _pint_build_symbolic_goal(
     return reduce(lambda a, b: a | b, goals)
 
 
-def _petri_net_as_automata_network(petri_net: DiGraph) -> str:
+def _petri_net_as_automata_network(petri_net: PetriNet) -> str:
     """
     Takes a Petri net which was created by implicant encoding from a Boolean network,
     and builds an automata network file (`.an`) compatible with the Pint tool.
     """
     automata_network = ""
 
-    # Go through all PN places and save them as model variables.
-    variable_set: set[str] = set()
-    for place, kind in petri_net.nodes(data="kind"):  # type: ignore
-        if kind != "place":
-            continue
-        variable_set.add(place_to_variable(place)[0])  # type: ignore[reportUnknownArgumentType] # noqa
-    variables = sorted(variable_set)
-
     # Declare all variables with 0/1 domains.
-    for var in variables:
+    for var in sorted(petri_net.variables):
         automata_network += f'"{var}" [0, 1]\n'
 
-    for transition, kind in petri_net.nodes(data="kind"):  # type: ignore
-        if kind != "transition":
-            continue
-
-        predecessors = set(cast(Iterable[str], petri_net.predecessors(transition)))  # type: ignore
-        successors = set(cast(Iterable[str], petri_net.successors(transition)))  # type: ignore
-
-        # The value under modification is the only
-        # value that is different between successors and predecessors.
-        source_place = next(iter(predecessors - successors))
-        target_place = next(iter(successors - predecessors))
+    for transition in range(petri_net.transition_count()):
+        predecessors = petri_net.pre_set(transition)
+        successors = petri_net.post_set(transition)
 
-        (s_var, s_level) = place_to_variable(source_place)
-        (t_var, t_level) = place_to_variable(target_place)
-        assert s_var == t_var
+        # The value under modification is always the first place
+        # of the pre-set and post-set. Places are identified as `2 * var + level`.
+        s_var = petri_net.variables[predecessors[0] >> 1]
+        s_level = predecessors[0] & 1
+        t_level = successors[0] & 1
 
         # The remaining places represent the necessary conditions.
         # Here, we transform them into a text format.
-        condition_places = sorted(predecessors.intersection(successors))
+        condition_places = sorted(petri_net.place_name(p) for p in predecessors[1:])
         condition_tuples = [place_to_variable(p) for p in condition_places]
         conditions = [f'"{var}"={int(level)}' for var, level in condition_tuples]
 
         # A pint rule consists of a variable name, value transition,
         # and a list of necessary conditions for the transition (if any).
         if len(conditions) == 0:
-            rule = f'"{s_var}" {int(s_level)} -> {int(t_level)}\n'
+            rule = f'"{s_var}" {s_level} -> {t_level}\n'
         else:
-            rule = f"\"{s_var}\" {int(s_level)} -> {int(t_level)} when {' and '.join(conditions)}\n"
+            rule = (
+                f"\"{s_var}\" {s_level} -> {t_level} when {' and '.join(conditions)}\n"
+            )
 
         automata_network += rule
 
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from typing import Callable
+
+    from biobalm.succession_diagram import SuccessionDiagram
+
+from biobalm.succession_diagram_store import SuccessionDiagramStore
+
+
+class ExpansionCheckpoint:
+    """
+    Periodically saves a succession diagram together with the state of
+    a running expansion algorithm into a
+    :class:`SuccessionDiagramStore<biobalm.succession_diagram_store.SuccessionDiagramStore>`.
+
+    The saved expansion is a dictionary with the following items:
+
+    - `algorithm`: The name of the expansion algorithm.
+    - `arguments`: The arguments of the expansion algorithm.
+    - `state`: The (JSON-compatible) state of the algorithm, or `None` if
+      the algorithm should start from the beginning.
+    - `result`: The result of the algorithm once it is finished, otherwise `None`.
+
+    See `SuccessionDiagram.resume_from` for how the expansion is resumed.
+    If the `path` is `None`, no checkpoints are created. Unless the algorithm
+    is being resumed (`resume` is given), any data already stored in `path` is
+    removed (e.g. a stale checkpoint of a different expansion) and the initial
+    checkpoint is saved immediately.
+
+    If the diagram is backed by a store (see `SuccessionDiagram.attach_store`),
+    the checkpoints can only be saved into this store, and its data are
+    kept when the algorithm starts. Note that the evicted nodes are written
+    into the store between checkpoints, hence the stored diagram can be ahead
+    of the saved algorithm state. This is safe, since the algorithms skip
+    the nodes that are already expanded.
+    """
+
+    def __init__(
+        self,
+        sd: SuccessionDiagram,
+        path: str | None,
+        algorithm: str,
+        arguments: dict[str, Any],
+        resume: dict[str, Any] | None = None,
+    ):
+        self.sd = sd
+        self.path = path
+        self.algorithm = algorithm
+        self.arguments = arguments
+        self.last_save = time.monotonic()
+        self.backed = (
+            sd.store is not None
+            and path is not None
+            and os.path.abspath(path) == os.path.abspath(sd.store.path)
+        )
+        if sd.store is not None and path is not None and not self.backed:
+            raise ValueError(
+                f"A diagram backed by {sd.store} cannot be checkpointed into {path}."
+            )
+        if resume is None:
+            if path is not None and not self.backed:
+                with SuccessionDiagramStore(path) as store:
+                    store.clear()
+            self.save(None)
+
+    def update(self, state: Callable[[], dict[str, Any]]):
+        """
+        Save the state of the algorithm if the checkpoint interval (see
+        `SuccessionDiagramConfiguration.checkpoint_interval`) elapsed since the
+        last checkpoint. The state is only computed when it is actually saved.
+        """
+        if self.path is None:
+            return
+        if time.monotonic() - self.last_save < self.sd.config["checkpoint_interval"]:
+            return
+        self.save(state())
+
+    def save(self, state: dict[str, Any] | None, result: bool | None = None):
+        """
+        Save the diagram and the given algorithm state (regardless of
+        the checkpoint interval).
+        """
+        if self.path is None:
+            return
+        expansion = {
+            "algorithm": self.algorithm,
+            "arguments": self.arguments,
+            "state": state,
+            "result": result,
+        }
+        if self.backed:
+            assert self.sd.store is not None
+            self.sd.store.write(self.sd, expansion)
+        else:
+            with SuccessionDiagramStore(self.path) as store:
+                store.write(self.sd, expansion)
+        self.last_save = time.monotonic()
+
+    def stop(self, state: dict[str, Any] | None) -> bool:
+        """
+        Save the state of an algorithm that stopped early (e.g. due to a size
+        limit), such that it can be resumed later. Always returns `False`.
+        """
+        self.save(state)
+        return False
+
+    def finish(self, result: bool) -> bool:
+        """
+        Save the final diagram of a finished algorithm and return its `result`.
+        """
+        self.save(None, result)
+        return result
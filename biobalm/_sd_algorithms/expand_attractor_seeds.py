@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from biobalm.succession_diagram import SuccessionDiagram
 
+from biobalm._sd_algorithms.checkpoint import ExpansionCheckpoint
 from biobalm.types import BooleanSpace
 from biobalm.space_utils import intersect
 from biobalm.trappist_core import compute_fixed_point_reduced_STG
@@ -12,42 +13,73 @@ from biobalm._sd_attractors.attractor_candidates import make_heuristic_retained_
 from biodivine_aeon import AsynchronousGraph
 
 
-def expand_attractor_seeds(sd: SuccessionDiagram, size_limit: int | None = None):
+def expand_attractor_seeds(
+    sd: SuccessionDiagram,
+    size_limit: int | None = None,
+    checkpoint: str | None = None,
+    resume: dict[str, Any] | None = None,
+):
     """
     See `SuccessionDiagram.expand_attractor_seeds` for documentation.
-    """
 
-    # First, expand the succession diagram such that all minimal trap spaces are
-    # found. This reduces the amount of work performed in this algorithm,
-    # because for every attractor in a minimal trap space, we already have the
-    # closest trap space, now we just need to do the same for (potential)
-    # motif-avoidant attractors.
-    sd.expand_minimal_spaces(size_limit)
+    If `resume` is given, it must be a state saved by a checkpoint of this
+    algorithm, and the search continues from this state.
+    """
 
-    if sd.config["debug"]:
-        print(
-            "Minimal trap space expansion finished. Proceeding to attractor expansion."
-        )
+    checkpointer = ExpansionCheckpoint(
+        sd,
+        checkpoint,
+        "attractor_seeds",
+        {"size_limit": size_limit},
+        resume,
+    )
 
     root = sd.root()
     seen = set([root])
     stack: list[tuple[int, list[int] | None]] = [(root, None)]
 
+    if resume is None:
+        # First, expand the succession diagram such that all minimal trap spaces are
+        # found. This reduces the amount of work performed in this algorithm,
+        # because for every attractor in a minimal trap space, we already have the
+        # closest trap space, now we just need to do the same for (potential)
+        # motif-avoidant attractors.
+        if not sd.expand_minimal_spaces(size_limit):
+            # Size limit reached. The expansion must be restarted from
+            # the beginning when resumed.
+            return checkpointer.stop(None)
+
+        if sd.config["debug"]:
+            print(
+                "Minimal trap space expansion finished. Proceeding to attractor expansion."
+            )
+    else:
+        seen = set(resume["seen"])
+        stack = [(node, successors) for node, successors in resume["stack"]]
+
+    def state() -> dict[str, Any]:
+        return {"seen": sorted(seen), "stack": stack}
+
     while len(stack) > 0:
+        checkpointer.update(state)
         (node, successors) = stack.pop()
         if successors is None:
             # Only allow successor computation if size limit hasn't been exceeded.
             if (size_limit is not None) and (len(sd) >= size_limit):
                 # Size limit reached.
-                return False
+                stack.append((node, successors))
+                return checkpointer.stop(state())
 
             successors = sd.node_successors(node, compute=True)
             successors = sorted(successors, reverse=True)  # For determinism!
             # (reversed because we explore the list from the back)
 
         # Retrieve the stable motifs of children that are already expanded.
+        # (Deferred nodes have no successors, so the node is never recomputed.)
         expanded_children = [
-            x for x in sd.node_successors(node) if sd.node_data(x)["expanded"]
+            x
+            for x in sd.node_successors(node, compute=True)
+            if sd.node_data(x)["expanded"]
         ]
         expanded_motifs = [
             sd.edge_stable_motif(node, child) for child in expanded_children
@@ -126,4 +158,4 @@ def expand_attractor_seeds(sd: SuccessionDiagram, size_limit: int | None = None)
         # Push the successor onto the stack.
         stack.append((s, None))
 
-    return True
+    return checkpointer.finish(True)
@@ -1,57 +1,105 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
     from biobalm.succession_diagram import SuccessionDiagram
 
+from biobalm._sd_algorithms.checkpoint import ExpansionCheckpoint
+from biobalm._sd_algorithms.parallel_expansion import motif_prefetcher
+
 
 def expand_bfs(
     sd: SuccessionDiagram,
     node_id: int | None = None,
     bfs_level_limit: int | None = None,
     size_limit: int | None = None,
+    parallel: int | Executor | None = None,
+    checkpoint: str | None = None,
+    resume: dict[str, Any] | None = None,
 ) -> bool:
     """
     See `SuccessionDiagram.expand_bfs` for documentation.
+
+    If `resume` is given, it must be a state saved by a checkpoint of this
+    algorithm, and the search continues from this state.
     """
 
     if node_id is None:
         node_id = sd.root()
 
+    checkpointer = ExpansionCheckpoint(
+        sd,
+        checkpoint,
+        "bfs",
+        {
+            "node_id": node_id,
+            "bfs_level_limit": bfs_level_limit,
+            "size_limit": size_limit,
+        },
+        resume,
+    )
+
     seen: set[int] = set()
     seen.add(node_id)
 
     level_id = 0
     current_level = [node_id]
     next_level: list[int] = []
+    start = 0
+
+    if resume is not None:
+        seen = set(resume["seen"])
+        level_id = resume["level_id"]
+        current_level = resume["current_level"]
+        next_level = resume["next_level"]
+        start = resume["position"]
+
+    def state(position: int) -> dict[str, Any]:
+        return {
+            "seen": sorted(seen),
+            "level_id": level_id,
+            "current_level": current_level,
+            "next_level": next_level,
+            "position": position,
+        }
+
+    with motif_prefetcher(sd, parallel) as prefetcher:
+        while len(current_level) > 0:
+            # Nodes on the same level are independent, hence their stable
+            # motifs can be computed in parallel (if enabled).
+            prefetcher.prefetch(current_level[start:])
+
+            for position in range(start, len(current_level)):
+                node = current_level[position]
+                # Check if the size limit has been exceeded already.
+                if (size_limit is not None) and (len(sd) >= size_limit):
+                    # Size limit reached.
+                    return checkpointer.stop(state(position))
+
+                checkpointer.update(lambda: state(position))
+
+                # Compute successors if necessary.
+                successors = prefetcher.node_successors(node)
+                # Sort successors to avoid non-determinism.
+                successors = sorted(successors)
+
+                # Add successors to the next level and to the seen set.
+                for s in successors:
+                    if s not in seen:
+                        seen.add(s)
+                        next_level.append(s)
+
+            # The level is explored. Check if this exceeds the level limit.
+            if (bfs_level_limit is not None) and (level_id >= bfs_level_limit):
+                # Level limit reached.
+                return checkpointer.finish(False)
+
+            # If not, "move on" to the next level.
+            level_id += 1
+            current_level = next_level
+            next_level = []
+            start = 0
 
-    while len(current_level) > 0:
-        for node in current_level:
-            # Check if the size limit has been exceeded already.
-            if (size_limit is not None) and (len(sd) >= size_limit):
-                # Size limit reached.
-                return False
-
-            # Compute successors if necessary.
-            successors = sd.node_successors(node, compute=True)
-            # Sort successors to avoid non-determinism.
-            successors = sorted(successors)
-
-            # Add successors to the next level and to the seen set.
-            for s in successors:
-                if s not in seen:
-                    seen.add(s)
-                    next_level.append(s)
-
-        # The level is explored. Check if this exceeds the level limit.
-        if (bfs_level_limit is not None) and (level_id >= bfs_level_limit):
-            # Level limit reached.
-            return False
-
-        # If not, "move on" to the next level.
-        level_id += 1
-        current_level = next_level
-        next_level = []
-
-    return True
+    return checkpointer.finish(True)
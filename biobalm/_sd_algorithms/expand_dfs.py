@@ -1,24 +1,46 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
     from biobalm.succession_diagram import SuccessionDiagram
 
+from biobalm._sd_algorithms.checkpoint import ExpansionCheckpoint
+from biobalm._sd_algorithms.parallel_expansion import motif_prefetcher
+
 
 def expand_dfs(
     sd: SuccessionDiagram,
     node_id: int | None = None,
     dfs_stack_limit: int | None = None,
     size_limit: int | None = None,
+    parallel: int | Executor | None = None,
+    checkpoint: str | None = None,
+    resume: dict[str, Any] | None = None,
 ) -> bool:
     """
     See `SuccessionDiagram.expand_dfs` for documentation.
+
+    If `resume` is given, it must be a state saved by a checkpoint of this
+    algorithm, and the search continues from this state.
     """
 
     if node_id is None:
         node_id = sd.root()
 
+    checkpointer = ExpansionCheckpoint(
+        sd,
+        checkpoint,
+        "dfs",
+        {
+            "node_id": node_id,
+            "dfs_stack_limit": dfs_stack_limit,
+            "size_limit": size_limit,
+        },
+        resume,
+    )
+
     seen: set[int] = set()
     seen.add(node_id)
 
@@ -26,39 +48,59 @@ def expand_dfs(
 
     result_is_complete = True
 
-    while len(stack) > 0:
-        (node, successors) = stack.pop()
-        if successors is None:
-            # Only allow successor computation if size limit hasn't been exceeded.
-            if (size_limit is not None) and (len(sd) >= size_limit):
-                # Size limit reached.
-                return False
-
-            successors = sd.node_successors(node, compute=True)
-            successors = sorted(successors, reverse=True)  # For determinism!
-            # (reversed because we explore the list from the back)
-
-        # Remove all immediate successors that are already visited.
-        while len(successors) > 0 and successors[-1] in seen:
-            successors.pop()
-
-        # This node is done and we don't have to push anything onto the stack.
-        if len(successors) == 0:
-            continue
-
-        if (dfs_stack_limit is not None) and (len(stack) >= dfs_stack_limit):
-            # We cannot push any successor nodes because it would exceed
-            # the stack limit. As such, we can just continue with the next
-            # item on the stack. however, we must remember that we skipped
-            # some nodes and the result is thus incomplete.
-            result_is_complete = False
-            continue
-
-        s = successors.pop()
-        seen.add(s)
-        # Push the node back with the remaining successors.
-        stack.append((node, successors))
-        # Push the successor onto the stack.
-        stack.append((s, None))
-
-    return result_is_complete
+    if resume is not None:
+        seen = set(resume["seen"])
+        stack = [(node, successors) for node, successors in resume["stack"]]
+        result_is_complete = resume["result_is_complete"]
+
+    def state() -> dict[str, Any]:
+        return {
+            "seen": sorted(seen),
+            "stack": stack,
+            "result_is_complete": result_is_complete,
+        }
+
+    with motif_prefetcher(sd, parallel) as prefetcher:
+        while len(stack) > 0:
+            checkpointer.update(state)
+            (node, successors) = stack.pop()
+            if successors is None:
+                # Only allow successor computation if size limit hasn't been exceeded.
+                if (size_limit is not None) and (len(sd) >= size_limit):
+                    # Size limit reached.
+                    stack.append((node, successors))
+                    return checkpointer.stop(state())
+
+                successors = prefetcher.node_successors(node)
+                successors = sorted(successors, reverse=True)  # For determinism!
+                # (reversed because we explore the list from the back)
+
+                # Unless the exploration is cut short by one of the limits, all
+                # successors will be eventually expanded, hence we can start
+                # computing their stable motifs in parallel (if enabled).
+                prefetcher.prefetch(successors)
+
+            # Remove all immediate successors that are already visited.
+            while len(successors) > 0 and successors[-1] in seen:
+                successors.pop()
+
+            # This node is done and we don't have to push anything onto the stack.
+            if len(successors) == 0:
+                continue
+
+            if (dfs_stack_limit is not None) and (len(stack) >= dfs_stack_limit):
+                # We cannot push any successor nodes because it would exceed
+                # the stack limit. As such, we can just continue with the next
+                # item on the stack. however, we must remember that we skipped
+                # some nodes and the result is thus incomplete.
+                result_is_complete = False
+                continue
+
+            s = successors.pop()
+            seen.add(s)
+            # Push the node back with the remaining successors.
+            stack.append((node, successors))
+            # Push the successor onto the stack.
+            stack.append((s, None))
+
+    return checkpointer.finish(result_is_complete)
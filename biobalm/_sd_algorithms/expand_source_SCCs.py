@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import itertools as it
-from typing import TYPE_CHECKING, Callable, cast
+from typing import TYPE_CHECKING, Any, Callable, cast
 
+from biobalm._sd_algorithms.checkpoint import ExpansionCheckpoint
 from biobalm.space_utils import percolate_network
 from biobalm.types import BooleanSpace
 from biobalm.interaction_graph_utils import source_nodes
@@ -18,6 +19,8 @@ def expand_source_SCCs(
     check_maa: bool,
     recursion: int = 0,
     expander: ExpanderFunctionType | None = None,
+    checkpoint: str | None = None,
+    resume: dict[str, Any] | None = None,
 ) -> bool:
     """
     1. percolate
@@ -36,6 +39,11 @@ def expand_source_SCCs(
                 expanding the sd with source SCCs.
                 This grants significant speedup when searching for all attractors.
                 if False, ignores motif avoidant attractors in source SCCs.
+    checkpoint - if given, the diagram and the state of the expansion are
+                periodically saved into this file (see `SuccessionDiagram.resume_from`).
+                Only the main diagram is saved, not the diagrams of the source SCCs.
+    resume - if given, this must be a state saved by a checkpoint of this
+                algorithm, and the expansion continues from this state.
 
     """
 
@@ -51,52 +59,25 @@ def expand_source_SCCs(
             f"Start SD expansion using SCC decomposition on {sd.network}, recursion level {recursion}."
         )
 
-    root = sd.root()
-
-    # Usage of sets prevents node repetition in levels (this can happen if we independently
-    # percolate to the same "downstream" node after fixing different source SCC values).
-    current_level: set[int] = set([root])
-    next_level: set[int] = set()
-
-    # This already accounts for constant percolation.
-    node_space = sd.node_data(root)["space"]
-
-    # find source nodes
-    perc_bn = percolate_network(sd.network, node_space)
-    sources = source_nodes(perc_bn)
-
-    if sd.config["debug"]:
-        print(f" > Computed source/input variable(s): {sources}")
-
-    # get source nodes combinations and expand root node
-    if len(sources) != 0:
-        # If there are too many source nodes, this can generate an absurdly large SD.
-        # This would be a problem even without the SCC expansion, but we can just
-        # stop the whole thing faster because we know how many nodes it generates now.
-        if 2 ** len(sources) > sd.config["max_motifs_per_node"]:
-            raise RuntimeError(
-                f"Exceeded the maximum amount of stable motifs per node ({sd.config['max_motifs_per_node']}; see `SuccessionDiagramConfiguration.max_motifs_per_node`)."
-            )
-        else:
-            if sd.config["debug"]:
-                print(
-                    f" > Expanding {len(sources)} source node into {2 ** len(sources)} SD nodes."
-                )
-
-        bin_values_iter = it.product(range(2), repeat=len(sources))
-        for bin_values in bin_values_iter:
-            valuation = cast(BooleanSpace, dict(zip(sources, bin_values)))
-            sub_space = node_space | valuation
-
-            next_level.add(sd._ensure_node(root, sub_space))  # type: ignore
-
-        # This makes the root artificially "expanded". Also, there
-        # can be no attractors here because we are just fixing the source nodes.
-        sd.node_data(root)["expanded"] = True
-        sd.node_data(root)["attractor_seeds"] = []
-        sd.node_data(root)["attractor_sets"] = []
-        current_level = next_level
-        next_level = set()
+    checkpointer = ExpansionCheckpoint(
+        sd, checkpoint, "scc", {"check_maa": check_maa}, resume
+    )
+
+    if resume is None:
+        current_level = _expand_source_nodes(sd)
+        next_level: set[int] = set()
+        start = 0
+    else:
+        current_level = set(resume["current_level"])
+        next_level = set(resume["next_level"])
+        start = resume["position"]
+
+    def state(position: int) -> dict[str, Any]:
+        return {
+            "current_level": sorted(current_level),
+            "next_level": sorted(next_level),
+            "position": position,
+        }
 
     while len(current_level) > 0:
         if sd.config["debug"]:
@@ -106,7 +87,10 @@ def expand_source_SCCs(
 
         # For each node in the current level, we expand all source SCCs and put the
         # results into a new level.
-        for node_id in sorted(current_level):
+        level = sorted(current_level)
+        for position in range(start, len(level)):
+            node_id = level[position]
+            checkpointer.update(lambda: state(position))
             source_scc_diagrams = list(sd.source_scc_subdiagrams(node_id))
             if sd.config["debug"]:
                 print(
@@ -132,18 +116,32 @@ def expand_source_SCCs(
                 next_level = next_level | set(sd.node_successors(node_id, compute=True))
                 continue
 
-            attach_at_list: list[int] = [node_id]
             for scc_diagram in source_scc_diagrams:
                 fully_expanded = expander(scc_diagram)
                 if not fully_expanded:
                     # Something bad happened in the expander function and we can't continue.
-                    return False
+                    return checkpointer.finish(False)
 
                 if sd.config["debug"]:
                     print(
                         f"[{node_id}] > Source SCC diagram expanded to {len(scc_diagram)} nodes."
                     )
 
+            # A diagram with deferred nodes is incomplete and cannot be attached,
+            # because its deferred nodes would appear as minimal trap spaces.
+            if any(
+                any(True for _ in scc_diagram.deferred_ids())
+                for scc_diagram in source_scc_diagrams
+            ):
+                if sd.config["debug"]:
+                    print(
+                        f"[{node_id}] > Source SCC diagram has deferred nodes. Expanding normally."
+                    )
+                next_level = next_level | set(sd.node_successors(node_id, compute=True))
+                continue
+
+            attach_at_list: list[int] = [node_id]
+            for scc_diagram in source_scc_diagrams:
                 # At this point, diagram is fully expanded and we can attach its
                 # nodes as the successors of `node_id`.
                 next_attach_at_list: list[int] = []
@@ -174,13 +172,70 @@ def expand_source_SCCs(
 
         current_level = next_level
         next_level = set()
+        start = 0
 
     if sd.config["debug"]:
         print(
             f" > SCC expansion terminated with {len(sd)} node(s) on recursion level {recursion}."
         )
 
-    return True
+    return checkpointer.finish(True)
+
+
+def _expand_source_nodes(sd: SuccessionDiagram) -> set[int]:
+    """
+    Expand the root node by fixing all combinations of source node values.
+
+    Returns the first level of the SCC expansion (i.e. the newly created nodes,
+    or the root node if there are no source nodes).
+    """
+    root = sd.root()
+
+    # Usage of sets prevents node repetition in levels (this can happen if we independently
+    # percolate to the same "downstream" node after fixing different source SCC values).
+    next_level: set[int] = set()
+
+    # This already accounts for constant percolation.
+    node_space = sd.node_data(root)["space"]
+
+    # find source nodes
+    perc_bn = percolate_network(sd.network, node_space)
+    sources = source_nodes(perc_bn)
+
+    if sd.config["debug"]:
+        print(f" > Computed source/input variable(s): {sources}")
+
+    # get source nodes combinations and expand root node
+    if len(sources) != 0:
+        # If there are too many source nodes, this can generate an absurdly large SD.
+        # This would be a problem even without the SCC expansion, but we can just
+        # stop the whole thing faster because we know how many nodes it generates now.
+        if 2 ** len(sources) > sd.config["max_motifs_per_node"]:
+            raise RuntimeError(
+                f"Exceeded the maximum amount of stable motifs per node ({sd.config['max_motifs_per_node']}; see `SuccessionDiagramConfiguration.max_motifs_per_node`)."
+            )
+        else:
+            if sd.config["debug"]:
+                print(
+                    f" > Expanding {len(sources)} source node into {2 ** len(sources)} SD nodes."
+                )
+
+        bin_values_iter = it.product(range(2), repeat=len(sources))
+        for bin_values in bin_values_iter:
+            valuation = cast(BooleanSpace, dict(zip(sources, bin_values)))
+            sub_space = node_space | valuation
+
+            next_level.add(sd._ensure_node(root, sub_space))  # type: ignore
+
+        # This makes the root artificially "expanded". Also, there
+        # can be no attractors here because we are just fixing the source nodes.
+        sd.node_data(root)["expanded"] = True
+        sd.node_data(root)["attractor_seeds"] = []
+        sd.node_data(root)["attractor_sets"] = []
+        sd.modified_nodes.add(root)
+        return next_level
+
+    return set([root])
 
 
 def attach_scc_subdiagram(
@@ -238,10 +293,12 @@ def attach_scc_subdiagram(
             sd.node_data(main_node_id)["expanded"] = True
 
         if check_maa:
-            if len(scc_sd.node_attractor_candidates(scc_node_id, compute=True)) == 0:
+            if _has_no_candidates(scc_sd, scc_node_id):
                 sd.node_data(main_node_id)["attractor_seeds"] = []
                 sd.node_data(main_node_id)["attractor_sets"] = []
 
+        sd.modified_nodes.add(main_node_id)
+
     assert len(node_id_map) == len(scc_sd)
 
     # Then copy all the edges.
@@ -260,10 +317,26 @@ def attach_scc_subdiagram(
 
     # This makes the `attach_at` node expanded. We will not be adding new nodes to it later.
     sd.node_data(attach_at)["expanded"] = True
+    sd.modified_nodes.add(attach_at)
     # Finally, if we are checking for MAAs, we can do that for the root too:
     if check_maa:
-        if len(scc_sd.node_attractor_candidates(scc_sd.root(), compute=True)) == 0:
+        if _has_no_candidates(scc_sd, scc_sd.root()):
             sd.node_data(attach_at)["attractor_seeds"] = []
             sd.node_data(attach_at)["attractor_sets"] = []
 
     return min_traps
+
+
+def _has_no_candidates(scc_sd: SuccessionDiagram, node_id: int) -> bool:
+    """
+    True if the node of `scc_sd` provably has no attractor candidates.
+
+    If the candidate computation exceeds the per-node budget, the node is
+    deferred in `scc_sd` and the result is `False` (i.e. unknown).
+    """
+    try:
+        return len(scc_sd.node_attractor_candidates(node_id, compute=True)) == 0
+    except (TimeoutError, MemoryError):
+        if not scc_sd.node_data(node_id)["deferred"]:
+            raise
+        return False
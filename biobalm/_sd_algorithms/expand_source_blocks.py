@@ -67,6 +67,7 @@ def expand_source_blocks(
         sd.node_data(root)["expanded"] = True
         sd.node_data(root)["attractor_seeds"] = []
         sd.node_data(root)["attractor_sets"] = []
+        sd.modified_nodes.add(root)
         current_level = next_level
         next_level = set()
 
@@ -173,10 +174,14 @@ def expand_source_blocks(
                     block_sd = sd.component_subdiagram(list(block), node)
 
                     # The succession diagram "restricted" to the considered block should have
-                    # the same (restricted) successor nodes.
-                    assert len(
-                        block_sd.node_successors(block_sd.root(), compute=True)
-                    ) == len(block_nodes)
+                    # the same (restricted) successor nodes. If the block exceeds the per-node
+                    # budget, it cannot be considered clean.
+                    block_successors = block_sd.node_successors(
+                        block_sd.root(), compute=True
+                    )
+                    if block_sd.node_data(block_sd.root())["deferred"]:
+                        continue
+                    assert len(block_successors) == len(block_nodes)
 
                     # We could also consider using `seeds` instead of `candidates` here. Ultimately, this
                     # matters very rarely. The reasoning for why we use `candidates` is that we can (almost)
@@ -185,9 +190,14 @@ def expand_source_blocks(
                     # MAAs in the problematic nodes while using the nice properties of the expansion to
                     # still disprove MAAs in the remaining nodes. If we used `seeds`, the expansion could
                     # just get stuck on this node and the "partial" results wouldn't be usable.
-                    block_sd_candidates = block_sd.node_attractor_candidates(
-                        block_sd.root(), compute=True
-                    )
+                    try:
+                        block_sd_candidates = block_sd.node_attractor_candidates(
+                            block_sd.root(), compute=True
+                        )
+                    except (TimeoutError, MemoryError):
+                        if not block_sd.node_data(block_sd.root())["deferred"]:
+                            raise
+                        continue
                     if len(block_sd_candidates) == 0:
                         if sd.config["debug"]:
                             print(
@@ -197,6 +207,7 @@ def expand_source_blocks(
                         next_level = next_level | set(block_nodes)
                         sd.node_data(node)["attractor_seeds"] = []
                         sd.node_data(node)["attractor_sets"] = []
+                        sd.modified_nodes.add(node)
                         break
                     else:
                         if sd.config["debug"]:
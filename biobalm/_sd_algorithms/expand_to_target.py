@@ -5,7 +5,6 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from biobalm.succession_diagram import SuccessionDiagram
 
-from biobalm.space_utils import intersect, is_subspace
 from biobalm.types import BooleanSpace
 
 
@@ -16,6 +15,9 @@ def expand_to_target(
     See `SuccessionDiagram.exapnd_to_target` for documentation.
     """
 
+    encoder = sd.space_encoder
+    compact_target = encoder.encode(target)
+
     root = sd.root()
     seen = set([root])
 
@@ -25,14 +27,14 @@ def expand_to_target(
 
     while len(current_level) > 0:
         for node in current_level:
-            node_space = sd.node_data(node)["space"]
+            node_space = encoder.encode(sd.node_data(node)["space"])
 
-            if intersect(node_space, target) is None:
+            if node_space.intersect(compact_target) is None:
                 # If `node_space` does not intersect with `target`, it is not relevant
                 # and we can safely keep it as unexpanded "stub".
                 continue
 
-            if is_subspace(node_space, target) and not node_space == target:
+            if node_space.is_subspace(compact_target) and node_space != compact_target:
                 # If `node_space` is a subspace of `target`, it is relevant but expanding
                 # it will not add any new information, we can thus also keep it unexpanded.
                 continue
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator
+    from biobalm.succession_diagram import SuccessionDiagram
+
+from biobalm.trappist_core import trappist
+from biobalm.types import BooleanSpace
+
+
+class MotifPrefetcher:
+    """
+    Computes the stable motifs of succession diagram nodes ahead of time.
+
+    The (expensive) `trappist` calls are submitted to an `Executor`, while the
+    resulting child nodes are only merged into the succession diagram once the
+    expansion algorithm asks for the successors of a particular node. As such,
+    the order in which nodes are created is the same as in the serial case,
+    regardless of the order in which the workers finish.
+
+    Without an executor, the prefetcher simply expands nodes on demand.
+    """
+
+    def __init__(self, sd: SuccessionDiagram, executor: Executor | None = None):
+        self.sd = sd
+        self.executor = executor
+        self.pending: dict[int, Future[list[BooleanSpace]]] = {}
+
+    def prefetch(self, node_ids: Iterable[int]):
+        """
+        Start computing the stable motifs of the given nodes (if they are
+        not expanded or already being computed).
+        """
+        if self.executor is None:
+            return
+        for node_id in node_ids:
+            if node_id in self.pending:
+                continue
+            query = self.sd._stable_motif_query(node_id)  # type: ignore
+            if query is None:
+                continue
+            self.pending[node_id] = self.executor.submit(trappist, **query)
+
+    def node_successors(self, node_id: int) -> list[int]:
+        """
+        Same as `SuccessionDiagram.node_successors(node_id, compute=True)`, but
+        uses the prefetched stable motifs if available.
+
+        If the prefetched computation exceeded the per-node budget, the node
+        is marked as deferred (and has no successors).
+        """
+        future = self.pending.pop(node_id, None)
+        if future is not None:
+            try:
+                sub_spaces = future.result()
+            except (TimeoutError, MemoryError) as error:
+                config = self.sd.config
+                if (
+                    config["node_time_limit"] is None
+                    and config["node_memory_limit"] is None
+                ):
+                    raise
+                self.sd._defer_node(node_id, str(error))  # type: ignore
+                return []
+            self.sd._expand_one_node(node_id, sub_spaces)  # type: ignore
+        return self.sd.node_successors(node_id, compute=True)
+
+    def cancel(self):
+        """
+        Cancel all computations whose results were not requested.
+        """
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+
+
+@contextmanager
+def motif_prefetcher(
+    sd: SuccessionDiagram, parallel: int | Executor | None
+) -> Iterator[MotifPrefetcher]:
+    """
+    Create a `MotifPrefetcher` for the given `parallel` argument.
+
+    If `parallel` is an integer larger than one, a new `ProcessPoolExecutor`
+    with this many workers is created (and shut down once the context exits).
+    An existing `Executor` is used as is.
+    """
+    if isinstance(parallel, Executor):
+        prefetcher = MotifPrefetcher(sd, parallel)
+        try:
+            yield prefetcher
+        finally:
+            prefetcher.cancel()
+    elif parallel is not None and parallel > 1:
+        with ProcessPoolExecutor(max_workers=parallel) as executor:
+            prefetcher = MotifPrefetcher(sd, executor)
+            try:
+                yield prefetcher
+            finally:
+                prefetcher.cancel()
+    else:
+        yield MotifPrefetcher(sd)
@@ -10,15 +10,17 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Literal, cast
 
 if TYPE_CHECKING:
+    from biobalm._budget import Budget
     from biobalm.succession_diagram import SuccessionDiagram
     from biobalm.types import BooleanSpace
-    from networkx import DiGraph  # type: ignore
 
 import random
 import biobalm
-from biodivine_aeon import Bdd, AsynchronousGraph, BddVariable
-from biobalm.trappist_core import compute_fixed_point_reduced_STG
-from biobalm.symbolic_utils import state_list_to_bdd, valuation_to_state, state_to_bdd
+from biodivine_aeon import AsynchronousGraph
+from biobalm.trappist_core import FixedPointSession
+from biobalm._sd_attractors.batch_simulation import BatchSimulator, minify_candidates
+from biobalm.compiled_network import BitSlicedFunction
+from biobalm.symbolic_utils import state_list_to_bdd, state_to_bdd
 
 try:
     pint_available = True
@@ -33,6 +35,7 @@ def compute_attractor_candidates(
     greedy_asp_minification: bool,
     simulation_minification: bool,
     pint_minification: bool,
+    budget: Budget | None = None,
 ) -> list[BooleanSpace]:
     """
     Compute an optimized list of candidate states that is guaranteed
@@ -82,6 +85,9 @@ def compute_attractor_candidates(
         Whether to enable simulation minification.
     pint_minification: bool
         Whether to enable pint minification.
+    budget: Budget | None
+        If given, the computation raises `TimeoutError` or `MemoryError` once
+        the budget is exceeded.
 
     Returns
     -------
@@ -176,6 +182,10 @@ def compute_attractor_candidates(
     bn_reduced = sd.node_percolated_network(node_id, compute=True)
     graph_reduced = AsynchronousGraph(bn_reduced)
 
+    # All fixed-point queries below use the same Petri net, hence the
+    # corresponding logic program only needs to be grounded once.
+    session = FixedPointSession(pn_reduced, sd.instrumentation, node_id, budget)
+
     retained_set = make_heuristic_retained_set(
         graph_reduced, node_nfvs, child_motifs_reduced
     )
@@ -190,8 +200,7 @@ def compute_attractor_candidates(
         return [retained_set | node_space]
 
     if not greedy_asp_minification:
-        candidate_states = compute_fixed_point_reduced_STG(
-            pn_reduced,
+        candidate_states = session.solve(
             retained_set,
             avoid_subspaces=child_motifs_reduced,
             solution_limit=sd.config["attractor_candidates_limit"],
@@ -205,8 +214,7 @@ def compute_attractor_candidates(
                 f"[{node_id}] Computed {len(candidate_states)} candidate states without retained set optimization."
             )
     else:
-        candidate_states = compute_fixed_point_reduced_STG(
-            pn_reduced,
+        candidate_states = session.solve(
             retained_set,
             avoid_subspaces=child_motifs_reduced,
             solution_limit=sd.config["retained_set_optimization_threshold"],
@@ -226,7 +234,7 @@ def compute_attractor_candidates(
                 optimized = asp_greedy_retained_set_optimization(
                     sd,
                     node_id,
-                    petri_net=pn_reduced,
+                    session=session,
                     retained_set=retained_set,
                     candidate_states=candidate_states,
                     avoid_dnf=child_motifs_reduced,
@@ -244,8 +252,7 @@ def compute_attractor_candidates(
             candidate_states = []
             for var in node_nfvs:
                 retained_set[var] = 0
-                candidate_states_zero = compute_fixed_point_reduced_STG(
-                    pn_reduced,
+                candidate_states_zero = session.solve(
                     retained_set,
                     avoid_subspaces=child_motifs_reduced,
                     solution_limit=sd.config["attractor_candidates_limit"],
@@ -260,8 +267,7 @@ def compute_attractor_candidates(
                     continue
 
                 retained_set[var] = 1
-                candidate_states_one = compute_fixed_point_reduced_STG(
-                    pn_reduced,
+                candidate_states_one = session.solve(
                     retained_set,
                     avoid_subspaces=child_motifs_reduced,
                     solution_limit=len(candidate_states_zero),
@@ -311,7 +317,7 @@ def compute_attractor_candidates(
                     optimized = asp_greedy_retained_set_optimization(
                         sd,
                         node_id,
-                        petri_net=pn_reduced,
+                        session=session,
                         retained_set=retained_set,
                         candidate_states=candidate_states,
                         avoid_dnf=child_motifs_reduced,
@@ -351,33 +357,56 @@ def compute_attractor_candidates(
         max_budget = (
             sd.config["minimum_simulation_budget"] * bn_reduced.variable_count()
         )
-        while len(candidate_states) > 0:
-            if sd.config["debug"]:
-                print(
-                    f"[{node_id}] > Start simulation with {len(candidate_states)} states and simulation limit {iterations}."
+        # Each candidate is simulated using this many independent walks, which
+        # all count towards the budget (ensembles are not used in pseudo-minimal
+        # spaces, see `minify_candidates`).
+        walks = sd.config["simulation_walks"]
+        if avoid_children_symbolic.is_false():
+            walks = 1
+        # The update functions (and the avoid set) are compiled for bit-sliced
+        # simulation only once and then reused by every simulation round.
+        simulator = BatchSimulator(graph_reduced)
+        # We use different simulation approach depending on whether this space
+        # is a minimal trap or not. If the avoid set is empty, it means that this
+        # is a pseudo-minimal space and hence we (a) don't have to check if we
+        # reached the avoid set, and (b) we can stop with one candidate instead
+        # of zero.
+        avoid = (
+            None
+            if avoid_children_symbolic.is_false()
+            else simulator.compile(avoid_children_symbolic)
+        )
+        with sd.instrumentation.timer("simulation", node_id):
+            while len(candidate_states) > 0:
+                if budget is not None:
+                    budget.check()
+                if sd.config["debug"]:
+                    print(
+                        f"[{node_id}] > Start simulation with {len(candidate_states)} states and simulation limit {iterations}."
+                    )
+                reduced = run_simulation_minification(
+                    sd,
+                    node_id,
+                    simulator,
+                    candidate_states,
+                    avoid,
+                    max_iterations=iterations,
+                    simulation_seed=123,
+                    walks=walks,
                 )
-            reduced = run_simulation_minification(
-                sd,
-                node_id,
-                graph_reduced,
-                candidate_states,
-                avoid_children_symbolic,
-                max_iterations=iterations,
-                simulation_seed=123,
-            )
 
-            if (
-                len(reduced) == len(candidate_states)
-                and (iterations * len(candidate_states)) > max_budget
-            ):
-                candidate_states = reduced
-                break
+                if (
+                    len(reduced) == len(candidate_states)
+                    and (iterations * len(candidate_states) * walks) > max_budget
+                ):
+                    candidate_states = reduced
+                    break
 
-            iterations = 2 * iterations
-            candidate_states = reduced
+                iterations = 2 * iterations
+                candidate_states = reduced
 
-            if len(candidate_states) == 1 and avoid_children_symbolic.is_false():
-                break
+                if len(candidate_states) == 1 and avoid_children_symbolic.is_false():
+                    break
 
         if sd.config["debug"]:
             print(f"[{node_id}] > Candidates after simulation: {len(candidate_states)}")
@@ -408,29 +437,32 @@ def compute_attractor_candidates(
         )
         avoid_bdd = children_bdd.l_or(candidates_bdd)
 
-        filtered_states: list[BooleanSpace] = []
-        for i, state in enumerate(candidate_states):
-            state_bdd = state_to_bdd(graph_reduced.symbolic_context(), state)
+        with sd.instrumentation.timer("pint", node_id):
+            filtered_states: list[BooleanSpace] = []
+            for i, state in enumerate(candidate_states):
+                if budget is not None:
+                    budget.check()
+                state_bdd = state_to_bdd(graph_reduced.symbolic_context(), state)
 
-            avoid_bdd = avoid_bdd.l_and_not(state_bdd)
+                avoid_bdd = avoid_bdd.l_and_not(state_bdd)
 
-            keep = True
-            try:
-                if biobalm._pint_reachability.pint_reachability(
-                    pn_reduced, state, avoid_bdd, sd.config
-                ):
-                    keep = False
-            except RuntimeError as e:
-                assert str(e) == "Cannot verify."
+                keep = True
+                try:
+                    if biobalm._pint_reachability.pint_reachability(
+                        pn_reduced, state, avoid_bdd, sd.config
+                    ):
+                        keep = False
+                except RuntimeError as e:
+                    assert str(e) == "Cannot verify."
 
-            if keep:
-                avoid_bdd = avoid_bdd.l_or(state_bdd)
-                filtered_states.append(state)
+                if keep:
+                    avoid_bdd = avoid_bdd.l_or(state_bdd)
+                    filtered_states.append(state)
 
-            if sd.config["debug"]:
-                print(
-                    f"[{node_id}] > `pint` {i + 1}/{len(candidate_states)}: eliminated: {not keep}, retained: {len(filtered_states)}."
-                )
+                if sd.config["debug"]:
+                    print(
+                        f"[{node_id}] > `pint` {i + 1}/{len(candidate_states)}: eliminated: {not keep}, retained: {len(filtered_states)}."
+                    )
 
         candidate_states = filtered_states
 
@@ -448,11 +480,12 @@ def compute_attractor_candidates(
 def run_simulation_minification(
     sd: SuccessionDiagram,
     node_id: int,
-    graph: AsynchronousGraph,
+    simulator: BatchSimulator,
     candidate_states: list[BooleanSpace],
-    avoid_bdd: Bdd,
+    avoid: BitSlicedFunction | None,
     max_iterations: int,
     simulation_seed: int,
+    walks: int = 1,
 ) -> list[BooleanSpace]:
     """
     A fast but incomplete method for eliminating spurious attractor candidates
@@ -462,18 +495,21 @@ def run_simulation_minification(
     ----------
     node_id : int
         The ID of the associated SD node. This is only for logging progress.
-    graph : biodivine_aeon.AsynchronousGraph
-        The symbolic encoding of the *percolated* network dynamics.
+    simulator : BatchSimulator
+        The simulator of the *percolated* network dynamics.
     candidate_states: list[BooleanSpace]
         The list of currently considered candidates that is to be reduced.
-    avoid_bdd: biodivine_aeon.Bdd
-        A symbolic representation of the states/spaces that are to be ignored.
+    avoid: BitSlicedFunction | None
+        The compiled representation of the states/spaces that are to be ignored.
         If any of these states is reachable by a candidate, that candidate is
-        safe to ignore as well.
+        safe to ignore as well. `None` if there are no such states (i.e. the
+        space is pseudo-minimal).
     max_iterations: int
         The number of steps performed by the simulator.
     simulation_seed: int
         The seed value for the random walk simulator.
+    walks: int
+        The number of independent random walks simulated for each candidate.
 
     Returns
     -------
@@ -485,142 +521,26 @@ def run_simulation_minification(
     # is randomized but deterministic.
     generator = random.Random(simulation_seed)
 
-    # Retrieve the symbolic variables that encode each network variable and
-    # associate them with the corresponding network's update functions.
-    symbolic_ctx = graph.symbolic_context()
-    network_vars = graph.network_variables()
-    symbolic_vars: list[BddVariable] = []
-    for var in network_vars:
-        s_var = symbolic_ctx.find_network_bdd_variable(var)
-        assert s_var is not None
-        symbolic_vars.append(s_var)
-    update_functions = {
-        symbolic_vars[i]: graph.mk_update_function(network_vars[i])
-        for i in range(len(network_vars))
-    }
-
-    # Use stochastic simulation to prune the set of candidate states.
-    # We use different simulation approach depending on whether this space
-    # is a minimal trap or not.
-    if not avoid_bdd.is_false():
-        candidates_bdd = state_list_to_bdd(symbolic_ctx, candidate_states)
-        filtered_candidates: list[BooleanSpace] = []
-
-        for i, state in enumerate(candidate_states):
-            if i % 100 == 99 and sd.config["debug"]:
-                print(
-                    f"[{node_id}] > Simulation progress: {i + 1}/{len(candidate_states)}"
-                )
-
-            # Remove the state from the candidates. If we can prove that is
-            # is not an attractor, we will put it back.
-            state_bdd = graph.mk_subspace(state).to_bdd()
-            candidates_bdd = candidates_bdd.l_and_not(state_bdd)
-
-            # Convert the state BDD to a valuation object. This is like
-            # a dictionary, but updates much faster because it is managed
-            # by rust and indexed by symbolic variable IDs and not names.
-            #
-            # (The `state_bdd` should be a singleton, so it's ok to just
-            # take the first valuation)
-            simulation = state_bdd.valuation_first()
-
-            is_valid_candidate = True
-            for _ in range(max_iterations):
-                # Advance all variables by one step in random order.
-                generator.shuffle(symbolic_vars)
-                for s_var in symbolic_vars:
-                    # We can just "call" the BDD as a normal function with
-                    # a valuation as the input.
-                    step = update_functions[s_var](simulation)
-                    simulation[s_var] = step
-
-                # To check for set inclusion, we can also just "eval" the
-                # BDD, since it evaluates to true for every state that is
-                # in the encoded set.
-
-                if candidates_bdd(simulation):
-                    # The state can reach some other state in the candidate
-                    # set. This does not mean it cannot be an attractor, but
-                    # it means it is sufficient to keep considering
-                    # the remaining candidates.
-                    is_valid_candidate = False
-                    break
-
-                if avoid_bdd(simulation):
-                    # The state can reach some other state in the avoid set,
-                    # which means it cannot be an attractor in this subspace.
-                    is_valid_candidate = False
-                    break
-
-            if is_valid_candidate:
-                # If we cannot rule out the candidate, we have to put it back
-                # into the candidate set.
-
-                # However, we want to use the new state (after simulation),
-                # because this one is probably "closer" to the goals that we
-                # want to eventually get to.
-
-                candidates_bdd = candidates_bdd.l_or(Bdd(simulation))
-                filtered_candidates.append(valuation_to_state(symbolic_ctx, simulation))
-
-        return filtered_candidates
-    else:
-        # If the avoid set is empty, it means that this is a pseudo-minimal space
-        # and hence we (a) don't have to check if we reached the avoid set,
-        # and (b) we can stop with one candidate instead of zero.
-
-        candidates_bdd = state_list_to_bdd(symbolic_ctx, candidate_states)
-        printed: set[int] = set()
-        for i in range(max_iterations):
-            progress = int((i * len(candidate_states)) / max_iterations)
-            if (
-                progress % 100 == 99
-                and sd.config["debug"]
-                and (progress not in printed)
-            ):
-                printed.add(progress)
-                print(
-                    f"[{node_id}] > Simulation progress: {progress + 1}/{len(candidate_states)}"
-                )
-
-            generator.shuffle(symbolic_vars)
-            new_candidates_bdd = symbolic_ctx.mk_constant(False)
-
-            # Goes through all the states in the candidates BDD, updates
-            # them, and puts them in the new BDD assuming they are not there yet.
-            for state_val in candidates_bdd.valuation_iterator():
-                candidates_bdd = candidates_bdd.l_and_not(Bdd(state_val))
-
-                simulation = state_val
-                for s_var in symbolic_vars:
-                    step = update_functions[s_var](simulation)
-                    simulation[s_var] = step
-
-                if candidates_bdd(simulation) or new_candidates_bdd(simulation):
-                    # We have reached one of the other candidates.
-                    continue
-
-                new_candidates_bdd = new_candidates_bdd.l_or(Bdd(simulation))
-
-            candidates_bdd = new_candidates_bdd
-
-            if candidates_bdd.cardinality() <= 1:
-                break
+    # All candidates are simulated at once as a single bit-sliced batch
+    # (see `batch_simulation`), which avoids evaluating the update function
+    # BDDs one state at a time.
+    candidates = [simulator.encode(state) for state in candidate_states]
+    filtered = minify_candidates(
+        simulator, candidates, avoid, max_iterations, generator, walks
+    )
 
-        # Finally, we convert the candidate states back into something that
-        # biobalm understands.
-        filtered_candidates = []
-        for state_val in candidates_bdd.valuation_iterator():
-            filtered_candidates.append(valuation_to_state(symbolic_ctx, state_val))
+    if sd.config["debug"]:
+        print(
+            f"[{node_id}] > Simulation removed {len(candidate_states) - len(filtered)}/{len(candidate_states)} candidates."
+        )
 
-        return filtered_candidates
+    return [simulator.decode(state) for state in filtered]
 
 
 def asp_greedy_retained_set_optimization(
     sd: SuccessionDiagram,
     node_id: int,
-    petri_net: DiGraph,
+    session: FixedPointSession,
     retained_set: BooleanSpace,
     candidate_states: list[BooleanSpace],
     avoid_dnf: list[BooleanSpace],
@@ -636,8 +556,9 @@ def asp_greedy_retained_set_optimization(
     ----------
     node_id : int
         The ID of the associated SD node. This is only for logging progress.
-    petri_net : networkx.DiGraph
-        The Petri net encoding of the *percolated* network dynamics.
+    session : FixedPointSession
+        The fixed-point solver session for the Petri net encoding of
+        the *percolated* network dynamics.
     retained_set : BooleanSpace
         The retained set that will be the initial point of the optimization.
     candidate_states: list[BooleanSpace]
@@ -669,8 +590,7 @@ def asp_greedy_retained_set_optimization(
             # candidate set is smaller.
             retained_set_2 = retained_set.copy()
             retained_set_2[var] = cast(Literal[0, 1], 1 - retained_set_2[var])
-            candidate_states_2 = compute_fixed_point_reduced_STG(
-                petri_net,
+            candidate_states_2 = session.solve(
                 retained_set_2,
                 avoid_subspaces=avoid_dnf,
                 # We don't need all solutions if the result isn't smaller.
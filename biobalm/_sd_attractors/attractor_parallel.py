@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from typing import Iterable
+    from biobalm.succession_diagram import SuccessionDiagram
+
+from biodivine_aeon import Bdd, VertexSet
+
+from biobalm.types import BooleanSpace, SuccessionDiagramState
+
+AttractorData = Literal["candidates", "seeds", "sets"]
+
+NodeAttractorResult = (
+    tuple[
+        list[BooleanSpace] | None,
+        list[BooleanSpace] | None,
+        list[bytes] | None,
+        bool,
+    ]
+    | str
+)
+"""
+The attractor candidates, seeds and sets computed for a single node by
+a worker process, and whether the node is unresolved. The sets are serialized
+using `Bdd.data_bytes`, because `VertexSet` objects cannot be pickled. If the
+computation exceeded the per-node budget, the result is the description of
+the exceeded limit instead.
+"""
+
+# The succession diagram copy owned by the current worker process.
+_worker_sd: SuccessionDiagram | None = None
+
+
+def compute_attractors_parallel(
+    sd: SuccessionDiagram,
+    node_ids: Iterable[int],
+    data: AttractorData,
+    parallel: int,
+    worker_memory_limit: int | None = None,
+):
+    """
+    Compute the attractor candidates, seeds, or sets (depending on `data`)
+    for all given nodes using a pool of `parallel` worker processes.
+
+    Each worker receives a copy of the succession diagram once (when it is
+    started) and then processes individual nodes. The results are written back
+    into the `NodeData` of the given succession diagram, such that subsequent
+    calls to `SuccessionDiagram.node_attractor_*` methods do not recompute them.
+
+    If `worker_memory_limit` is given, the address space of each worker process
+    is limited to the given number of bytes (only supported on Unix systems).
+    If some node cannot be processed within this limit, the results of the
+    remaining nodes are still written back, and a `RuntimeError` is raised
+    afterwards.
+
+    Nodes that are marked as deferred or unresolved are skipped, and nodes that
+    exceed the per-node budget (or the symbolic reachability limits) in a worker
+    are marked as deferred (or unresolved) (see
+    `SuccessionDiagramConfiguration.node_time_limit` and
+    `SuccessionDiagramConfiguration.symbolic_size_limit`).
+    """
+
+    pending = [
+        node_id
+        for node_id in node_ids
+        if _is_missing(sd, node_id, data) and not _is_skipped(sd, node_id)
+    ]
+    if len(pending) == 0:
+        return
+
+    broken: BrokenProcessPool | None = None
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(parallel, len(pending)),
+            initializer=_init_worker,
+            initargs=(_worker_state(sd), worker_memory_limit),
+        ) as executor:
+            futures: list[tuple[int, Future[NodeAttractorResult]]] = [
+                (node_id, executor.submit(_node_attractor_job, node_id, data))
+                for node_id in pending
+            ]
+            for node_id, future in futures:
+                try:
+                    result = future.result()
+                except MemoryError:
+                    continue
+                if isinstance(result, str):
+                    sd._defer_node(node_id, result)  # type: ignore
+                    continue
+                _write_back(sd, node_id, result)
+                if sd.config["debug"]:
+                    print(f"[{node_id}] Attractor {data} computed by a worker.")
+    except BrokenProcessPool as error:
+        # A worker was killed (typically because a native allocation failed
+        # due to the memory limit). The remaining nodes are reported below.
+        broken = error
+
+    failed = [
+        node_id
+        for node_id in pending
+        if _is_missing(sd, node_id, data) and not _is_skipped(sd, node_id)
+    ]
+    if len(failed) > 0:
+        if worker_memory_limit is not None:
+            raise RuntimeError(
+                f"Attractor computation exceeded the worker memory limit ({worker_memory_limit} bytes) for nodes {failed}."
+            ) from broken
+        raise RuntimeError(
+            f"Attractor computation failed in a worker process for nodes {failed}."
+        ) from broken
+
+
+def _is_missing(sd: SuccessionDiagram, node_id: int, data: AttractorData) -> bool:
+    node = sd.node_data(node_id)
+    if data == "candidates":
+        return node["attractor_candidates"] is None and node["attractor_seeds"] is None
+    if data == "seeds":
+        return node["attractor_seeds"] is None
+    return node["attractor_sets"] is None
+
+
+def _is_skipped(sd: SuccessionDiagram, node_id: int) -> bool:
+    node = sd.node_data(node_id)
+    return node["deferred"] or node["unresolved"]
+
+
+def _worker_state(sd: SuccessionDiagram) -> SuccessionDiagramState:
+    """
+    The state of the succession diagram that is sent to the worker processes.
+
+    This is the same as `SuccessionDiagram.__getstate__`, except that the
+    attractor sets are erased, since these cannot be pickled (and are not
+    needed by the workers anyway).
+    """
+    state = sd.__getstate__()
+    dag = state["dag"].copy()  # type: ignore
+    for node_id in dag.nodes():  # type: ignore
+        dag.nodes[node_id]["attractor_sets"] = None  # type: ignore
+    state["dag"] = dag
+    return state
+
+
+def _init_worker(state: SuccessionDiagramState, memory_limit: int | None):
+    from biobalm.succession_diagram import SuccessionDiagram
+
+    global _worker_sd
+
+    if memory_limit is not None:
+        import resource
+
+        (_, hard) = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            memory_limit = min(memory_limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
+
+    sd = SuccessionDiagram.__new__(SuccessionDiagram)
+    sd.__setstate__(state)
+    _worker_sd = sd
+
+
+def _node_attractor_job(node_id: int, data: AttractorData) -> NodeAttractorResult:
+    sd = _worker_sd
+    assert sd is not None
+
+    node = sd.node_data(node_id)
+    try:
+        if data == "candidates":
+            sd.node_attractor_candidates(node_id, compute=True)
+        elif data == "seeds":
+            sd.node_attractor_seeds(node_id, compute=True)
+        else:
+            sd.node_attractor_sets(node_id, compute=True)
+    except (TimeoutError, MemoryError) as error:
+        if not node["deferred"]:
+            raise
+        return str(error)
+    except RuntimeError:
+        # The remaining candidates of an unresolved node are sent back.
+        if not node["unresolved"]:
+            raise
+
+    sets = node["attractor_sets"]
+    sets_data = None
+    if sets is not None:
+        sets_data = [s.to_bdd().data_bytes() for s in sets]
+
+    # Erase the percolated data from the worker copy. It is not needed
+    # anymore and would otherwise accumulate in the worker memory.
+    node["percolated_network"] = None
+    node["percolated_nfvs"] = None
+    node["percolated_petri_net"] = None
+
+    return (
+        node["attractor_candidates"],
+        node["attractor_seeds"],
+        sets_data,
+        node["unresolved"],
+    )
+
+
+def _write_back(
+    sd: SuccessionDiagram,
+    node_id: int,
+    result: tuple[
+        list[BooleanSpace] | None, list[BooleanSpace] | None, list[bytes] | None, bool
+    ],
+):
+    (candidates, seeds, sets_data, unresolved) = result
+    node = sd.node_data(node_id)
+    sd.modified_nodes.add(node_id)
+
+    if unresolved:
+        # The worker replaced the candidates with those that remain undecided.
+        sd._mark_unresolved(node_id, candidates)  # type: ignore
+    elif node["attractor_candidates"] is None:
+        node["attractor_candidates"] = candidates
+    if node["attractor_seeds"] is None:
+        node["attractor_seeds"] = seeds
+    if node["attractor_sets"] is None and sets_data is not None:
+        ctx = sd.symbolic.symbolic_context()
+        sets = [VertexSet(ctx, Bdd(ctx.bdd_variable_set(), x)) for x in sets_data]
+        sd._store_attractor_sets(node_id, sets)  # type: ignore
+
+    # Same as in `SuccessionDiagram.node_attractor_seeds`: release memory
+    # once we know that the node has no attractors.
+    if seeds is not None and len(seeds) == 0:
+        node["percolated_network"] = None
+        node["percolated_nfvs"] = None
+        node["percolated_petri_net"] = None
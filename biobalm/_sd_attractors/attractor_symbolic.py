@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import time
 from typing import TYPE_CHECKING, cast, Literal
 
 if TYPE_CHECKING:
+    from biobalm._budget import Budget
     from biobalm.succession_diagram import SuccessionDiagram
-    from biodivine_aeon import VariableId
+    from biodivine_aeon import Bdd, BddVariable, VariableId
 
 from biodivine_aeon import AsynchronousGraph, ColoredVertexSet, VertexSet
 from biobalm.symbolic_utils import state_list_to_bdd
@@ -16,7 +18,11 @@ def compute_attractors_symbolic(
     node_id: int,
     candidate_states: list[BooleanSpace],
     seeds_only: bool = False,
-) -> tuple[list[BooleanSpace], list[VertexSet] | None]:
+    budget: Budget | None = None,
+    backward_pruning: bool = False,
+    size_limit: int | None = None,
+    time_limit: float | None = None,
+) -> tuple[list[BooleanSpace], list[VertexSet] | None, list[BooleanSpace] | None]:
     """
     Uses exhaustive symbolic reachability to eliminate spurious candidate states
     and to compute the exact attractor sets.
@@ -33,12 +39,28 @@ def compute_attractors_symbolic(
     seeds_only: bool
         If `True`, the method can terminate early once it is guaranteed that
         all seeds have been identified. In such case, the list of returned sets
-        is `None`.
+        is `None`, and the attractor sets are never converted to the symbolic
+        encoding of the whole network.
+    budget: Budget | None
+        If given, the computation raises `TimeoutError` or `MemoryError` once
+        the budget is exceeded.
+    backward_pruning: bool
+        If `True`, all candidates that can reach a child space are discarded
+        using a single backward reachability fixpoint before the remaining
+        candidates are tested (see
+        `SuccessionDiagramConfiguration.symbolic_backward_pruning`).
+    size_limit: int | None
+        The maximal size (in BDD nodes) of a reachable set.
+    time_limit: float | None
+        The maximal number of seconds spent in the symbolic reachability.
 
     Returns
     -------
-    tuple[list[BooleanSpace], list[VertexSet] | None]
-        The list of attractor seed states and corresponding attractor sets (if computed).
+    tuple[list[BooleanSpace], list[VertexSet] | None, list[BooleanSpace] | None]
+        The list of attractor seed states, the corresponding attractor sets (if
+        computed), and `None`. If `size_limit` or `time_limit` is exceeded, the
+        seeds found so far, `None`, and the list of all candidates that are not
+        disproved yet (including the seeds found so far).
     """
 
     node_data = sd.node_data(node_id)
@@ -69,15 +91,39 @@ def compute_attractors_symbolic(
     children_set = ColoredVertexSet(symbolic_ctx, child_motifs_bdd)
     candidate_set = ColoredVertexSet(symbolic_ctx, candidate_bdd)
 
-    avoid = candidate_set.union(children_set)
+    engine = SymbolicReachability(
+        graph_reduced,
+        candidate_set.union(children_set),
+        sd.config["debug"],
+        node_id,
+        size_limit,
+        time_limit,
+        keep_closures=not seeds_only,
+    )
+
+    if backward_pruning and len(child_motifs_reduced) > 0:
+        # Candidates that can reach a child space cannot be attractor states,
+        # so they are all discarded using a single backward fixpoint.
+        basin = engine.prune_basin(children_set, budget)
+        if basin is None:
+            return ([], None, candidate_states)
+        remaining_bdd = candidate_set.minus(basin).to_bdd()
+        candidate_states_reduced = [
+            c
+            for c in candidate_states_reduced
+            if not remaining_bdd.r_select(cast(dict[str, Literal[0, 1]], c)).is_false()
+        ]
+        if sd.config["debug"]:
+            print(
+                f"[{node_id}] > Backward pruning retained {len(candidate_states_reduced)}/{len(candidate_states)} candidates."
+            )
 
     if sd.config["debug"]:
         print(
-            f"[{node_id}] > Start symbolic seed state identification with {len(candidate_states)} candidates and {avoid} avoid states."
+            f"[{node_id}] > Start symbolic seed state identification with {len(candidate_states)} candidates and {engine.avoid} avoid states."
         )
 
     seeds: list[BooleanSpace] = []
-    sets: list[ColoredVertexSet] = []
     for i, candidate in enumerate(candidate_states_reduced):
         is_last = i == len(candidate_states_reduced) - 1
         is_minimal = len(child_motifs_reduced) == 0
@@ -89,12 +135,17 @@ def compute_attractors_symbolic(
                 print(
                     f"[{node_id}] > Single seed remaining in a (pseduo) minimal space. Done."
                 )
-            return ([candidate | node_space], None)
-        candidate_singleton = graph_reduced.mk_subspace(candidate)
+            return ([candidate | node_space], None, None)
 
-        avoid = avoid.minus(candidate_singleton)
+        closure = engine.attractor_test(candidate, budget)
 
-        closure = symbolic_attractor_test(sd, node_id, graph_reduced, candidate, avoid)
+        if engine.interrupted is not None:
+            undecided = seeds + [c | node_space for c in candidate_states_reduced[i:]]
+            if sd.config["debug"]:
+                print(
+                    f"[{node_id}] > {engine.interrupted} Unresolved candidates: {len(undecided)}."
+                )
+            return (seeds, None, undecided)
 
         if closure is None:
             # This candidate can reach someone else in the candidate set,
@@ -102,140 +153,385 @@ def compute_attractors_symbolic(
             # an attractor.
             continue
 
-        # Otherwise, we have an attractor set and we can save it.
-        # It also becomes a part of the avoid set.
-        avoid = avoid.union(closure)
+        # Otherwise, we have an attractor set (the engine also makes
+        # it a part of the avoid set).
         seeds.append(candidate | node_space)
-        sets.append(closure)
 
     if sd.config["debug"]:
         print(f"[{node_id}] > Finished identification with {len(seeds)} seed states.")
 
+    if seeds_only:
+        return (seeds, None, None)
+
     space_symbolic = sd.symbolic.mk_subspace(node_space).vertices()
     sets_converted: list[VertexSet] = []
-    for s in sets:
+    for s in engine.closures:
         # Extend the attractor set with fixed nodes from the node space.
         vertices = s.vertices()
         vertices = sd.symbolic.transfer_from(vertices, graph_reduced)
         vertices = vertices.intersect(space_symbolic)
         sets_converted.append(vertices)
 
-    return (seeds, sets_converted)
+    return (seeds, sets_converted, None)
 
 
-def symbolic_attractor_test(
-    sd: SuccessionDiagram,
-    node_id: int,
-    graph: AsynchronousGraph,
-    pivot: BooleanSpace,
-    avoid_set: ColoredVertexSet,
-) -> ColoredVertexSet | None:
+class SymbolicReachability:
     """
-    Use symbolic reachability with saturation to compute the set of states
-    reachable from the given `pivot`, or `None` if the reachability procedure
-    intersects with any state in the `avoid` set.
+    Symbolic reachability with saturation within a single succession diagram
+    node, shared by all attractor tests of the node.
+
+    The engine maintains the `avoid` set (the untested candidates, the child
+    spaces and the attractors found so far) and the forward closures of the
+    discovered attractors. A pivot that lies in one of these closures is
+    rejected immediately. A pivot without any successors is accepted as
+    a fixed-point without any further reachability. The network variables and
+    their BDD counterparts are resolved once (in the saturation order), and the
+    conflicts between pivot values and the avoid set are cached until a new
+    attractor is found.
+
+    If a reachable set exceeds `size_limit` BDD nodes, or the reachability
+    procedures of the engine take more than `time_limit` seconds in total,
+    the current test is interrupted (see :attr:`interrupted`).
 
     *The reason why we use `ColoredVertexSet` instead of `VertexSet` is mostly
     a technicality that should be irelevant in biobalm, since we don't allow any
     parameters outside of unknown inputs.*
+
+    Parameters
+    ----------
+    graph : AsynchronousGraph
+        The (percolated) network of the node.
+    avoid : ColoredVertexSet
+        The initial avoid set, i.e. all candidate states and child spaces.
+    debug : bool
+        Print progress messages.
+    node_id : int | None
+        The ID of the node (only used in progress messages).
+    size_limit : int | None
+        The maximal size (in BDD nodes) of a reachable set.
+    time_limit : float | None
+        The maximal number of seconds spent in reachability procedures.
+    keep_closures : bool
+        If `False`, the individual closures are not stored in :attr:`closures`
+        (e.g. if only the attractor seeds are needed), and only their union
+        is kept.
     """
 
-    if avoid_set.is_empty():
-        avoid = None
-    else:
-        avoid = avoid_set
-
-    reach_set = graph.mk_subspace(pivot)
-
-    # The variables for which we already maintain that `reach_set`
-    # contains all reachable states.
-    saturated_vars: list[VariableId] = []
-
-    # Variables where `reach_set` differs from the states in `avoid`.
-    # We should prioritize updating these variables, because they *need*
-    # to be updated if we are ever to reach `avoid`.
-    conflict_vars: list[VariableId] = []
-
-    # Populate conflict vars, assuming we have any.
-    if avoid is not None:
-        avoid_bdd = avoid.to_bdd()
-        for name, val in pivot.items():
-            var = graph.find_network_variable(name)
-            bdd_var = graph.symbolic_context().find_network_bdd_variable(name)
-            assert var is not None and bdd_var is not None
-            incompatible = avoid_bdd.r_select({bdd_var: cast(Literal[0, 1], 1 - val)})
-            if not incompatible.is_false():
+    __slots__ = (
+        "graph",
+        "avoid",
+        "closures",
+        "keep_closures",
+        "debug",
+        "node_id",
+        "size_limit",
+        "time_limit",
+        "interrupted",
+        "_elapsed",
+        "_started",
+        "_attractors",
+        "_variables",
+        "_targets",
+        "_conflicts",
+    )
+
+    def __init__(
+        self,
+        graph: AsynchronousGraph,
+        avoid: ColoredVertexSet,
+        debug: bool = False,
+        node_id: int | None = None,
+        size_limit: int | None = None,
+        time_limit: float | None = None,
+        keep_closures: bool = True,
+    ):
+        self.graph = graph
+        self.avoid = avoid
+        """
+        The states that must not be reachable from an attractor pivot.
+        """
+        self.closures: list[ColoredVertexSet] = []
+        """
+        The forward closures (attractor sets) of the pivots that passed
+        the attractor test, in the order of discovery (empty if
+        `keep_closures` is `False`).
+        """
+        self.keep_closures = keep_closures
+        # The union of all closures found so far.
+        self._attractors = graph.mk_empty_colored_vertices()
+        self.debug = debug
+        self.node_id = node_id
+        self.size_limit = size_limit
+        self.interrupted: str | None = None
+        """
+        If not `None`, the description of the exceeded limit. Once the engine
+        is interrupted, the results of all further tests are `None`.
+        """
+        self.time_limit = time_limit
+        # The time spent in the finished reachability procedures, and the start
+        # of the running one (the setup of the engine does not count).
+        self._elapsed = 0.0
+        self._started: float | None = None
+
+        ctx = graph.symbolic_context()
+        self._variables: dict[str, tuple[VariableId, BddVariable]] = {}
+        for var in sort_variable_list(graph.network_variables()):
+            name = graph.get_network_variable_name(var)
+            bdd_var = ctx.find_network_bdd_variable(name)
+            assert bdd_var is not None
+            self._variables[name] = (var, bdd_var)
+
+        # A superset of the avoid set that only grows once an attractor is found.
+        # Removing the tested pivot from the avoid set never changes the
+        # conflicts of that pivot, hence they can be computed using this set.
+        self._targets: Bdd = avoid.to_bdd()
+        self._conflicts: dict[tuple[BddVariable, int], bool] = {}
+
+    def attractor_test(
+        self, pivot: BooleanSpace, budget: Budget | None = None
+    ) -> ColoredVertexSet | None:
+        """
+        Compute the set of states reachable from the given `pivot`, or `None`
+        if the reachability procedure intersects with any state in the avoid
+        set (or if the engine is interrupted). The pivot is removed from the
+        avoid set, and if its closure is returned, the closure is added to the
+        avoid set.
+
+        If `budget` is given, the reachability procedure raises `TimeoutError`
+        or `MemoryError` once the budget is exceeded.
+        """
+        graph = self.graph
+        node_id = self.node_id
+
+        reach_set = graph.mk_subspace(pivot)
+        self.avoid = self.avoid.minus(reach_set)
+
+        if not self._attractors.intersect(reach_set).is_empty():
+            if self.debug:
+                print(f"[{node_id}] > Pivot is in a known attractor. Done.")
+            return None
+
+        is_state = all(name in pivot for name in self._variables)
+        if is_state and all(
+            graph.var_post_out(var, reach_set).is_empty()
+            for (var, _) in self._variables.values()
+        ):
+            # The pivot is a fixed-point, which is always an attractor.
+            if self.debug:
+                print(f"[{node_id}] > Pivot is a fixed-point. Done.")
+            self._add_closure(reach_set)
+            return reach_set
+
+        avoid = None if self.avoid.is_empty() else self.avoid
+
+        # Variables where `reach_set` differs from the states in `avoid`.
+        # We should prioritize updating these variables, because they *need*
+        # to be updated if we are ever to reach `avoid`.
+        conflict_vars: list[VariableId] = []
+
+        # Remaining network variables that are still relevant, but may not
+        # be necessary to reach `avoid`.
+        other_vars: list[VariableId] = []
+
+        # Populate conflict vars, assuming we have any (both lists
+        # follow the saturation order).
+        for name, (var, bdd_var) in self._variables.items():
+            value = pivot.get(name)
+            if (
+                avoid is not None
+                and value is not None
+                and self._is_conflict(bdd_var, 1 - value)
+            ):
                 conflict_vars.append(var)
-        conflict_vars = sort_variable_list(conflict_vars)
+            else:
+                other_vars.append(var)
 
-    # Remaining network variables that are still relevant, but may not
-    # be necessary to reach `avoid`.
-    other_vars: list[VariableId] = [
-        x for x in graph.network_variables() if x not in conflict_vars
-    ]
-    other_vars = sort_variable_list(other_vars)
+        if self.debug:
+            print(
+                f"[{node_id}] > Start symbolic reachability with {len(conflict_vars)} conflict variables and {len(other_vars)} other variables."
+            )
 
-    if sd.config["debug"]:
-        print(
-            f"[{node_id}] > Start symbolic reachability with {len(conflict_vars)} conflict variables and {len(other_vars)} other variables."
-        )
-
-    all_done = False
-    while not all_done:
-        all_done = True
-
-        # Saturate reach set with currently selected variables.
-        saturation_done = False
-        while not saturation_done:
-            if avoid is not None and not avoid.intersect(reach_set).is_empty():
-                if sd.config["debug"]:
-                    print(f"[{node_id}] > Discovered avoid state. Done.")
-                return None
-
-            saturation_done = True
-            for var in saturated_vars:
-                successors = graph.var_post_out(var, reach_set)
+        closure = self._saturate(reach_set, conflict_vars + other_vars, avoid, budget)
+        if closure is None:
+            return None
+        reach_set = closure
+
+        if self.debug:
+            print(f"[{node_id}] > Reachability completed with {reach_set}.")
+
+        self._add_closure(reach_set)
+        return reach_set
+
+    def prune_basin(
+        self, targets: ColoredVertexSet, budget: Budget | None = None
+    ) -> ColoredVertexSet | None:
+        """
+        Compute the set of states that can reach `targets` (using backward
+        reachability with saturation) and add it to the avoid set. Returns
+        `None` if the engine is interrupted.
+
+        The `targets` must be a trap set (e.g. the child spaces of the node),
+        such that no state of the returned basin outside of `targets` can
+        belong to an attractor. Every pivot inside the basin can be thus
+        discarded without a forward search.
+
+        If `budget` is given, the reachability procedure raises `TimeoutError`
+        or `MemoryError` once the budget is exceeded.
+        """
+        variables = [var for (var, _) in self._variables.values()]
+        basin = self._saturate(targets, variables, None, budget, forward=False)
+        if basin is None:
+            return None
+
+        if self.debug:
+            print(f"[{self.node_id}] > Backward reachability completed with {basin}.")
+
+        self.avoid = self.avoid.union(basin)
+        self._targets = self._targets.l_or(basin.to_bdd())
+        self._conflicts = {k: v for (k, v) in self._conflicts.items() if v}
+        return basin
+
+    def _saturate(
+        self,
+        reach_set: ColoredVertexSet,
+        variables: list[VariableId],
+        avoid: ColoredVertexSet | None,
+        budget: Budget | None,
+        forward: bool = True,
+    ) -> ColoredVertexSet | None:
+        """
+        Extend `reach_set` with all (forward or backward) reachable states,
+        or return `None` once `reach_set` intersects `avoid` (or once
+        the engine is interrupted). The `variables` are added to the saturation
+        in the given order of priority.
+        """
+        self._started = time.perf_counter()
+        try:
+            return self._saturate_timed(
+                reach_set, variables, avoid, budget, forward=forward
+            )
+        finally:
+            self._elapsed += time.perf_counter() - self._started
+            self._started = None
+
+    def _saturate_timed(
+        self,
+        reach_set: ColoredVertexSet,
+        variables: list[VariableId],
+        avoid: ColoredVertexSet | None,
+        budget: Budget | None,
+        forward: bool,
+    ) -> ColoredVertexSet | None:
+        """
+        The implementation of `_saturate` (which measures its running time).
+        """
+        graph = self.graph
+        node_id = self.node_id
+        step = graph.var_post_out if forward else graph.var_pre_out
+
+        # The variables for which we already maintain that `reach_set`
+        # contains all reachable states.
+        saturated_vars: list[VariableId] = []
+        remaining_vars = list(variables)
+
+        all_done = False
+        while not all_done:
+            all_done = True
+
+            # Saturate reach set with currently selected variables.
+            saturation_done = False
+            while not saturation_done:
+                if avoid is not None and not avoid.intersect(reach_set).is_empty():
+                    if self.debug:
+                        print(f"[{node_id}] > Discovered avoid state. Done.")
+                    return None
+
+                if budget is not None:
+                    budget.check()
+
+                self.interrupted = self._exceeded(reach_set)
+                if self.interrupted is not None:
+                    if self.debug:
+                        print(f"[{node_id}] > {self.interrupted}")
+                    return None
+
+                saturation_done = True
+                for var in saturated_vars:
+                    successors = step(var, reach_set)
+                    if not successors.is_empty():
+                        reach_set = reach_set.union(successors)
+                        saturation_done = False
+                        if reach_set.symbolic_size() > 100_000 and self.debug:
+                            print(
+                                f"[{node_id}] > Saturation({len(saturated_vars)}) Expanded reach_set: {reach_set}"
+                            )
+                        break
+
+            # Once saturated, try to expand the saturated collection with
+            # one of the remaining variables (in the order of priority).
+            for var in remaining_vars:
+                successors = step(var, reach_set)
                 if not successors.is_empty():
                     reach_set = reach_set.union(successors)
-                    saturation_done = False
-                    if reach_set.symbolic_size() > 100_000 and sd.config["debug"]:
+                    all_done = False
+
+                    remaining_vars.remove(var)
+                    saturated_vars.append(var)
+                    saturated_vars = sort_variable_list(saturated_vars)
+
+                    if self.debug:
                         print(
-                            f"[{node_id}] > Saturation({len(saturated_vars)}) Expanded reach_set: {reach_set}"
+                            f"[{node_id}] > Saturation({len(saturated_vars)}) Added saturation variable. {len(remaining_vars)} variables remaining."
                         )
                     break
 
-        # Once saturated, try to expand the saturated
-        # collection with either a conflict variable or
-        # other variable.
-
-        # First try conflict vars, then other vars.
-        for var in conflict_vars + other_vars:
-            successors = graph.var_post_out(var, reach_set)
-            if not successors.is_empty():
-                reach_set = reach_set.union(successors)
-                all_done = False
-
-                # This is a bit wasteful but at this point it
-                # should be irrelevant for performance.
-                if var in conflict_vars:
-                    conflict_vars.remove(var)
-
-                if var in other_vars:
-                    other_vars.remove(var)
-
-                saturated_vars.append(var)
-                saturated_vars = sort_variable_list(saturated_vars)
-
-                if sd.config["debug"]:
-                    print(
-                        f"[{node_id}] > Saturation({len(saturated_vars)}) Added saturation variable. {len(conflict_vars)} conflict and {len(other_vars)} other variables remaining."
-                    )
-                break
-
-    if sd.config["debug"]:
-        print(f"[{node_id}] > Reachability completed with {reach_set}.")
-
-    return reach_set
+        return reach_set
+
+    def _add_closure(self, closure: ColoredVertexSet):
+        """
+        Register the closure of a pivot that passed the attractor test.
+        """
+        self.avoid = self.avoid.union(closure)
+        self._attractors = self._attractors.union(closure)
+        if self.keep_closures:
+            self.closures.append(closure)
+        self._targets = self._targets.l_or(closure.to_bdd())
+        # New states can only create new conflicts.
+        self._conflicts = {k: v for (k, v) in self._conflicts.items() if v}
+
+    def _exceeded(self, reach_set: ColoredVertexSet) -> str | None:
+        """
+        The description of the exceeded limit, or `None` if the reachability
+        can continue.
+        """
+        if self.interrupted is not None:
+            return self.interrupted
+        if self.size_limit is not None and reach_set.symbolic_size() > self.size_limit:
+            return f"Exceeded the symbolic size limit ({self.size_limit} BDD nodes; see `SuccessionDiagramConfiguration.symbolic_size_limit`)."
+        if self.time_limit is not None and self._spent() > self.time_limit:
+            return "Exceeded the symbolic time limit (see `SuccessionDiagramConfiguration.symbolic_time_limit`)."
+        return None
+
+    def _spent(self) -> float:
+        """
+        The total number of seconds spent in the reachability procedures.
+        """
+        if self._started is None:
+            return self._elapsed
+        return self._elapsed + time.perf_counter() - self._started
+
+    def _is_conflict(self, bdd_var: BddVariable, value: int) -> bool:
+        """
+        True if some state of the avoid set (or some already tested pivot) sets
+        `bdd_var` to `value`.
+        """
+        key = (bdd_var, value)
+        conflict = self._conflicts.get(key)
+        if conflict is None:
+            selection = self._targets.r_select({bdd_var: cast(Literal[0, 1], value)})
+            conflict = not selection.is_false()
+            self._conflicts[key] = conflict
+        return conflict
 
 
 def sort_variable_list(variables: list[VariableId]):
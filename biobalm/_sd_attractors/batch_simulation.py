@@ -0,0 +1,223 @@
+"""
+A bit-sliced simulator that advances many network states at once.
+
+The states of a batch are stored "transposed" (see
+:mod:`compiled_network<biobalm.compiled_network>`), such that an update
+function can be evaluated for all states of the batch using a few integer
+operations per BDD node (instead of one BDD evaluation per state).
+"""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from biodivine_aeon import AsynchronousGraph, Bdd
+
+from biobalm.compact_space import CompactSpace, SpaceEncoder
+from biobalm.compiled_network import BitSlicedFunction, from_slices, to_slices
+from biobalm.types import BooleanSpace
+
+# The number of simulation steps between two checks of whether a state
+# reached another candidate (which requires un-transposing the batch).
+CHECK_INTERVAL = 8
+
+
+class BatchSimulator:
+    """
+    Simulates batches of states of an `AsynchronousGraph` (with no parameters).
+
+    A state is represented as an integer, with the `i`-th bit being the value
+    of the `i`-th network variable. The update functions are compiled once
+    into :class:`BitSlicedFunction<biobalm.compiled_network.BitSlicedFunction>`
+    objects (the cube tables of a
+    :class:`CompiledNetwork<biobalm.compiled_network.CompiledNetwork>` are not
+    needed for simulation), hence one simulator should be reused for all
+    simulations within the same network.
+    """
+
+    __slots__ = ("encoder", "variable_index", "functions")
+
+    def __init__(self, graph: AsynchronousGraph):
+        ctx = graph.symbolic_context()
+        self.encoder = SpaceEncoder.from_network(graph)
+        self.variable_index: dict[int, int] = {}
+        for var in graph.network_variables():
+            bdd_var = ctx.find_network_bdd_variable(var)
+            assert bdd_var is not None
+            self.variable_index[int(bdd_var)] = int(var)
+        self.functions: list[BitSlicedFunction] = [
+            self.compile(graph.mk_update_function(var))
+            for var in graph.network_variables()
+        ]
+
+    def compile(self, bdd: Bdd) -> BitSlicedFunction:
+        """
+        Compile a BDD over the network variables for bit-sliced evaluation
+        (e.g. a set of states that should be avoided by the simulation).
+        """
+        return BitSlicedFunction(bdd, self.variable_index)
+
+    def encode(self, state: BooleanSpace) -> int:
+        """
+        Convert a `BooleanSpace` into a state integer. Variables that are not
+        fixed in the space are set to `0`.
+        """
+        return self.encoder.encode(state).values
+
+    def decode(self, state: int) -> BooleanSpace:
+        """
+        Convert a state integer into a `BooleanSpace`.
+        """
+        full = (1 << len(self.encoder.variables)) - 1
+        return self.encoder.decode(CompactSpace(full, state))
+
+    def to_slices(self, states: list[int]) -> list[int]:
+        """
+        Transpose a list of states into a batch.
+        """
+        return to_slices(states, len(self.encoder.variables))
+
+    def step(self, slices: list[int], full: int, order: list[int]):
+        """
+        Update the variables of every state in the batch one by one, following
+        the given `order`.
+        """
+        functions = self.functions
+        for var in order:
+            slices[var] = functions[var].eval(slices, full)
+
+
+def minify_candidates(
+    simulator: BatchSimulator,
+    candidates: list[int],
+    avoid: BitSlicedFunction | None,
+    max_iterations: int,
+    generator: random.Random,
+    walks: int = 1,
+) -> list[int]:
+    """
+    Simulate all `candidates` at once and remove the ones that provably do not
+    need to be considered as attractor states.
+
+    A candidate is removed if it reaches a state in `avoid`, or if it reaches
+    a state that was visited by a candidate with a higher index (i.e. its original
+    state, or its position during one of the previous checks). Since the indices
+    always increase along such "reached by" chains, every attractor that
+    contains a candidate keeps at least one (simulated) candidate. If `avoid`
+    is `None`, the simulation also stops once only one candidate remains.
+
+    If `walks > 1`, every candidate is simulated using an ensemble of `walks`
+    independent random walks (all part of the same batch). In each step, every
+    walk only updates a random subset of variables, hence the walks diverge
+    even though they share the update order. A candidate is removed as soon as
+    any of its walks reaches `avoid` or the original state of a candidate with
+    a higher index. Without `avoid`, candidates can be only removed by merging
+    walks of different candidates, which is not possible for ensembles. Hence
+    in such case, each candidate is always simulated using a single walk.
+
+    Returns the current states of the remaining candidates (for each candidate,
+    the state of one of its walks).
+    """
+    # Duplicate candidates are removed immediately.
+    unique = list(dict.fromkeys(candidates))
+    if avoid is None:
+        if len(unique) <= 1:
+            return unique
+        walks = 1
+    visited: dict[int, int] = {s: i for i, s in enumerate(unique)}
+    # `ranks[k]` is the index of the candidate simulated at the `k`-th position.
+    ranks = [i for i in range(len(unique)) for _ in range(walks)]
+    states = [s for s in unique for _ in range(walks)]
+
+    functions = simulator.functions
+    variables = list(range(len(simulator.encoder.variables)))
+    slices = simulator.to_slices(states)
+    full = (1 << len(states)) - 1
+    active = full
+
+    for iteration in range(max_iterations):
+        generator.shuffle(variables)
+        if walks == 1:
+            simulator.step(slices, full, variables)
+        else:
+            width = full.bit_length()
+            for var in variables:
+                updated = functions[var].eval(slices, full)
+                mask = generator.getrandbits(width)
+                slices[var] = (updated & mask) | (slices[var] & ~mask)
+
+        if avoid is not None:
+            hit = avoid.eval(slices, full) & active
+            if hit != 0:
+                if walks == 1:
+                    active &= ~hit
+                else:
+                    hit_ranks = {ranks[p] for p in _mask_positions(hit)}
+                    for position in _mask_positions(active):
+                        if ranks[position] in hit_ranks:
+                            active &= ~(1 << position)
+            if active == 0:
+                return []
+
+        if iteration % CHECK_INTERVAL != CHECK_INTERVAL - 1:
+            continue
+
+        positions = _mask_positions(active)
+        states = from_slices(slices, positions)
+        removed: set[int] = set()
+        for position, state in zip(positions, states):
+            if visited.get(state, -1) > ranks[position]:
+                removed.add(ranks[position])
+
+        # Walks that are in the same state are merged. A single walk is merged
+        # into the highest ranked walk, but the walks of an ensemble can only
+        # be merged with walks of the same candidate (the candidate is removed
+        # when any walk reaches `avoid`, in which case the other walks cannot
+        # serve as a witness for the removal of another candidate).
+        current: dict[tuple[int, int], int] = {}
+        for position, state in zip(positions, states):
+            if ranks[position] not in removed:
+                rank = ranks[position] if walks > 1 else 0
+                current[(state, rank)] = position
+        if walks == 1:
+            for (state, _), position in current.items():
+                visited[state] = ranks[position]
+
+        kept_positions: list[int] = []
+        kept_states: list[int] = []
+        for (state, _), position in current.items():
+            kept_positions.append(position)
+            kept_states.append(state)
+
+        if avoid is None and len({ranks[p] for p in kept_positions}) <= 1:
+            return kept_states[:1]
+
+        if len(kept_positions) < (full.bit_length() // 2):
+            # Compact the batch so that removed states are not simulated anymore.
+            order = sorted(range(len(kept_positions)), key=lambda i: kept_positions[i])
+            ranks = [ranks[kept_positions[i]] for i in order]
+            slices = simulator.to_slices([kept_states[i] for i in order])
+            full = (1 << len(ranks)) - 1
+            active = full
+        else:
+            active = 0
+            for position in kept_positions:
+                active |= 1 << position
+
+    # One state for every remaining candidate.
+    positions = _mask_positions(active)
+    states = from_slices(slices, positions)
+    result: dict[int, int] = {}
+    for position, state in zip(positions, states):
+        result.setdefault(ranks[position], state)
+    return list(dict.fromkeys(result.values()))
+
+
+def _mask_positions(mask: int) -> list[int]:
+    """
+    The (sorted) positions of all bits that are set in the given `mask`.
+    """
+    bits = bin(mask)[:1:-1]
+    return [i for i, bit in enumerate(bits) if bit == "1"]
@@ -0,0 +1,299 @@
+"""
+A compact, versioned binary format of succession diagrams.
+
+This is used by :meth:`SuccessionDiagram.save<biobalm.SuccessionDiagram.save>`
+and :meth:`SuccessionDiagram.load<biobalm.SuccessionDiagram.load>`. Compared to
+pickling, the format only stores the information that cannot be cheaply
+recomputed:
+
+- The network rules, configuration and NFVS (as a JSON header).
+- Node spaces as packed 2-bit vectors (see :meth:`SpaceEncoder.pack<biobalm.compact_space.SpaceEncoder.pack>`),
+  stored in the order of node IDs.
+- Node depths, expansion flags and deferral flags as integer arrays.
+- Edges as three integer arrays (parent, child, motif index), where the stable
+  motifs are deduplicated into a table of packed spaces.
+- The percolated NFVS (as variable indices), attractor candidates and attractor
+  seeds of each node (as packed spaces).
+
+The Petri net of the network is rebuilt when the diagram is loaded. The percolated
+networks and Petri nets of individual nodes, as well as the symbolic
+`attractor_sets`, are not stored.
+
+The file starts with a fixed header: the magic bytes, format version and
+a compression flag. The rest of the file can be optionally compressed using
+`zstd` (requires the `zstandard` package).
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from biobalm.succession_diagram import SuccessionDiagram
+    from biobalm.types import BooleanSpace, SuccessionDiagramConfiguration
+
+import networkx as nx  # type: ignore
+from biodivine_aeon import BooleanNetwork
+
+from biobalm.types import NodeData
+
+try:
+    zstd_available = True
+    import zstandard  # type: ignore
+except ModuleNotFoundError:
+    zstd_available = False
+
+FORMAT_MAGIC = b"BALMSD"
+FORMAT_VERSION = 3
+
+_HEADER = struct.Struct("<6sHB")
+_COMPRESSION_NONE = 0
+_COMPRESSION_ZSTD = 1
+
+# Marks a missing (`None`) list in the per-node data.
+_MISSING = 0xFFFFFFFF
+
+
+def dump_succession_diagram(sd: SuccessionDiagram, compress: bool = False) -> bytes:
+    """
+    Serialize the succession diagram into the binary format.
+
+    Raises `RuntimeError` if compression is requested but `zstandard`
+    is not installed.
+    """
+    encoder = sd.space_encoder
+    var_index = {var: i for i, var in enumerate(encoder.variables)}
+
+    header = json.dumps(
+        {
+            "network_rules": sd.network.to_aeon(),
+            "config": sd.config,
+            "nfvs": sd.nfvs,
+        }
+    ).encode()
+
+    spaces = bytearray()
+    depth = array("I")
+    expanded = bytearray()
+    deferred = bytearray()
+    unresolved = bytearray()
+    lists = array("I")
+    list_spaces = bytearray()
+    for node_id in sd.node_ids():
+        data = sd.node_data(node_id)
+        spaces += encoder.pack(encoder.encode(data["space"]))
+        depth.append(data["depth"])
+        expanded.append(int(data["expanded"]))
+        deferred.append(int(data["deferred"]))
+        unresolved.append(int(data["unresolved"]))
+
+        nfvs = data["percolated_nfvs"]
+        if nfvs is None:
+            lists.append(_MISSING)
+        else:
+            lists.append(len(nfvs))
+            lists.extend(var_index[var] for var in nfvs)
+        for node_spaces in (data["attractor_candidates"], data["attractor_seeds"]):
+            if node_spaces is None:
+                lists.append(_MISSING)
+            else:
+                lists.append(len(node_spaces))
+                for space in node_spaces:
+                    list_spaces += encoder.pack(encoder.encode(space))
+
+    motifs: dict[bytes, int] = {}
+    edges = array("I")
+    for parent_id in sd.node_ids():
+        for child_id in sd.dag.successors(parent_id):  # type: ignore
+            motif = sd.edge_stable_motif(parent_id, child_id)  # type: ignore
+            packed = encoder.pack(encoder.encode(motif))
+            edges.extend((parent_id, child_id, motifs.setdefault(packed, len(motifs))))
+
+    payload = bytearray()
+    _write_bytes(payload, header)
+    payload += struct.pack("<III", len(depth), len(edges) // 3, len(motifs))
+    payload += spaces
+    _write_array(payload, depth)
+    payload += expanded
+    payload += deferred
+    payload += unresolved
+    payload += b"".join(motifs)
+    _write_array(payload, edges)
+    _write_array(payload, lists)
+    payload += list_spaces
+
+    if not compress:
+        return _HEADER.pack(FORMAT_MAGIC, FORMAT_VERSION, _COMPRESSION_NONE) + payload
+    if not zstd_available:
+        raise RuntimeError("Compression requires the `zstandard` package.")
+    compressed = zstandard.ZstdCompressor().compress(bytes(payload))  # type: ignore
+    return _HEADER.pack(FORMAT_MAGIC, FORMAT_VERSION, _COMPRESSION_ZSTD) + cast(
+        bytes, compressed
+    )
+
+
+def load_succession_diagram(
+    data: bytes, config: SuccessionDiagramConfiguration | None = None
+) -> SuccessionDiagram:
+    """
+    Deserialize a succession diagram created by :func:`dump_succession_diagram`.
+
+    If `config` is not given, the saved configuration is used. Raises `ValueError`
+    if the data is not a valid succession diagram file, and `RuntimeError` if
+    it is compressed but `zstandard` is not installed.
+    """
+    from biobalm.petri_net_translation import network_to_petrinet
+    from biobalm.succession_diagram import SuccessionDiagram
+
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a succession diagram file.")
+    magic, version, compression = _HEADER.unpack_from(data)
+    if magic != FORMAT_MAGIC:
+        raise ValueError("Not a succession diagram file.")
+    if version != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported format version {version} (expected {FORMAT_VERSION})."
+        )
+    payload = memoryview(data)[_HEADER.size :]
+    if compression == _COMPRESSION_ZSTD:
+        if not zstd_available:
+            raise RuntimeError("Decompression requires the `zstandard` package.")
+        decompressed = zstandard.ZstdDecompressor().decompress(payload)  # type: ignore
+        payload = memoryview(cast(bytes, decompressed))
+    elif compression != _COMPRESSION_NONE:
+        raise ValueError(f"Unknown compression {compression}.")
+
+    reader = _Reader(payload)
+    header = json.loads(bytes(reader.read_bytes()))
+    node_count, edge_count, motif_count = struct.unpack("<III", reader.read(12))
+
+    if config is None:
+        config = SuccessionDiagram.default_config()
+        config.update(header["config"])
+
+    network_rules: str = header["network_rules"]
+    sd = SuccessionDiagram.__new__(SuccessionDiagram)
+    sd.__setstate__(
+        {
+            "network_rules": network_rules,
+            "petri_net": network_to_petrinet(BooleanNetwork.from_aeon(network_rules)),
+            "nfvs": header["nfvs"],
+            "dag": nx.DiGraph(),
+            "node_indices": {},
+            "config": config,
+            "modified_nodes": set(),
+            "synced_revision": None,
+        }
+    )
+    encoder = sd.space_encoder
+    space_size = 2 * encoder.byte_width()
+
+    spaces = reader.read(node_count * space_size)
+    depth = reader.read_array()
+    expanded = reader.read(node_count)
+    deferred = reader.read(node_count)
+    unresolved = reader.read(node_count)
+    motif_data = reader.read(motif_count * space_size)
+    edges = reader.read_array()
+    lists = reader.read_array()
+    list_spaces = reader.read(len(payload) - reader.offset)
+
+    list_pos = 0
+    space_pos = 0
+
+    def read_spaces() -> list[BooleanSpace] | None:
+        nonlocal list_pos, space_pos
+        count = lists[list_pos]
+        list_pos += 1
+        if count == _MISSING:
+            return None
+        result: list[BooleanSpace] = []
+        for _ in range(count):
+            result.append(encoder.decode(encoder.unpack(list_spaces, space_pos)))
+            space_pos += space_size
+        return result
+
+    for node_id in range(node_count):
+        space = encoder.unpack(spaces, node_id * space_size)
+        count = lists[list_pos]
+        list_pos += 1
+        nfvs: list[str] | None = None
+        if count != _MISSING:
+            nfvs = [encoder.variables[i] for i in lists[list_pos : list_pos + count]]
+            list_pos += count
+        candidates = read_spaces()
+        seeds = read_spaces()
+        # Note: this must match the fields of the `NodeData` class
+        node_data = cast(
+            NodeData,
+            {
+                "space": encoder.decode(space),
+                "depth": depth[node_id],
+                "expanded": expanded[node_id] != 0,
+                "deferred": deferred[node_id] != 0,
+                "unresolved": unresolved[node_id] != 0,
+                "percolated_network": None,
+                "percolated_petri_net": None,
+                "percolated_nfvs": nfvs,
+                "attractor_candidates": candidates,
+                "attractor_seeds": seeds,
+                "attractor_sets": None,
+            },
+        )
+        sd.dag.add_node(node_id, **node_data)  # type: ignore
+        sd.node_indices[encoder.unique_key(space)] = node_id
+
+    motifs = [
+        encoder.decode(encoder.unpack(motif_data, i * space_size))
+        for i in range(motif_count)
+    ]
+    for i in range(0, 3 * edge_count, 3):
+        # Motifs are shared between edges, hence each edge needs a copy.
+        motif = dict(motifs[edges[i + 2]])
+        sd.dag.add_edge(edges[i], edges[i + 1], motif=motif)  # type: ignore
+
+    return sd
+
+
+def _write_bytes(output: bytearray, data: bytes):
+    output += struct.pack("<I", len(data))
+    output += data
+
+
+def _write_array(output: bytearray, values: array[int]):
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    _write_bytes(output, values.tobytes())
+
+
+class _Reader:
+    """
+    Sequential reader of the binary payload.
+    """
+
+    def __init__(self, data: memoryview):
+        self.data = data
+        self.offset = 0
+
+    def read(self, length: int) -> bytes:
+        if self.offset + length > len(self.data):
+            raise ValueError("Truncated succession diagram file.")
+        result = self.data[self.offset : self.offset + length]
+        self.offset += length
+        return bytes(result)
+
+    def read_bytes(self) -> bytes:
+        (length,) = struct.unpack("<I", self.read(4))
+        return self.read(length)
+
+    def read_array(self) -> array[int]:
+        values = array("I")
+        values.frombytes(self.read_bytes())
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
@@ -0,0 +1,226 @@
+"""
+A compact, index-based representation of Boolean subspaces.
+
+A :class:`BooleanSpace<biobalm.types.BooleanSpace>` is a dictionary keyed by
+variable names, which is convenient, but relatively slow when the same spaces
+are compared or hashed over and over again. A :class:`CompactSpace` instead
+stores a subspace as two integer bitmasks indexed by variable IDs: a mask of
+fixed variables and a mask of their values. Set operations on such spaces then
+only require a constant number of word-level integer operations (per machine
+word of the masks).
+
+The conversion between the two representations is handled by
+a :class:`SpaceEncoder`, which is bound to a particular variable ordering
+(typically the ordering of variables in a `BooleanNetwork`).
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from typing import Iterable
+
+from biodivine_aeon import AsynchronousGraph, BooleanNetwork
+
+from biobalm.types import BooleanSpace
+
+
+def _spread_byte(byte: int) -> bytes:
+    # Interleave the bits of `byte` with zeros: b7...b0 -> 0b7...0b0.
+    result = 0
+    for i in range(8):
+        result |= ((byte >> i) & 1) << (2 * i)
+    return result.to_bytes(2, "little")
+
+
+# Lookup table used to quickly interleave the bits of whole bitmasks.
+_SPREAD_TABLE = [_spread_byte(byte) for byte in range(256)]
+
+
+class CompactSpace(NamedTuple):
+    """
+    A Boolean subspace represented as a pair of bitmasks.
+
+    The `i`-th bit of `fixed` is set if the `i`-th variable is fixed in this
+    space. In such case, the `i`-th bit of `values` is its fixed value.
+    The bits of `values` for free variables are always zero, such that
+    each space has exactly one representation (and equality and hashing
+    can be used directly).
+
+    Use :class:`SpaceEncoder` to convert between `CompactSpace` and
+    :class:`BooleanSpace<biobalm.types.BooleanSpace>`.
+    """
+
+    fixed: int
+    values: int
+
+    def intersect(self, other: CompactSpace) -> CompactSpace | None:
+        """
+        Compute the intersection of two spaces, or `None` if the spaces
+        do not intersect.
+
+        Same as :func:`biobalm.space_utils.intersect`.
+        """
+        if (self.fixed & other.fixed) & (self.values ^ other.values) != 0:
+            return None
+        return CompactSpace(self.fixed | other.fixed, self.values | other.values)
+
+    def is_subspace(self, other: CompactSpace) -> bool:
+        """
+        Checks whether this space is a subspace of the `other` space.
+
+        Same as :func:`biobalm.space_utils.is_subspace`.
+        """
+        if other.fixed & ~self.fixed != 0:
+            return False
+        return (self.values & other.fixed) == other.values
+
+    def fixed_count(self) -> int:
+        """
+        The number of variables fixed in this space.
+        """
+        return self.fixed.bit_count()
+
+
+class SpaceEncoder:
+    """
+    Converts spaces between the :class:`BooleanSpace<biobalm.types.BooleanSpace>`
+    and the :class:`CompactSpace` representation.
+
+    The index of each variable is given by its position in the
+    list of `variables` provided when creating the encoder. When created
+    using :meth:`from_network`, this is the same as the variable ID in the
+    `BooleanNetwork`. The encoder is then also consistent with
+    :func:`biobalm.space_utils.space_unique_key` (see :meth:`unique_key`).
+    """
+
+    __slots__ = ("variables", "indices")
+
+    def __init__(self, variables: Iterable[str]):
+        self.variables: list[str] = list(variables)
+        """
+        The names of the encoded variables, ordered by their index.
+        """
+
+        self.indices: dict[str, int] = {
+            name: index for index, name in enumerate(self.variables)
+        }
+        """
+        A dictionary mapping variable names to their indices.
+        """
+
+    @staticmethod
+    def from_network(network: BooleanNetwork | AsynchronousGraph) -> SpaceEncoder:
+        """
+        Create an encoder which follows the variable ordering of the given
+        network.
+        """
+        if isinstance(network, AsynchronousGraph):
+            return SpaceEncoder(network.network_variable_names())
+        return SpaceEncoder(network.variable_names())
+
+    def __repr__(self) -> str:
+        return f"SpaceEncoder({self.variables!r})"
+
+    def __len__(self) -> int:
+        return len(self.variables)
+
+    def encode(self, space: BooleanSpace) -> CompactSpace:
+        """
+        Convert a :class:`BooleanSpace<biobalm.types.BooleanSpace>` into
+        a :class:`CompactSpace`.
+
+        Raises `IndexError` if the space contains an unknown variable.
+        """
+        fixed = 0
+        values = 0
+        indices = self.indices
+        for var, value in space.items():
+            index = indices.get(var)
+            if index is None:
+                raise IndexError(f"Unknown variable {var}.")
+            bit = 1 << index
+            fixed |= bit
+            if value:
+                values |= bit
+        return CompactSpace(fixed, values)
+
+    def decode(self, space: CompactSpace) -> BooleanSpace:
+        """
+        Convert a :class:`CompactSpace` into
+        a :class:`BooleanSpace<biobalm.types.BooleanSpace>`.
+
+        The variables in the result are ordered by their index.
+        """
+        result: BooleanSpace = {}
+        fixed = space.fixed
+        values = space.values
+        while fixed != 0:
+            bit = fixed & -fixed
+            index = bit.bit_length() - 1
+            # (A conditional is used instead of `cast`, since subscripting
+            #  `Literal` at runtime is surprisingly slow.)
+            result[self.variables[index]] = 1 if values & bit != 0 else 0
+            fixed ^= bit
+        return result
+
+    def unique_key(self, space: CompactSpace) -> int:
+        """
+        Compute the unique integer key of the given space.
+
+        For encoders created by :meth:`from_network`, the result is the same
+        as :func:`biobalm.space_utils.space_unique_key` of the decoded space.
+        This includes the lexicographic ordering induced by the key.
+        """
+        n_bytes = (len(self.variables) + 7) // 8
+        fixed = _spread_bits(space.fixed, n_bytes)
+        values = _spread_bits(space.values, n_bytes)
+        return (fixed << 1) | values
+
+    def byte_width(self) -> int:
+        """
+        The number of bytes needed to store one bitmask of this encoder.
+        """
+        return (len(self.variables) + 7) // 8
+
+    def pack(self, space: CompactSpace) -> bytes:
+        """
+        Convert a :class:`CompactSpace` into a byte string of length
+        `2 * byte_width()` (the `fixed` mask followed by the `values` mask).
+        """
+        width = self.byte_width()
+        return space.fixed.to_bytes(width, "little") + space.values.to_bytes(
+            width, "little"
+        )
+
+    def unpack(self, data: bytes, offset: int = 0) -> CompactSpace:
+        """
+        Read a :class:`CompactSpace` created by :meth:`pack` from the given
+        `data`, starting at `offset`.
+        """
+        width = self.byte_width()
+        middle = offset + width
+        return CompactSpace(
+            int.from_bytes(data[offset:middle], "little"),
+            int.from_bytes(data[middle : middle + width], "little"),
+        )
+
+    def space_key(self, space: BooleanSpace) -> int:
+        """
+        Same as :meth:`unique_key`, but for a
+        :class:`BooleanSpace<biobalm.types.BooleanSpace>`.
+
+        Raises `IndexError` if the space contains an unknown variable.
+        """
+        return self.unique_key(self.encode(space))
+
+
+def _spread_bits(mask: int, n_bytes: int) -> int:
+    """
+    Interleave the bits of `mask` with zeros, i.e. move the `i`-th bit
+    to position `2 * i`.
+    """
+    table = _SPREAD_TABLE
+    data = b"".join([table[byte] for byte in mask.to_bytes(n_bytes, "little")])
+    return int.from_bytes(data, "little")
@@ -0,0 +1,489 @@
+"""
+A compiled representation of network update functions for fast percolation.
+
+The percolation methods in :mod:`space_utils<biobalm.space_utils>` evaluate
+the update function BDDs of an `AsynchronousGraph` one variable at a time,
+which is relatively expensive when the same network is percolated many times
+(e.g. when computing the LDOIs of all single-node states). A
+:class:`CompiledNetwork` instead converts every update function into two
+lists of cubes (one covering the function and one covering its negation),
+with each cube stored as a :class:`CompactSpace<biobalm.compact_space.CompactSpace>`.
+A function is then constant within a space iff all cubes of one of the lists
+are incompatible with the space, which only requires a few bitmask operations
+per cube. The cube tables are built lazily, and functions with too many cubes
+(e.g. wide parity functions) are evaluated using their BDDs instead.
+
+For simulation, the update functions are also compiled into
+a :class:`BitSlicedFunction`, which evaluates a function in a whole batch of
+states at once. The states of a batch are stored "transposed": for every
+variable, a single integer holds the value of the variable in every state
+of the batch, with the `k`-th bit corresponding to the `k`-th state.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from biodivine_aeon import Bdd, BddVariable
+
+from biodivine_aeon import AsynchronousGraph, BooleanNetwork
+
+from biobalm.compact_space import CompactSpace, SpaceEncoder
+from biobalm.types import BooleanSpace
+
+
+# The maximal number of cubes of an update function (or of its negation)
+# that are stored in the cube tables (see `CompiledNetwork`).
+CUBE_LIMIT = 1_000
+
+
+class CompiledNetwork:
+    """
+    The update functions of a Boolean network, compiled into DNF cube tables
+    that can be evaluated on :class:`CompactSpace<biobalm.compact_space.CompactSpace>`
+    objects.
+
+    The percolation methods of this class give the same results as
+    :func:`percolate_space<biobalm.space_utils.percolate_space>` and
+    :func:`percolate_space_strict<biobalm.space_utils.percolate_space_strict>`,
+    but percolate multiple spaces much faster, since the update functions are
+    only converted once and only the functions that can be affected by a newly
+    fixed variable are re-evaluated.
+
+    The cube tables and the bit-sliced functions are created lazily, once the
+    update function of a variable is first evaluated. Functions with more than
+    `cube_limit` cubes (e.g. parity functions, where the number of cubes is
+    exponential) are evaluated using their BDDs instead.
+
+    Parameters
+    ----------
+    network : AsynchronousGraph | BooleanNetwork
+        The network to compile. If a `BooleanNetwork` is given, the
+        `AsynchronousGraph` is created automatically.
+    cube_limit : int
+        The maximal number of cubes of a single update function (or its
+        negation) that are stored in the cube tables.
+    """
+
+    __slots__ = (
+        "encoder",
+        "variable_index",
+        "update_functions",
+        "cube_limit",
+        "targets",
+        "constants",
+        "constant_space",
+        "_bdd_variables",
+        "_supports",
+        "_cubes",
+        "_functions",
+    )
+
+    def __init__(
+        self,
+        network: AsynchronousGraph | BooleanNetwork,
+        cube_limit: int = CUBE_LIMIT,
+    ):
+        if isinstance(network, BooleanNetwork):
+            network = AsynchronousGraph(network)
+
+        ctx = network.symbolic_context()
+
+        self.encoder: SpaceEncoder = SpaceEncoder.from_network(network)
+        """
+        The encoder which defines the variable indices of this network.
+        """
+
+        self.cube_limit = cube_limit
+
+        self.variable_index: dict[int, int] = {}
+        """
+        Maps the indices of symbolic (BDD) variables to the indices of the
+        corresponding network variables.
+        """
+
+        self._bdd_variables: list[BddVariable] = []
+        for var in network.network_variables():
+            bdd_var = ctx.find_network_bdd_variable(var)
+            assert bdd_var is not None
+            self.variable_index[int(bdd_var)] = int(var)
+            self._bdd_variables.append(bdd_var)
+
+        self.update_functions: list[Bdd] = []
+        """
+        For every variable, the BDD of its update function.
+        """
+
+        self.targets: list[list[int]] = [[] for _ in self.encoder.variables]
+        """
+        For every variable, the (sorted) list of variables whose update functions
+        depend on it.
+        """
+
+        self.constants: list[int] = []
+        """
+        The (sorted) list of variables with constant update functions.
+        """
+
+        # For every variable, the bitmask of the variables in the support set
+        # of its update function.
+        self._supports: list[int] = []
+        for var in network.network_variables():
+            fn_bdd = network.mk_update_function(var)
+            self.update_functions.append(fn_bdd)
+            if fn_bdd.is_true() or fn_bdd.is_false():
+                self.constants.append(int(var))
+            support = 0
+            for bdd_var in fn_bdd.support_set():
+                regulator = ctx.find_network_variable(bdd_var)
+                if regulator is not None:
+                    self.targets[int(regulator)].append(int(var))
+                    support |= 1 << int(regulator)
+            self._supports.append(support)
+
+        # The lazily computed cube tables (`False` if the function exceeds
+        # the `cube_limit`) and bit-sliced functions.
+        self._cubes: list[
+            tuple[list[CompactSpace], list[CompactSpace]] | Literal[False] | None
+        ] = [None] * len(self.update_functions)
+        self._functions: list[BitSlicedFunction | None] = [None] * len(
+            self.update_functions
+        )
+
+        self.constant_space: CompactSpace = self._percolate_from(
+            CompactSpace(0, 0), set(self.constants)
+        )
+        """
+        The result of percolating the constant variables of the network
+        (i.e. the percolation of the whole state space).
+        """
+
+    def __repr__(self) -> str:
+        return f"CompiledNetwork({self.encoder.variables!r})"
+
+    def compile(self, bdd: Bdd) -> BitSlicedFunction:
+        """
+        Compile a BDD over the network variables for bit-sliced evaluation
+        (e.g. a set of states that should be tested in a batch simulation).
+        """
+        return BitSlicedFunction(bdd, self.variable_index)
+
+    def eval_state(self, var: int, state: int) -> Literal[0, 1]:
+        """
+        Evaluate the update function of the variable with index `var` in
+        a single `state`, given as an integer where the `i`-th bit is the
+        value of the `i`-th variable.
+        """
+        full = (1 << len(self.encoder.variables)) - 1
+        value = self._eval(var, full, state)
+        assert value is not None
+        return value
+
+    def eval_batch(self, var: int, slices: list[int], full: int) -> int:
+        """
+        Evaluate the update function of the variable with index `var` in
+        every state of a batch (see :meth:`to_slices`). The `full` mask has
+        a bit set for every state of the batch.
+        """
+        return self.function(var).eval(slices, full)
+
+    def function(self, var: int) -> BitSlicedFunction:
+        """
+        The update function of the variable with index `var`, compiled for
+        bit-sliced evaluation.
+        """
+        function = self._functions[var]
+        if function is None:
+            function = self.compile(self.update_functions[var])
+            self._functions[var] = function
+        return function
+
+    def cubes(self, var: int) -> tuple[list[CompactSpace], list[CompactSpace]] | None:
+        """
+        The cubes covering all states where the update function of the variable
+        with index `var` is `1` and `0`, respectively. Returns `None` if either
+        list would have more than `cube_limit` cubes.
+        """
+        cubes = self._cubes[var]
+        if cubes is None:
+            fn_bdd = self.update_functions[var]
+            not_fn_bdd = fn_bdd.l_not()
+            if (
+                fn_bdd.clause_cardinality() > self.cube_limit
+                or not_fn_bdd.clause_cardinality() > self.cube_limit
+            ):
+                cubes = False
+            else:
+                cubes = (
+                    _bdd_to_cubes(self.variable_index, fn_bdd),
+                    _bdd_to_cubes(self.variable_index, not_fn_bdd),
+                )
+            self._cubes[var] = cubes
+        return cubes if cubes is not False else None
+
+    def to_slices(self, states: list[int]) -> list[int]:
+        """
+        Transpose a list of states (see :meth:`eval_state`) into a batch.
+        """
+        return to_slices(states, len(self.encoder.variables))
+
+    def from_slices(self, slices: list[int], positions: list[int]) -> list[int]:
+        """
+        Extract the states at the given `positions` of a batch.
+        """
+        return from_slices(slices, positions)
+
+    def eval_space(self, var: int, space: CompactSpace) -> Literal[0, 1] | None:
+        """
+        Evaluate the update function of the variable with index `var` within
+        the given `space`.
+
+        Returns `None` if the function is not constant within the space.
+        Same as :func:`biobalm.symbolic_utils.function_eval`.
+        """
+        return self._eval(var, space.fixed, space.values)
+
+    def _eval(self, var: int, fixed: int, values: int) -> Literal[0, 1] | None:
+        cubes = self._cubes[var]
+        if cubes is None:
+            self.cubes(var)
+            cubes = self._cubes[var]
+        if cubes is False or cubes is None:
+            return self._eval_bdd(var, fixed, values)
+        (on_cubes, off_cubes) = cubes
+        for cube_fixed, cube_values in off_cubes:
+            if cube_fixed & fixed & (cube_values ^ values) == 0:
+                # The function can be `0` in the space.
+                break
+        else:
+            return 1
+        for cube_fixed, cube_values in on_cubes:
+            if cube_fixed & fixed & (cube_values ^ values) == 0:
+                # The function can be both `0` and `1` in the space.
+                return None
+        return 0
+
+    def _eval_bdd(self, var: int, fixed: int, values: int) -> Literal[0, 1] | None:
+        """
+        Same as :meth:`_eval`, but using the BDD of the update function.
+        """
+        fn_bdd = self.update_functions[var]
+        restriction = {
+            self._bdd_variables[i]: (values >> i) & 1 == 1
+            for i in _mask_indices(fixed & self._supports[var])
+        }
+        if len(restriction) > 0:
+            fn_bdd = fn_bdd.r_restrict(restriction)
+        if fn_bdd.is_true():
+            return 1
+        if fn_bdd.is_false():
+            return 0
+        return None
+
+    def percolate(self, space: CompactSpace) -> CompactSpace:
+        """
+        Same as :func:`percolate_space<biobalm.space_utils.percolate_space>`,
+        but for a `CompactSpace`.
+        """
+        base = self.constant_space
+        if space.intersect(base) is None:
+            # The space conflicts with the network constants, meaning the
+            # percolation of constants is blocked by the conflicting values.
+            worklist = set(self.constants)
+            for var in _mask_indices(space.fixed):
+                worklist.update(self.targets[var])
+            return self._percolate_from(space, worklist)
+
+        # Otherwise, the percolated constants are always part of the result
+        # and we only have to percolate the newly fixed variables.
+        worklist = set()
+        for var in _mask_indices(space.fixed & ~base.fixed):
+            worklist.update(self.targets[var])
+        return self._percolate_from(
+            CompactSpace(space.fixed | base.fixed, space.values | base.values),
+            worklist,
+        )
+
+    def _percolate_from(self, space: CompactSpace, worklist: set[int]) -> CompactSpace:
+        """
+        Percolate the `space`, assuming that only the update functions of the
+        variables in `worklist` can be constant without being fixed already.
+        """
+        fixed = space.fixed
+        values = space.values
+        while len(worklist) > 0:
+            var = worklist.pop()
+            bit = 1 << var
+            if fixed & bit != 0:
+                # The value of already fixed variables is never modified (even
+                # if this results in a conflict).
+                continue
+            value = self._eval(var, fixed, values)
+            if value is None:
+                continue
+            fixed |= bit
+            if value == 1:
+                values |= bit
+            worklist.update(self.targets[var])
+
+        return CompactSpace(fixed, values)
+
+    def percolate_strict(self, space: CompactSpace) -> CompactSpace:
+        """
+        Same as :func:`percolate_space_strict<biobalm.space_utils.percolate_space_strict>`,
+        but for a `CompactSpace`.
+        """
+        fixed = space.fixed
+        values = space.values
+        result_fixed = 0
+        result_values = 0
+
+        constants = 0
+        for var in self.constants:
+            constants |= 1 << var
+
+        # Only functions that depend on some fixed variable can become constant.
+        worklist: set[int] = set()
+        for var in _mask_indices(fixed):
+            worklist.update(self.targets[var])
+
+        while len(worklist) > 0:
+            var = worklist.pop()
+            bit = 1 << var
+            if (constants | result_fixed) & bit != 0:
+                continue
+            value = self._eval(var, fixed, values)
+            if value is None:
+                continue
+            if fixed & bit != 0:
+                if (values & bit != 0) == (value == 1):
+                    # The value is consistent with the space, but it must
+                    # still appear in the result.
+                    result_fixed |= bit
+                    result_values |= bit if value == 1 else 0
+                # Otherwise, this is a conflict which is not reported.
+                continue
+            fixed |= bit
+            result_fixed |= bit
+            if value == 1:
+                values |= bit
+                result_values |= bit
+            worklist.update(self.targets[var])
+
+        return CompactSpace(result_fixed, result_values)
+
+    def single_node_LDOIs(self) -> dict[tuple[str, int], BooleanSpace]:
+        """
+        Compute the LDOIs of all single-node states of non-constant variables.
+
+        Same as :func:`biobalm.drivers.find_single_node_LDOIs`.
+        """
+        constants = set(self.constants)
+        LDOIs: dict[tuple[str, int], BooleanSpace] = {}
+        for index, var in enumerate(self.encoder.variables):
+            if index in constants:
+                continue
+            bit = 1 << index
+            LDOIs[(var, 0)] = self.encoder.decode(
+                self.percolate_strict(CompactSpace(bit, 0))
+            )
+            LDOIs[(var, 1)] = self.encoder.decode(
+                self.percolate_strict(CompactSpace(bit, bit))
+            )
+        return LDOIs
+
+
+class BitSlicedFunction:
+    """
+    A BDD compiled for bit-sliced evaluation.
+
+    Each non-terminal node is stored as a `(variable, low, high)` triple, where
+    `low` and `high` index into the list of already evaluated nodes (the first
+    two nodes are the `0` and `1` terminals).
+    """
+
+    __slots__ = ("nodes",)
+
+    def __init__(self, bdd: Bdd, variable_index: dict[int, int]):
+        self.nodes: list[tuple[int, int, int]] = []
+        # The nodes in `Bdd.data_string` are ordered such that the children
+        # always precede their parents, with the root being the last node.
+        for i, node in enumerate(bdd.data_string().strip("|").split("|")):
+            if i < 2:
+                # Terminal nodes.
+                continue
+            var, low, high = node.split(",")
+            self.nodes.append((variable_index[int(var)], int(low), int(high)))
+        if bdd.is_true():
+            # The true terminal is the root.
+            self.nodes.append((0, 1, 1))
+        elif bdd.is_false():
+            self.nodes.append((0, 0, 0))
+
+    def eval(self, slices: list[int], full: int) -> int:
+        """
+        Evaluate the function in every state of a batch. The `full` mask has
+        a bit set for every state of the batch.
+        """
+        values = [0, full]
+        for var, low, high in self.nodes:
+            low_value = values[low]
+            values.append(low_value ^ (slices[var] & (low_value ^ values[high])))
+        return values[-1]
+
+
+def to_slices(states: list[int], variable_count: int) -> list[int]:
+    """
+    Transpose a list of states (integers where the `i`-th bit is the value of
+    the `i`-th variable) into a batch with one integer per variable.
+    """
+    slices: list[int] = []
+    for i in range(variable_count):
+        bits = "".join(["1" if (s >> i) & 1 else "0" for s in reversed(states)])
+        slices.append(int(bits, 2) if len(bits) > 0 else 0)
+    return slices
+
+
+def from_slices(slices: list[int], positions: list[int]) -> list[int]:
+    """
+    Extract the states at the given `positions` of a batch (see :func:`to_slices`).
+    """
+    states = [0] * len(positions)
+    for i, variable_slice in enumerate(slices):
+        bits = bin(variable_slice)[:1:-1]
+        width = len(bits)
+        bit = 1 << i
+        for j, position in enumerate(positions):
+            if position < width and bits[position] == "1":
+                states[j] |= bit
+    return states
+
+
+def _bdd_to_cubes(variable_index: dict[int, int], bdd: Bdd) -> list[CompactSpace]:
+    """
+    Convert the paths of a BDD over network variables into compact cubes.
+    """
+    cubes: list[CompactSpace] = []
+    for clause in bdd.clause_iterator():
+        fixed = 0
+        values = 0
+        for bdd_var, value in clause.items():
+            bit = 1 << variable_index[int(bdd_var)]
+            fixed |= bit
+            if value:
+                values |= bit
+        cubes.append(CompactSpace(fixed, values))
+    return cubes
+
+
+def _mask_indices(mask: int) -> list[int]:
+    """
+    The indices of all bits that are set in the given `mask`.
+    """
+    result: list[int] = []
+    while mask != 0:
+        bit = mask & -mask
+        result.append(bit.bit_length() - 1)
+        mask ^= bit
+    return result
@@ -11,7 +11,8 @@ from typing import Literal, cast
 import networkx as nx  # type: ignore
 from biodivine_aeon import AsynchronousGraph, BooleanNetwork
 
-from biobalm.space_utils import is_subspace, percolate_space
+from biobalm.compact_space import CompactSpace
+from biobalm.space_utils import PercolationCache
 from biobalm.succession_diagram import SuccessionDiagram
 from biobalm.types import BooleanSpace, ControlOverrides, SubspaceSuccession
 
@@ -290,6 +291,7 @@ def succession_control(
             strategy=strategy,
             max_drivers_per_succession_node=max_drivers_per_succession_node,
             forbidden_drivers=forbidden_drivers,
+            percolation_cache=succession_diagram.percolation_cache,
         )
         intervention = Intervention(controls, strategy, succession)
 
@@ -339,9 +341,11 @@ def successions_to_target(
             target=target,
         )
 
+    encoder = succession_diagram.space_encoder
+    compact_target = encoder.encode(target)
     for s in succession_diagram.node_ids():
-        fixed_vars = succession_diagram.node_data(s)["space"]
-        if not is_subspace(fixed_vars, target):
+        fixed_vars = encoder.encode(succession_diagram.node_data(s)["space"])
+        if not fixed_vars.is_subspace(compact_target):
             continue
 
         for path in cast(
@@ -367,6 +371,7 @@ def drivers_of_succession(
     strategy: str = "internal",
     max_drivers_per_succession_node: int | None = None,
     forbidden_drivers: set[str] | None = None,
+    percolation_cache: PercolationCache | None = None,
 ) -> list[ControlOverrides]:
     """
     Find driver nodes of a list of sequentially nested trap spaces.
@@ -395,6 +400,11 @@ def drivers_of_succession(
     forbidden_drivers: set[str] | None
         A set of forbidden drivers that will not be overridden for control. If
         `None`, then all nodes are candidates for control.
+    percolation_cache: PercolationCache | None
+        A cache of percolation results for the network `bn`. This can be shared
+        across multiple queries (e.g. using
+        :attr:`SuccessionDiagram.percolation_cache<biobalm.SuccessionDiagram.percolation_cache>`).
+        If `None`, the results are not cached.
 
     Returns
     -------
@@ -406,6 +416,9 @@ def drivers_of_succession(
     if isinstance(bn, BooleanNetwork):
         bn = AsynchronousGraph(bn)
 
+    if percolation_cache is None:
+        percolation_cache = PercolationCache(bn, 0)
+
     control_strategies: list[ControlOverrides] = []
     assume_fixed: BooleanSpace = {}
     for ts in succession:
@@ -417,9 +430,10 @@ def drivers_of_succession(
                 assume_fixed=assume_fixed,
                 max_drivers_per_succession_node=max_drivers_per_succession_node,
                 forbidden_drivers=forbidden_drivers,
+                percolation_cache=percolation_cache,
             )
         )
-        ldoi = percolate_space(bn, ts | assume_fixed)
+        ldoi = percolation_cache.percolate(ts | assume_fixed)
         assume_fixed.update(ldoi)
 
     return control_strategies
@@ -432,6 +446,7 @@ def find_drivers(
     assume_fixed: BooleanSpace | None = None,
     max_drivers_per_succession_node: int | None = None,
     forbidden_drivers: set[str] | None = None,
+    percolation_cache: PercolationCache | None = None,
 ) -> ControlOverrides:
     """
     Finds drives of a given target trap space
@@ -464,6 +479,9 @@ def find_drivers(
     forbidden_drivers: set[str] | None
         A set of forbidden drivers that will not be overridden for control. If
         `None`, then all nodes are candidates for control.
+    percolation_cache: PercolationCache | None
+        A cache of percolation results for the network `bn`. If `None`,
+        the results are not cached.
 
     Returns
     -------
@@ -495,10 +513,24 @@ def find_drivers(
     if max_drivers_per_succession_node is None:
         max_drivers_per_succession_node = len(target_trap_space_inner)
 
+    if percolation_cache is None:
+        percolation_cache = PercolationCache(bn, 0)
+
+    # Percolation and subspace checks use the compact space representation,
+    # since they are repeated for every candidate driver set.
+    encoder = percolation_cache.encoder
+    compact_target = encoder.encode(target_trap_space)
+    compact_assume_fixed = encoder.encode(assume_fixed)
+
     drivers: ControlOverrides = []
+    # The variables of each driver set in `drivers` as a bitmask.
+    driver_masks: list[int] = []
     for driver_set_size in range(max_drivers_per_succession_node + 1):
         for driver_set in combinations(driver_pool, driver_set_size):
-            if any(set(d) <= set(driver_set) for d in drivers):
+            driver_set_mask = 0
+            for driver in driver_set:
+                driver_set_mask |= 1 << encoder.indices[driver]
+            if any(d & driver_set_mask == d for d in driver_masks):
                 continue
 
             if strategy == "internal":
@@ -506,21 +538,38 @@ def find_drivers(
                     k: cast(Literal[0, 1], target_trap_space_inner[k])
                     for k in driver_set
                 }
-                ldoi = percolate_space(bn, driver_dict | assume_fixed)
-                if target_trap_space.items() <= ldoi.items():
+                ldoi = percolation_cache.percolate_compact(
+                    _override(encoder.encode(driver_dict), compact_assume_fixed)
+                )
+                if ldoi.is_subspace(compact_target):
                     drivers.append(driver_dict)
+                    driver_masks.append(driver_set_mask)
             elif strategy == "all":
                 for vals in product([0, 1], repeat=driver_set_size):
                     driver_dict = {
                         driver: cast(Literal[0, 1], value)
                         for driver, value in zip(driver_set, vals)
                     }
-                    ldoi = percolate_space(bn, driver_dict | assume_fixed)
-                    if target_trap_space.items() <= ldoi.items():
+                    ldoi = percolation_cache.percolate_compact(
+                        _override(encoder.encode(driver_dict), compact_assume_fixed)
+                    )
+                    if ldoi.is_subspace(compact_target):
                         drivers.append(driver_dict)
+                        driver_masks.append(driver_set_mask)
     return drivers
 
 
+def _override(space: CompactSpace, overrides: CompactSpace) -> CompactSpace:
+    """
+    Same as `space | overrides` for dictionaries, i.e. the values
+    in `overrides` take precedence.
+    """
+    return CompactSpace(
+        space.fixed | overrides.fixed,
+        (space.values & ~overrides.fixed) | overrides.values,
+    )
+
+
 def controls_are_equal(a: ControlOverrides, b: ControlOverrides) -> bool:
     """
     Determine if two :class:`ControlOverrides<biobalm.types.ControlOverrides>`
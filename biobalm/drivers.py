@@ -6,7 +6,8 @@ from __future__ import annotations
 
 from biodivine_aeon import AsynchronousGraph, BooleanNetwork
 
-from biobalm.space_utils import percolate_space_strict
+from biobalm.compact_space import CompactSpace, SpaceEncoder
+from biobalm.compiled_network import CompiledNetwork
 from biobalm.types import BooleanSpace
 
 
@@ -57,17 +58,9 @@ def find_single_node_LDOIs(
     if isinstance(network, BooleanNetwork):
         network = AsynchronousGraph(network)
 
-    LDOIs: dict[tuple[str, int], BooleanSpace] = {}
-    for var in network.network_variable_names():
-        fn_bdd = network.mk_update_function(var)
-        if fn_bdd.is_true() or fn_bdd.is_false():
-            # Skip constant nodes.
-            continue
-
-        LDOIs[(var, 0)] = percolate_space_strict(network, {var: 0})
-        LDOIs[(var, 1)] = percolate_space_strict(network, {var: 1})
-
-    return LDOIs
+    # The compiled network gives the same results as `percolate_space_strict`,
+    # but only evaluates the functions affected by each newly fixed variable.
+    return CompiledNetwork(network).single_node_LDOIs()
 
 
 def find_single_drivers(
@@ -122,9 +115,23 @@ def find_single_drivers(
     if LDOIs is None:
         LDOIs = find_single_node_LDOIs(network)
 
+    encoder = SpaceEncoder.from_network(network)
+    compact_target = encoder.encode(target_subspace)
+
     drivers: set[tuple[str, int]] = set()
     for fix, LDOI in LDOIs.items():
-        if target_subspace.items() <= (LDOI.items() | {fix}):
+        (var, value) = fix
+        bit = 1 << encoder.indices[var]
+        compact_LDOI = encoder.encode(LDOI)
+        # The driver itself always counts as part of its LDOI (it may be
+        # missing, or even fixed to the opposite value by strict percolation).
+        with_driver = CompactSpace(
+            compact_LDOI.fixed | bit,
+            (compact_LDOI.values & ~bit) | (bit if value else 0),
+        )
+        if with_driver.is_subspace(compact_target) or compact_LDOI.is_subspace(
+            compact_target
+        ):
             drivers.add(fix)
 
     return drivers
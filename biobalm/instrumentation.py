@@ -0,0 +1,211 @@
+"""
+Timers and counters that record where the computation time is spent.
+
+Every :class:`SuccessionDiagram<biobalm.SuccessionDiagram>` owns an
+:class:`Instrumentation` object (see `SuccessionDiagram.instrumentation`)
+which measures the individual phases of succession diagram expansion and
+attractor detection. The recorded data can be inspected using
+:meth:`Instrumentation.report` (a structured report) or
+:meth:`Instrumentation.summary` (a human-readable table), or streamed to a
+callback as each phase finishes (see :meth:`Instrumentation.add_callback` and
+:func:`logging_callback`).
+
+The following phases are measured (phases can be nested, e.g. `grounding`
+is part of `trappist`, or `simulation` is part of `attractor_candidates`):
+
+- `expansion`: Expansion of a single node (i.e. computing its successors).
+- `trappist`: Enumeration of the maximal trap spaces (stable motifs) of a node.
+- `grounding`: Grounding of the `clingo` logic programs.
+- `percolation`: Percolation of the stable motifs of new nodes.
+- `petri_net_restriction`: Restriction of the Petri net to a node space.
+- `network_percolation`: Percolation of the Boolean network to a node space.
+- `nfvs`: Computation of the negative feedback vertex set of a node.
+- `attractor_candidates`: Computation of the attractor candidates of a node.
+- `candidate_enumeration`: Enumeration of the candidates from a retained set.
+- `simulation`: Simulation-based minification of the candidates.
+- `pint`: Reachability-based minification of the candidates using `pint`.
+- `symbolic_reachability`: Symbolic attractor detection.
+
+The following counters are recorded:
+
+- `expanded_nodes`: The number of expanded nodes.
+- `stable_motifs`: The number of stable motifs found in all expanded nodes.
+- `candidate_states`: The number of attractor candidates computed in all nodes.
+- `deferred_nodes`: The number of nodes that exceeded the per-node budget.
+- `unresolved_nodes`: The number of nodes that exceeded the symbolic reachability limits.
+- `evicted_attractor_sets`: The number of times the attractor sets of a node were evicted from memory.
+- `evicted_nodes`: The number of times the data of a node were evicted into the backing store.
+
+Computations that run in worker processes (e.g. parallel attractor detection)
+are not measured.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from typing import Callable, Iterator
+
+from biobalm.types import PhaseStatistics
+
+
+class Instrumentation:
+    """
+    Collects the time spent in individual computation phases, both in total
+    and per succession diagram node, together with named event counters.
+
+    Use :meth:`timer` to measure a phase and :meth:`count` to increment a counter.
+    """
+
+    __slots__ = ("phases", "nodes", "counters", "callbacks", "_depth")
+
+    def __init__(self):
+        self.phases: dict[str, PhaseStatistics] = {}
+        """
+        The number of calls and the total time (in seconds) of each phase.
+        """
+
+        self.nodes: dict[int, dict[str, float]] = {}
+        """
+        For every node, the total time (in seconds) spent in each phase
+        that was measured for this node. The `total` item is the sum of all
+        phases of the node that did not run nested in another phase.
+        """
+
+        self.counters: dict[str, int] = {}
+        """
+        The values of the event counters.
+        """
+
+        self.callbacks: list[Callable[[str, int | None, float], None]] = []
+        """
+        Functions that are called with the name of the phase, the node ID
+        (or `None`) and the elapsed time (in seconds) once a phase finishes.
+        """
+
+        # The number of currently running timers.
+        self._depth = 0
+
+    def __repr__(self) -> str:
+        # The recorded data is intentionally not part of the representation,
+        # since it does not change the results of any computation.
+        return "Instrumentation()"
+
+    def add_callback(self, callback: Callable[[str, int | None, float], None]):
+        """
+        Register a function that is called every time a phase finishes.
+
+        The callback receives the name of the phase, the node ID (or `None`
+        if the phase is not associated with a node) and the elapsed time
+        in seconds.
+        """
+        self.callbacks.append(callback)
+
+    @contextmanager
+    def timer(self, phase: str, node_id: int | None = None) -> Iterator[None]:
+        """
+        Measure the time spent in the `with` block as part of the given `phase`
+        (and the given node, if specified).
+        """
+        start = time.perf_counter()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.record(phase, time.perf_counter() - start, node_id)
+
+    def record(self, phase: str, seconds: float, node_id: int | None = None):
+        """
+        Record the time spent in the given `phase` (and the given node,
+        if specified).
+        """
+        statistics = self.phases.get(phase)
+        if statistics is None:
+            statistics = {"calls": 0, "seconds": 0.0}
+            self.phases[phase] = statistics
+        statistics["calls"] += 1
+        statistics["seconds"] += seconds
+        if node_id is not None:
+            node = self.nodes.setdefault(node_id, {})
+            node[phase] = node.get(phase, 0.0) + seconds
+            if self._depth == 0:
+                # Only the outermost phases are included in the node total,
+                # such that the nested phases are not counted twice.
+                node["total"] = node.get("total", 0.0) + seconds
+        for callback in self.callbacks:
+            callback(phase, node_id, seconds)
+
+    def count(self, counter: str, value: int = 1):
+        """
+        Increment the given event counter.
+        """
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def node_total(self, node_id: int) -> float:
+        """
+        The total time (in seconds) spent on the given node.
+        """
+        return self.nodes.get(node_id, {}).get("total", 0.0)
+
+    def clear(self):
+        """
+        Remove all recorded data (the callbacks are kept).
+        """
+        self.phases.clear()
+        self.nodes.clear()
+        self.counters.clear()
+
+    def report(self) -> dict[str, Any]:
+        """
+        A structured report of the recorded data: a dictionary with items
+        `phases`, `nodes` and `counters` (see :attr:`phases`, :attr:`nodes`
+        and :attr:`counters`). The report is a copy that is not modified
+        by further computation.
+        """
+        return copy.deepcopy(
+            {"phases": self.phases, "nodes": self.nodes, "counters": self.counters}
+        )
+
+    def summary(self, node_limit: int = 10) -> str:
+        """
+        A human-readable table of the recorded phases and counters, followed
+        by the `node_limit` nodes with the highest total time.
+        """
+        lines = [f"{'phase':<24}{'calls':>10}{'seconds':>12}"]
+        for phase, stats in sorted(
+            self.phases.items(), key=lambda x: x[1]["seconds"], reverse=True
+        ):
+            lines.append(f"{phase:<24}{stats['calls']:>10}{stats['seconds']:>12.3f}")
+        for counter, value in sorted(self.counters.items()):
+            lines.append(f"{counter:<24}{value:>10}")
+        slowest = sorted(self.nodes, key=self.node_total, reverse=True)
+        for node_id in slowest[:node_limit]:
+            total = self.node_total(node_id)
+            lines.append(f"{'node ' + str(node_id):<24}{'':>10}{total:>12.3f}")
+        return "\n".join(lines)
+
+
+def logging_callback(
+    logger: logging.Logger | None = None, level: int = logging.DEBUG
+) -> Callable[[str, int | None, float], None]:
+    """
+    Create an :class:`Instrumentation` callback which reports every finished
+    phase to the given `logger` (by default, the `biobalm` logger).
+    """
+    if logger is None:
+        logger = logging.getLogger("biobalm")
+    target = logger
+
+    def callback(phase: str, node_id: int | None, seconds: float):
+        if node_id is None:
+            target.log(level, "%s finished in %.6fs", phase, seconds)
+        else:
+            target.log(level, "[%d] %s finished in %.6fs", node_id, phase, seconds)
+
+    return callback
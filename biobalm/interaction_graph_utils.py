@@ -5,6 +5,8 @@ of a Boolean network.
 
 from __future__ import annotations
 
+import hashlib
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Literal
 
 if TYPE_CHECKING:
@@ -121,6 +123,158 @@ def feedback_vertex_set(
     return sorted([network.get_variable_name(x) for x in fvs])
 
 
+class FeedbackVertexSetCache:
+    """
+    A bounded cache of (approximately minimal) feedback vertex sets which
+    can be computed incrementally from the FVS of a larger network.
+
+    The FVS only depends on the regulatory graph, hence networks with the same
+    regulations (e.g. percolated to different sub-spaces) share the cached
+    result. Once the cache holds `capacity` results, the least recently used
+    result is evicted. The `hits` and `misses` counters can be used to evaluate
+    the efficiency of the cache.
+
+    If a `hint` is given to :meth:`feedback_vertex_set`, it must be an FVS
+    of a network whose regulatory graph contains the given network (e.g. the
+    parent node of a succession diagram). The hint is restricted to the
+    variables of the network and only the cycles that avoid it are repaired.
+    Afterwards, the vertices that no longer intersect any cycle are removed.
+    Every vertex of the result is certified by a cycle, which is remembered
+    and re-validated once the vertex appears in a hint again, such that most
+    vertices do not have to be checked by the solver.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximal number of cached results. If zero, nothing is cached.
+    parity : Literal["positive", "negative"] | None
+        The parity of the considered cycles (see :func:`feedback_vertex_set`).
+    """
+
+    __slots__ = ("capacity", "parity", "entries", "witnesses", "hits", "misses")
+
+    def __init__(
+        self, capacity: int, parity: Literal["positive", "negative"] | None = None
+    ):
+        self.capacity = capacity
+        self.parity: Literal["positive", "negative"] | None = parity
+        self.entries: OrderedDict[bytes, list[str]] = OrderedDict()
+        # For each vertex, the last cycle which certified that the vertex
+        # is necessary in some FVS.
+        self.witnesses: dict[str, list[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        # The cached entries are intentionally not part of the representation,
+        # since they do not change the results of any computation.
+        return (
+            f"FeedbackVertexSetCache(capacity={self.capacity}, parity={self.parity!r})"
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def feedback_vertex_set(
+        self, network: RegulatoryGraph, hint: Sequence[str] | None = None
+    ) -> list[str]:
+        """
+        Same as :func:`feedback_vertex_set` (with the `parity` of this cache),
+        but the result is reused if a network with the same regulatory graph
+        has been processed before, and it is computed incrementally from the
+        `hint` (if given).
+
+        The result is always a fresh list that can be safely modified.
+        """
+        key = _regulatory_graph_key(network)
+        result = self.entries.get(key)
+        if result is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return list(result)
+
+        self.misses += 1
+        if hint is None:
+            result = feedback_vertex_set(network, parity=self.parity)
+        else:
+            result = self._repair(network, hint)
+        if self.capacity > 0:
+            self.entries[key] = result
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+        return list(result)
+
+    def clear(self):
+        """
+        Remove all cached results and reset the `hits` and `misses` counters.
+        """
+        self.entries.clear()
+        self.witnesses.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _repair(self, network: RegulatoryGraph, hint: Sequence[str]) -> list[str]:
+        names = set(network.variable_names())
+        fvs = {x for x in hint if x in names}
+        # Every remaining cycle avoids the hint, hence it must be covered
+        # by the FVS of the sub-graph induced by the remaining vertices.
+        remaining = sorted(names - fvs)
+        fvs |= set(feedback_vertex_set(network, self.parity, remaining))
+
+        # Remove the vertices that are not necessary (in a fixed order,
+        # such that the result is deterministic).
+        for var in sorted(fvs):
+            allowed = (names - fvs) | {var}
+            witness = self.witnesses.get(var)
+            if witness is not None and _is_cycle(
+                network, witness, allowed, self.parity
+            ):
+                continue
+            cycle = network.shortest_cycle(var, self.parity, sorted(allowed))
+            if cycle is None:
+                fvs.remove(var)
+            else:
+                self.witnesses[var] = [network.get_variable_name(x) for x in cycle]
+        return sorted(fvs)
+
+
+def _regulatory_graph_key(network: RegulatoryGraph) -> bytes:
+    """
+    A digest of the regulations (including their signs) of the given network.
+    """
+    regulations = "\n".join(sorted(network.regulation_strings()))
+    return hashlib.blake2b(regulations.encode(), digest_size=16).digest()
+
+
+def _is_cycle(
+    network: RegulatoryGraph,
+    cycle: list[str],
+    allowed: set[str],
+    parity: Literal["positive", "negative"] | None,
+) -> bool:
+    """
+    True if `cycle` is a cycle of the given `parity` in the sub-graph of
+    `network` induced by the `allowed` vertices. Regulations with no
+    monotonicity are counted as both positive and negative.
+    """
+    if any(x not in allowed for x in cycle):
+        return False
+    negative = False
+    ambiguous = False
+    for i, source in enumerate(cycle):
+        target = cycle[(i + 1) % len(cycle)]
+        regulation = network.find_regulation(source, target)
+        if regulation is None:
+            return False
+        if regulation["sign"] is None:
+            ambiguous = True
+        elif regulation["sign"] == "-":
+            negative = not negative
+    if parity is None or ambiguous:
+        return True
+    return negative == (parity == "negative")
+
+
 def cleanup_network(network: BooleanNetwork) -> BooleanNetwork:
     """
     Prepare a `BooleanNetwork` object for use in a `SuccessionDiagram`. This
@@ -3,8 +3,10 @@ Utilities for translating Boolean networks into Petri nets.
 
 Implements the translation from a `BooleanNetwork` object into a Petri net that
 can be processed by Trappist (for finding trap spaces). The Petri net is
-represented as a `networkx.DiGraph`, with nodes having either a `kind=place` or
-a `kind=transition` attribute.
+represented as a :class:`PetriNet` object, which stores the places and
+transitions in integer-indexed arrays. For compatibility, it can be converted
+to (and from) a `networkx.DiGraph`, with nodes having either a `kind=place` or
+a `kind=transition` attribute (see :meth:`PetriNet.to_networkx`).
 
 The variable names in the network have to be "sanitized" before translation. In
 particular, this means they can't use any special characters beyond "_". In the
@@ -27,7 +29,9 @@ if TYPE_CHECKING:
 
 import copy
 import re
-from typing import cast
+from array import array
+from bisect import bisect_right
+from typing import TypeVar, cast
 
 from biodivine_aeon import (
     BddPartialValuation,
@@ -136,7 +140,283 @@ def place_to_variable(place: str) -> tuple[str, bool]:
         raise Exception(f"Invalid place name: `{place}`.")
 
 
-def extract_variable_names(encoded_network: DiGraph) -> list[str]:
+class PetriNet:
+    """
+    A Petri net encoding of a Boolean network.
+
+    Each network variable `variables[i]` is represented by two places: The place
+    `2 * i` corresponds to the variable being `0` (i.e. `b0_{variable}`) and
+    the place `2 * i + 1` to the variable being `1` (i.e. `b1_{variable}`).
+
+    Each transition moves a token between the two places of one variable. The
+    transitions are stored in a CSR-like format: the pre-set (input places) of
+    transition `t` is `pre_places[pre_offsets[t]:pre_offsets[t + 1]]`, and the
+    post-set (output places) is stored the same way in `post_offsets` and
+    `post_places`. The first place of each pre-set (post-set) is the place
+    from which (into which) the token is moved. The remaining places are the
+    conditions of the transition, which appear in both sets.
+
+    Transitions are ordered by their variable, such that the transitions of
+    the `i`-th variable are `range(variable_offsets[i], variable_offsets[i + 1])`.
+
+    Use :func:`network_to_petrinet` to create a `PetriNet` from a Boolean
+    network.
+    """
+
+    __slots__ = (
+        "variables",
+        "transitions",
+        "pre_offsets",
+        "pre_places",
+        "post_offsets",
+        "post_places",
+        "variable_offsets",
+    )
+
+    def __init__(self, variables: list[str]):
+        self.variables: list[str] = variables
+        """
+        The names of the network variables, ordered by their index.
+        """
+
+        self.transitions: list[str] = []
+        """
+        The names of the transitions, ordered by their index.
+        """
+
+        self.pre_offsets: array[int] = array("q", [0])
+        self.pre_places: array[int] = array("q")
+        self.post_offsets: array[int] = array("q", [0])
+        self.post_places: array[int] = array("q")
+        self.variable_offsets: array[int] = array("q")
+
+    def __repr__(self) -> str:
+        return f"PetriNet(variables={len(self.variables)}, transitions={len(self.transitions)})"
+
+    def place_count(self) -> int:
+        """
+        The number of places in this Petri net.
+        """
+        return 2 * len(self.variables)
+
+    def transition_count(self) -> int:
+        """
+        The number of transitions in this Petri net.
+        """
+        return len(self.transitions)
+
+    def place_name(self, place: int) -> str:
+        """
+        The name of the given place, as given by :func:`variable_to_place`.
+        """
+        return variable_to_place(self.variables[place >> 1], positive=place & 1 == 1)
+
+    def place_names(self) -> list[str]:
+        """
+        The names of all places, ordered by their index.
+        """
+        return [self.place_name(place) for place in range(self.place_count())]
+
+    def pre_set(self, transition: int) -> array[int]:
+        """
+        The input places of the given transition.
+        """
+        start = self.pre_offsets[transition]
+        return self.pre_places[start : self.pre_offsets[transition + 1]]
+
+    def post_set(self, transition: int) -> array[int]:
+        """
+        The output places of the given transition.
+        """
+        start = self.post_offsets[transition]
+        return self.post_places[start : self.post_offsets[transition + 1]]
+
+    def variable_transitions(self, variable: int) -> range:
+        """
+        The transitions that change the value of the given variable.
+        """
+        return range(
+            self.variable_offsets[variable], self.variable_offsets[variable + 1]
+        )
+
+    def transition_variable(self, transition: int) -> int:
+        """
+        The variable whose value is changed by the given transition.
+        """
+        return bisect_right(self.variable_offsets, transition) - 1
+
+    def source_variables(self) -> list[int]:
+        """
+        The variables that have no transitions (i.e. variables with
+        an identity update function).
+        """
+        offsets = self.variable_offsets
+        return [i for i in range(len(self.variables)) if offsets[i] == offsets[i + 1]]
+
+    def restrict(self, sub_space: BooleanSpace) -> PetriNet:
+        """
+        Same as :func:`restrict_petrinet_to_subspace`.
+        """
+        # For every place, the index of the place in the result, or `_REMOVED`
+        # for places of fixed variables, or `_BLOCKED` for places that
+        # contradict the fixed value (transitions requiring such place are
+        # removed entirely).
+        place_map = [_REMOVED] * self.place_count()
+        fixed: set[int] = set()
+        for i, var in enumerate(self.variables):
+            value = sub_space.get(var)
+            if value is None:
+                continue
+            fixed.add(i)
+            place_map[2 * i + 1 - value] = _BLOCKED
+
+        variables: list[str] = []
+        for i, var in enumerate(self.variables):
+            if i not in fixed:
+                place_map[2 * i] = 2 * len(variables)
+                place_map[2 * i + 1] = 2 * len(variables) + 1
+                variables.append(var)
+
+        result = PetriNet(variables)
+        for i in range(len(self.variables)):
+            if i in fixed:
+                continue
+            new_variable = place_map[2 * i] >> 1
+            for t in self.variable_transitions(i):
+                pre = _map_places(place_map, self.pre_set(t))
+                if pre is None:
+                    continue
+                post = _map_places(place_map, self.post_set(t))
+                assert post is not None
+                result.add_transition(new_variable, self.transitions[t], pre, post)
+        result.finish()
+        return result
+
+    def to_networkx(self) -> DiGraph:
+        """
+        Convert this Petri net to a `networkx.DiGraph`.
+
+        The nodes of the graph are the place and transition names, with a `kind`
+        attribute set to `place` or `transition`. Transitions also have
+        a `change` attribute (the name of the updated variable) and a `direction`
+        attribute (`up` or `down`).
+        """
+        graph = DiGraph()
+        for var in self.variables:
+            graph.add_node(variable_to_place(var, True), kind="place")  # type: ignore
+            graph.add_node(variable_to_place(var, False), kind="place")  # type: ignore
+
+        names = self.place_names()
+        for i, var in enumerate(self.variables):
+            for t in self.variable_transitions(i):
+                pre = self.pre_set(t)
+                post = self.post_set(t)
+                name = self.transitions[t]
+                graph.add_node(  # type: ignore
+                    name,
+                    kind="transition",
+                    change=var,
+                    direction="up" if post[0] & 1 == 1 else "down",
+                )
+                for place in pre:
+                    graph.add_edge(names[place], name)  # type: ignore
+                for place in post:
+                    graph.add_edge(name, names[place])  # type: ignore
+        return graph
+
+    @staticmethod
+    def from_networkx(graph: DiGraph) -> PetriNet:
+        """
+        Convert a `networkx.DiGraph` (in the format produced by
+        :meth:`to_networkx`) into a `PetriNet`.
+        """
+        variables: list[str] = []
+        indices: dict[str, int] = {}
+        for node, kind in graph.nodes(data="kind"):  # type: ignore
+            if kind != "place":
+                continue
+            var = place_to_variable(cast(str, node))[0]
+            if var not in indices:
+                indices[var] = len(variables)
+                variables.append(var)
+
+        def place_index(place: str) -> int:
+            (var, is_positive) = place_to_variable(place)
+            return 2 * indices[var] + int(is_positive)
+
+        transitions: list[tuple[int, str, list[int], list[int]]] = []
+        for node, kind in graph.nodes(data="kind"):  # type: ignore
+            if kind == "place":
+                continue
+            if kind != "transition":
+                raise Exception(f"Unexpected node kind: `{kind}`.")
+            preds = [place_index(x) for x in graph.predecessors(node)]  # type: ignore
+            succs = [place_index(x) for x in graph.successors(node)]  # type: ignore
+            # Ensure the changed place is first in the pre-set and post-set.
+            pre = [x for x in preds if x not in succs] + [
+                x for x in preds if x in succs
+            ]
+            post = [x for x in succs if x not in preds] + [
+                x for x in succs if x in preds
+            ]
+            transitions.append((pre[0] >> 1, cast(str, node), pre, post))
+
+        result = PetriNet(variables)
+        # The sort is stable, hence transitions of each variable keep their order.
+        for var_id, name, pre, post in sorted(transitions, key=lambda x: x[0]):
+            result.add_transition(var_id, name, pre, post)
+        result.finish()
+        return result
+
+    def add_transition(self, variable: int, name: str, pre: list[int], post: list[int]):
+        """
+        Add a new transition that updates the given `variable` (an index into
+        `PetriNet.variables`). The first place of `pre` (`post`) is the place
+        from which (into which) the token is moved, the remaining places are
+        the conditions of the transition.
+
+        Transitions must be added ordered by their variable, and the net must be
+        completed using :meth:`finish` once all transitions are added.
+        """
+        while len(self.variable_offsets) <= variable:
+            self.variable_offsets.append(len(self.transitions))
+        self.transitions.append(name)
+        self.pre_places.extend(pre)
+        self.pre_offsets.append(len(self.pre_places))
+        self.post_places.extend(post)
+        self.post_offsets.append(len(self.post_places))
+
+    def finish(self):
+        """
+        Complete the construction of a Petri net created using
+        :meth:`add_transition`.
+        """
+        while len(self.variable_offsets) <= len(self.variables):
+            self.variable_offsets.append(len(self.transitions))
+
+
+PetriNetType = TypeVar("PetriNetType", PetriNet, DiGraph)
+
+_REMOVED = -1
+_BLOCKED = -2
+
+
+def _map_places(place_map: list[int], places: array[int]) -> list[int] | None:
+    """
+    Translate the given places using the `place_map` of `PetriNet.restrict`,
+    or return `None` if some place is blocked.
+    """
+    result: list[int] = []
+    for place in places:
+        mapped = place_map[place]
+        if mapped >= 0:
+            result.append(mapped)
+        elif mapped == _BLOCKED:
+            return None
+    return result
+
+
+def extract_variable_names(encoded_network: PetriNet | DiGraph) -> list[str]:
     """
     Extract the variable names from a Petri net encoded Boolean network.
 
@@ -148,7 +428,7 @@ def extract_variable_names(encoded_network: DiGraph) -> list[str]:
 
     Parameters
     ----------
-    encoded_network : DiGraph
+    encoded_network : PetriNet | DiGraph
         The Petri net encoded Boolean network.
 
     Returns
@@ -156,6 +436,9 @@ def extract_variable_names(encoded_network: DiGraph) -> list[str]:
     list[str]
         The list of variable names.
     """
+    if isinstance(encoded_network, PetriNet):
+        return sorted(encoded_network.variables)
+
     variables: list[str] = []
     for node in encoded_network.nodes():  # type: ignore
         node = str(node)  # type: ignore
@@ -165,7 +448,7 @@ def extract_variable_names(encoded_network: DiGraph) -> list[str]:
     return sorted(variables)
 
 
-def extract_source_variables(encoded_network: DiGraph) -> list[str]:
+def extract_source_variables(encoded_network: PetriNet | DiGraph) -> list[str]:
     """
     List variable names that represent source nodes of the encoded network.
 
@@ -173,7 +456,7 @@ def extract_source_variables(encoded_network: DiGraph) -> list[str]:
 
     Parameters
     ----------
-    encoded_network : DiGraph
+    encoded_network : PetriNet | DiGraph
         The Petri net encoded Boolean network.
 
     Returns
@@ -181,6 +464,10 @@ def extract_source_variables(encoded_network: DiGraph) -> list[str]:
     list[str]
         The list of source variable names.
     """
+    if isinstance(encoded_network, PetriNet):
+        variables = encoded_network.variables
+        return sorted(variables[i] for i in encoded_network.source_variables())
+
     variables = extract_variable_names(encoded_network)
     source_set = set(variables)
     for _, change_var in encoded_network.nodes(data="change"):  # type: ignore
@@ -191,9 +478,9 @@ def extract_source_variables(encoded_network: DiGraph) -> list[str]:
 
 
 def restrict_petrinet_to_subspace(
-    petri_net: DiGraph,
+    petri_net: PetriNetType,
     sub_space: BooleanSpace,
-) -> DiGraph:
+) -> PetriNetType:
     """
     Create a copy of a Petri net restricted to a sub-space.
 
@@ -210,17 +497,23 @@ def restrict_petrinet_to_subspace(
 
     Parameters
     ----------
-    petri_net : DiGraph
+    petri_net : PetriNet | DiGraph
         The Petri net to restrict.
     sub_space : BooleanSpace
         The sub-space to restrict the Petri net to.
 
     Returns
     -------
-    DiGraph
-        The restricted Petri net.
+    PetriNet | DiGraph
+        The restricted Petri net (of the same type as `petri_net`).
     """
-    result = copy.deepcopy(petri_net)
+    if isinstance(petri_net, PetriNet):
+        return petri_net.restrict(sub_space)
+
+    # Instead of copying the whole Petri net and then deleting most of it,
+    # we first find the places and transitions that are removed, and then
+    # only copy the rest.
+    removed: set[str] = set()
     for var, value in sub_space.items():
         # The idea is that we want to *remove* the place that corresponds to the fixed
         # value (it's effect on transitions is assumed to be fulfilled). Then, we remove
@@ -229,42 +522,57 @@ def restrict_petrinet_to_subspace(
         fixed_place = variable_to_place(var, bool(value))
         inverse_place = variable_to_place(var, not bool(value))
 
-        if fixed_place not in result.nodes or inverse_place not in result.nodes:
-            # These nodes were already removed.
+        if fixed_place not in petri_net.nodes or inverse_place not in petri_net.nodes:
+            # The variable does not appear in the Petri net.
             continue
 
         # First, remove all transitions that modify the fixed variable.
         # These are removed regardless of the actual value.
 
-        to_delete: set[str] = set()
-
         # Transitions that put marker into one of the place values, but do not take it.
-        for tr in result.predecessors(fixed_place):  # type: ignore
-            if not result.has_edge(fixed_place, tr):  # type: ignore
-                to_delete.add(cast(str, tr))
-        for tr in result.predecessors(inverse_place):  # type: ignore
-            if not result.has_edge(inverse_place, tr):  # type: ignore
-                to_delete.add(cast(str, tr))
+        for tr in petri_net.predecessors(fixed_place):  # type: ignore
+            if not petri_net.has_edge(fixed_place, tr):  # type: ignore
+                removed.add(cast(str, tr))
+        for tr in petri_net.predecessors(inverse_place):  # type: ignore
+            if not petri_net.has_edge(inverse_place, tr):  # type: ignore
+                removed.add(cast(str, tr))
 
         # Transitions that depend on the value of the inverse place
-        for tr in result.successors(inverse_place):  # type: ignore
-            to_delete.add(cast(str, tr))
-
-        for tr in to_delete:
-            result.remove_node(tr)  # type: ignore
+        for tr in petri_net.successors(inverse_place):  # type: ignore
+            removed.add(cast(str, tr))
+
+        removed.add(fixed_place)
+        removed.add(inverse_place)
+
+    result = DiGraph()
+    result.graph.update(copy.deepcopy(petri_net.graph))  # type: ignore
+    for node, data in petri_net.nodes(data=True):  # type: ignore
+        if node not in removed:
+            result.add_node(node, **data)  # type: ignore
+
+    # Every edge connects a place and a transition. Adding the edges of each
+    # transition in the original order ensures that the adjacency of every
+    # node is ordered the same way as in the original Petri net.
+    for tr, data in petri_net.nodes(data=True):  # type: ignore
+        if data["kind"] != "transition" or tr in removed:
+            continue
+        for place, edge in petri_net.pred[tr].items():  # type: ignore
+            if place not in removed:
+                result.add_edge(place, tr, **edge)  # type: ignore
+        for place, edge in petri_net.succ[tr].items():  # type: ignore
+            if place not in removed:
+                result.add_edge(tr, place, **edge)  # type: ignore
 
-        result.remove_node(fixed_place)  # type: ignore
-        result.remove_node(inverse_place)  # type: ignore
     return result
 
 
 def network_to_petrinet(
     network: BooleanNetwork, symbolic_context: SymbolicContext | None = None
-) -> DiGraph:
+) -> PetriNet:
     """
     Convert a Boolean network to a Petri net.
 
-    Converts a `biodivine_aeon.BooleanNetwork` to a `DiGraph` representing a Petri net encoding
+    Converts a `biodivine_aeon.BooleanNetwork` to a :class:`PetriNet` representing a Petri net encoding
     of the original network. For details about the encoding, see module
     description.
 
@@ -289,8 +597,9 @@ def network_to_petrinet(
 
     Returns
     -------
-    DiGraph
-        The Petri net encoding of the given network.
+    PetriNet
+        The Petri net encoding of the given network. Use
+        :meth:`PetriNet.to_networkx` to obtain a `networkx.DiGraph`.
     """
     # Assert that all network names are already sanitized.
     sanitize_network_names(network, check_only=True)
@@ -313,16 +622,12 @@ def network_to_petrinet(
     if symbolic_context is None:
         symbolic_context = SymbolicContext(network)
 
-    pn = DiGraph()
-
-    # Create a positive and a negative place for each variable.
-    places: dict[str, tuple[str, str]] = {}
-    for name in network.variable_names():
-        p_name = variable_to_place(name, positive=True)
-        n_name = variable_to_place(name, positive=False)
-        pn.add_node(p_name, kind="place")  # type: ignore[reportUnknownMemberType]
-        pn.add_node(n_name, kind="place")  # type: ignore[reportUnknownMemberType]
-        places[name] = (n_name, p_name)
+    # Each variable has a positive and a negative place (see `PetriNet`).
+    variables = network.variable_names()
+    pn = PetriNet(variables)
+    places: dict[str, tuple[int, int]] = {
+        name: (2 * i, 2 * i + 1) for i, name in enumerate(variables)
+    }
 
     # Create PN transitions for implicants of every BN transition.
     for var in network.variables():
@@ -344,11 +649,18 @@ def network_to_petrinet(
 
         # Add 0->1 edges.
         _create_transitions(
-            pn, symbolic_context.bdd_variable_set(), places, var_name, p_bdd, go_up=True
+            pn,
+            int(var),
+            symbolic_context.bdd_variable_set(),
+            places,
+            var_name,
+            p_bdd,
+            go_up=True,
         )
         # Add 1-> 0 edges.
         _create_transitions(
             pn,
+            int(var),
             symbolic_context.bdd_variable_set(),
             places,
             var_name,
@@ -356,6 +668,7 @@ def network_to_petrinet(
             go_up=False,
         )
 
+    pn.finish()
     return pn
 
 
@@ -408,9 +721,10 @@ def optimized_recursive_dnf_generator(
 
 
 def _create_transitions(
-    pn: DiGraph,
+    pn: PetriNet,
+    var_index: int,
     ctx: BddVariableSet,
-    places: dict[str, tuple[str, str]],
+    places: dict[str, tuple[int, int]],
     var_name: str,
     implicant_bdd: Bdd,
     go_up: bool,
@@ -424,20 +738,14 @@ def _create_transitions(
     for t_id, implicant in enumerate(optimized_recursive_dnf_generator(implicant_bdd)):
         total += 1
         t_name = f"tr_{var_name}_{dir_str}_{t_id + 1}"
-        pn.add_node(  # type: ignore[reportUnknownMemberType]
-            t_name,
-            kind="transition",  # type: ignore[reportUnknownMemberType]
-            change=var_name,
-            direction=dir_str,
-        )
         # The transition moves a token either from "zero place" to the
         # "one place", or vice versa.
         if go_up:
-            pn.add_edge(places[var_name][0], t_name)  # type: ignore[reportUnknownMemberType] # noqa
-            pn.add_edge(t_name, places[var_name][1])  # type: ignore[reportUnknownMemberType] # noqa
+            pre = [places[var_name][0]]
+            post = [places[var_name][1]]
         else:
-            pn.add_edge(places[var_name][1], t_name)  # type: ignore[reportUnknownMemberType] # noqa
-            pn.add_edge(t_name, places[var_name][0])  # type: ignore[reportUnknownMemberType] # noqa
+            pre = [places[var_name][1]]
+            post = [places[var_name][0]]
         for variable, value in implicant.items():
             variable_str = ctx.get_variable_name(
                 variable
@@ -446,7 +754,8 @@ def _create_transitions(
                 continue
             # For the remaining variables, we simply check if the required
             # token is present in the corresponding place.
-            pn.add_edge(places[variable_str][value], t_name)  # type: ignore[reportUnknownMemberType] # noqa
-            pn.add_edge(t_name, places[variable_str][value])  # type: ignore[reportUnknownMemberType] # noqa
+            pre.append(places[variable_str][value])
+            post.append(places[variable_str][value])
+        pn.add_transition(var_index, t_name, pre, post)
     if DEBUG:
         print(f"  >> Generated {total} total PN transitions.")
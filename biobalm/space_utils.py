@@ -8,6 +8,7 @@ keys and values `0`/`1` assigned to fixed variables. See also
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from copy import copy
 from typing import TYPE_CHECKING, Literal, cast
 
@@ -20,6 +21,8 @@ from biodivine_aeon import (
     UpdateFunction,
 )
 
+from biobalm.compact_space import CompactSpace, SpaceEncoder
+from biobalm.compiled_network import CompiledNetwork
 from biobalm.symbolic_utils import function_eval
 
 if TYPE_CHECKING:
@@ -140,7 +143,9 @@ def remove_state_from_dnf(
 
 
 def percolate_space_strict(
-    network: AsynchronousGraph, space: BooleanSpace
+    network: AsynchronousGraph,
+    space: BooleanSpace,
+    compiled: CompiledNetwork | None = None,
 ) -> BooleanSpace:
     """
     Percolates a space through a Boolean network, disregarding constants.
@@ -162,6 +167,11 @@ def percolate_space_strict(
         `BooleanNetwork` via `biodivine_aeon.AsynchronousGraph(bn)`.
     space : BooleanSpace
         The space to percolate.
+    compiled : CompiledNetwork | None
+        A compiled representation of the same `network`. If given, it is used
+        instead of the update function BDDs, which is much faster when
+        percolating many spaces (see
+        :class:`CompiledNetwork<biobalm.compiled_network.CompiledNetwork>`).
 
     Returns
     -------
@@ -169,6 +179,10 @@ def percolate_space_strict(
         The percolated space.
     """
 
+    if compiled is not None:
+        encoder = compiled.encoder
+        return encoder.decode(compiled.percolate_strict(encoder.encode(space)))
+
     result: BooleanSpace = {}
     restriction: BooleanSpace = copy(space)
     candidates = set(network.network_variable_names())
@@ -241,10 +255,122 @@ def percolate_space(
     return result
 
 
+class PercolationCache:
+    """
+    A bounded cache of :func:`percolate_space` results for a single network.
+
+    The cached spaces are stored in their
+    :class:`CompactSpace<biobalm.compact_space.CompactSpace>` representation.
+    Once the cache holds `capacity` results, the least recently used result
+    is evicted. The `hits` and `misses` counters can be used to evaluate the
+    efficiency of the cache.
+
+    Spaces given as a :class:`BooleanSpace<biobalm.types.BooleanSpace>` are
+    percolated using :func:`percolate_space`. Compact spaces are percolated
+    using a :class:`CompiledNetwork<biobalm.compiled_network.CompiledNetwork>`,
+    which is created once the first compact space is percolated.
+
+    Parameters
+    ----------
+    network : AsynchronousGraph
+        The network in which the percolation is performed.
+    capacity : int
+        The maximal number of cached results. If zero, nothing is cached.
+    encoder : SpaceEncoder | None
+        The encoder used to compute the cache keys. If not given, a new
+        encoder is created for the `network`.
+    """
+
+    __slots__ = (
+        "network",
+        "encoder",
+        "compiled",
+        "capacity",
+        "entries",
+        "hits",
+        "misses",
+    )
+
+    def __init__(
+        self,
+        network: AsynchronousGraph,
+        capacity: int,
+        encoder: SpaceEncoder | None = None,
+    ):
+        if encoder is None:
+            encoder = SpaceEncoder.from_network(network)
+        self.network = network
+        self.encoder = encoder
+        self.compiled: CompiledNetwork | None = None
+        self.capacity = capacity
+        self.entries: OrderedDict[CompactSpace, CompactSpace] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        # The cached entries are intentionally not part of the representation,
+        # since they do not change the results of any computation.
+        return f"PercolationCache(capacity={self.capacity})"
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def percolate(self, space: BooleanSpace) -> BooleanSpace:
+        """
+        Same as :func:`percolate_space`, but the result is reused if the
+        same `space` has been percolated before.
+
+        The result is always a fresh dictionary that can be safely modified.
+        """
+        key = self.encoder.encode(space)
+        result = self._lookup(key)
+        if result is None:
+            result = self.encoder.encode(percolate_space(self.network, space))
+            self._insert(key, result)
+        return self.encoder.decode(result)
+
+    def percolate_compact(self, space: CompactSpace) -> CompactSpace:
+        """
+        Same as :meth:`percolate`, but for a
+        :class:`CompactSpace<biobalm.compact_space.CompactSpace>`.
+        """
+        result = self._lookup(space)
+        if result is None:
+            if self.compiled is None:
+                self.compiled = CompiledNetwork(self.network)
+            result = self.compiled.percolate(space)
+            self._insert(space, result)
+        return result
+
+    def clear(self):
+        """
+        Remove all cached results and reset the `hits` and `misses` counters.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: CompactSpace) -> CompactSpace | None:
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return result
+
+    def _insert(self, key: CompactSpace, result: CompactSpace):
+        if self.capacity > 0:
+            self.entries[key] = result
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+
 def percolation_conflicts(
     network: AsynchronousGraph,
     space: BooleanSpace,
     strict_percolation: bool = True,
+    compiled: CompiledNetwork | None = None,
 ) -> set[str]:
     """
     Find variables that conflict with the percolation of the given space.
@@ -265,6 +391,9 @@ def percolation_conflicts(
         If `True` (the default), then the percolation is performed using
         :func:`percolate_space_strict`. Otherwise, it is performed using
         :func:`percolate_space`.
+    compiled : CompiledNetwork | None
+        A compiled representation of the same `network`. If given, it is used
+        instead of the update function BDDs (see :func:`percolate_space_strict`).
 
     Returns
     -------
@@ -274,6 +403,18 @@ def percolation_conflicts(
     """
     conflicts: set[str] = set()
 
+    if compiled is not None:
+        encoder = compiled.encoder
+        if strict_percolation:
+            compact = compiled.percolate_strict(encoder.encode(space))
+        else:
+            compact = encoder.encode(percolate_space(network, space))
+        for var, value in encoder.decode(compact).items():
+            fn_value = compiled.eval_space(encoder.indices[var], compact)
+            if fn_value is not None and value != fn_value:
+                conflicts.add(var)
+        return conflicts
+
     if strict_percolation:
         perc_space = percolate_space_strict(network, space)
     else:
@@ -3,15 +3,20 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Literal, cast
 
 if TYPE_CHECKING:
-    from typing import Iterator
+    from concurrent.futures import Executor
+    from typing import Iterable, Iterator
 
 import copy
+from collections import OrderedDict
+from contextlib import contextmanager
+
 import networkx as nx  # type: ignore
 from biodivine_aeon import AsynchronousGraph, BooleanNetwork, VertexSet
 
 # Attractor detection algorithms.
 from biobalm._sd_attractors.attractor_candidates import compute_attractor_candidates
 from biobalm._sd_attractors.attractor_symbolic import compute_attractors_symbolic
+from biobalm._sd_attractors.attractor_parallel import compute_attractors_parallel
 
 # SD expansion algorithms/heuristics.
 from biobalm._sd_algorithms.expand_attractor_seeds import expand_attractor_seeds
@@ -23,18 +28,30 @@ from biobalm._sd_algorithms.expand_source_blocks import expand_source_blocks
 from biobalm._sd_algorithms.expand_to_target import expand_to_target
 
 from biobalm.interaction_graph_utils import (
+    FeedbackVertexSetCache,
     cleanup_network,
     feedback_vertex_set,
     source_SCCs,
 )
 from biobalm.petri_net_translation import (
+    PetriNet,
     extract_source_variables,
     network_to_petrinet,
     restrict_petrinet_to_subspace,
 )
-from biobalm.space_utils import percolate_network, percolate_space, space_unique_key
-from biobalm.trappist_core import trappist
+from biobalm._budget import Budget
+from biobalm._sd_serialization import (
+    dump_succession_diagram,
+    load_succession_diagram,
+)
+from biobalm.compact_space import CompactSpace, SpaceEncoder
+from biobalm.instrumentation import Instrumentation
+from biobalm.space_utils import PercolationCache, percolate_network
+from biobalm.succession_diagram_store import SuccessionDiagramStore
+from biobalm.symbolic_utils import attractor_summary
+from biobalm.trappist_core import iter_trap_spaces
 from biobalm.types import (
+    AttractorSummary,
     BooleanSpace,
     NodeData,
     SuccessionDiagramState,
@@ -88,7 +105,16 @@ class SuccessionDiagram:
         "nfvs",
         "dag",
         "node_indices",
+        "space_encoder",
+        "percolation_cache",
+        "nfvs_cache",
+        "attractor_sets_lru",
+        "instrumentation",
         "config",
+        "modified_nodes",
+        "synced_revision",
+        "store",
+        "resident_nodes",
     )
 
     def __init__(
@@ -111,14 +137,51 @@ class SuccessionDiagram:
         The symbolic representation of the network using `biodivine_aeon.AsynchronousGraph`.
         """
 
-        self.petri_net: nx.DiGraph = network_to_petrinet(network)
+        self.space_encoder: SpaceEncoder = SpaceEncoder.from_network(self.network)
+        """
+        Converts spaces of `SuccessionDiagram.network` into their compact
+        representation (see :mod:`compact_space<biobalm.compact_space>`).
+        """
+
+        self.percolation_cache: PercolationCache = PercolationCache(
+            self.symbolic,
+            self.config["percolation_cache_size"],
+            self.space_encoder,
+        )
+        """
+        A cache of percolated spaces of `SuccessionDiagram.network` (see
+        :class:`PercolationCache<biobalm.space_utils.PercolationCache>`).
+        """
+
+        self.nfvs_cache: FeedbackVertexSetCache = FeedbackVertexSetCache(
+            self.config["nfvs_cache_size"], parity="negative"
+        )
+        """
+        A cache of the negative feedback vertex sets of the percolated node
+        networks (see :class:`FeedbackVertexSetCache<biobalm.interaction_graph_utils.FeedbackVertexSetCache>`).
+        """
+
+        self.attractor_sets_lru: OrderedDict[int, None] = OrderedDict()
+        """
+        The IDs of nodes with non-empty `attractor_sets`, ordered from the least
+        to the most recently used (see
+        `SuccessionDiagramConfiguration.attractor_sets_cache_size`).
+        """
+
+        self.instrumentation: Instrumentation = Instrumentation()
+        """
+        Timers and counters of the individual computation phases (see
+        :mod:`instrumentation<biobalm.instrumentation>`).
+        """
+
+        self.petri_net: PetriNet = network_to_petrinet(network)
         """
         The Petri net representation of the network (see :mod:`petri_net_translation<biobalm.petri_net_translation>`).
         """
 
         if self.config["debug"]:
             print(
-                f"Generated global Petri net with {len(self.petri_net.nodes)} nodes and {len(self.petri_net.edges)} edges."
+                f"Generated global Petri net with {self.petri_net.place_count()} places and {self.petri_net.transition_count()} transitions."
             )
 
         self.nfvs: list[str] | None = None
@@ -138,10 +201,41 @@ class SuccessionDiagram:
         diagram (see :func:`biobalm.space_utils.space_unique_key`).
         """
 
+        self.modified_nodes: set[int] = set()
+        """
+        The IDs of nodes whose stored data (see
+        :class:`SuccessionDiagramStore<biobalm.succession_diagram_store.SuccessionDiagramStore>`)
+        changed since the diagram was last written into a store (see
+        `SuccessionDiagram.synced_revision`). Only the changes made by the
+        methods of the diagram are recorded.
+        """
+
+        self.synced_revision: str | None = None
+        """
+        The store revision created by the last write of the diagram (or from
+        which the diagram was loaded), or `None` if the diagram was not written
+        into any store yet. Each write into a store creates a new revision.
+        """
+
+        self.store: SuccessionDiagramStore | None = None
+        """
+        The store backing the node data of this diagram (see
+        :meth:`attach_store`), or `None` if all node data are kept in memory.
+        """
+
+        self.resident_nodes: OrderedDict[int, None] = OrderedDict()
+        """
+        The IDs of nodes whose data are kept in memory while the diagram is
+        backed by a `store`, ordered from the least to the most recently used
+        (see `SuccessionDiagramConfiguration.resident_node_limit`).
+        """
+
         # Create an un-expanded root node.
         self._ensure_node(None, {})
 
     def __getstate__(self) -> SuccessionDiagramState:
+        # The state must contain the data of all nodes.
+        self._load_evicted_data()
         return {
             "network_rules": self.network.to_aeon(),
             "petri_net": self.petri_net,
@@ -149,17 +243,58 @@ class SuccessionDiagram:
             "dag": self.dag,
             "node_indices": self.node_indices,
             "config": self.config,
+            "modified_nodes": self.modified_nodes,
+            "synced_revision": self.synced_revision,
         }
 
     def __setstate__(self, state: SuccessionDiagramState):
         # In theory, the network should be cleaned-up at this point, but just in case...
         self.network = cleanup_network(BooleanNetwork.from_aeon(state["network_rules"]))
         self.symbolic = AsynchronousGraph(self.network)
+        self.space_encoder = SpaceEncoder.from_network(self.network)
         self.petri_net = state["petri_net"]
+        if isinstance(self.petri_net, nx.DiGraph):
+            # States created by older versions store Petri nets as `networkx` graphs.
+            self.petri_net = PetriNet.from_networkx(self.petri_net)
         self.nfvs = state["nfvs"]
         self.dag = state["dag"]
+        for node_id in self.dag.nodes():  # type: ignore
+            node = cast(dict[str, Any], self.dag.nodes[node_id])
+            if len(node) == 0:
+                # The data of store-backed diagrams are loaded on demand.
+                continue
+            # States created by older versions have no per-node budgets or limits.
+            node.setdefault("deferred", False)
+            node.setdefault("unresolved", False)
+            if isinstance(node.get("percolated_petri_net"), nx.DiGraph):
+                node["percolated_petri_net"] = PetriNet.from_networkx(
+                    node["percolated_petri_net"]
+                )
         self.node_indices = state["node_indices"]
-        self.config = state["config"]
+        # States created by older versions can miss some configuration options.
+        self.config = SuccessionDiagram.default_config()
+        self.config.update(state["config"])
+        self.store = None
+        self.resident_nodes = OrderedDict()
+        self.percolation_cache = PercolationCache(
+            self.symbolic,
+            self.config["percolation_cache_size"],
+            self.space_encoder,
+        )
+        self.nfvs_cache = FeedbackVertexSetCache(
+            self.config["nfvs_cache_size"], parity="negative"
+        )
+        # The nodes of a store-backed diagram (see `SuccessionDiagramStore.load`)
+        # can have no data at this point.
+        self.attractor_sets_lru = OrderedDict(
+            (node_id, None)
+            for node_id in self.dag.nodes()  # type: ignore
+            if self.dag.nodes[node_id].get("attractor_sets")  # type: ignore
+        )
+        self.instrumentation = Instrumentation()
+        # States created by older versions do not track the modified nodes.
+        self.modified_nodes = state.get("modified_nodes", set())
+        self.synced_revision = state.get("synced_revision")
 
     def __len__(self) -> int:
         """
@@ -177,6 +312,17 @@ class SuccessionDiagram:
             "attractor_candidates_limit": 100_000,
             "retained_set_optimization_threshold": 1_000,
             "minimum_simulation_budget": 1_000,
+            "simulation_walks": 1,
+            "symbolic_backward_pruning": False,
+            "percolation_cache_size": 10_000,
+            "nfvs_cache_size": 10_000,
+            "attractor_sets_cache_size": None,
+            "resident_node_limit": None,
+            "checkpoint_interval": 600,
+            "node_time_limit": None,
+            "node_memory_limit": None,
+            "symbolic_size_limit": None,
+            "symbolic_time_limit": None,
         }
 
     @staticmethod
@@ -227,7 +373,150 @@ class SuccessionDiagram:
         """
         return SuccessionDiagram(BooleanNetwork.from_file(path), config)
 
-    def expanded_attractor_candidates(self) -> dict[int, list[BooleanSpace]]:
+    def save(self, path: str, compress: bool = False):
+        """
+        Save this succession diagram into a compact binary file.
+
+        Compared to pickling, the file only stores the node spaces (as packed
+        bit vectors), edges (as integer arrays with deduplicated stable motifs)
+        and the per-node NFVS, attractor candidates and attractor seeds. The
+        percolated networks and Petri nets, as well as the symbolic attractor
+        sets, are recomputed on demand once the diagram is loaded. See
+        :mod:`biobalm._sd_serialization` for details of the format.
+
+        Use :meth:`load` to read the file.
+
+        Parameters
+        ----------
+        path : str
+            The output file path.
+        compress : bool
+            If `True`, the file is compressed using `zstd`. This requires the
+            `zstandard` package (a `RuntimeError` is raised otherwise).
+        """
+        data = dump_succession_diagram(self, compress)
+        with open(path, "wb") as file:
+            file.write(data)
+
+    @staticmethod
+    def load(
+        path: str, config: SuccessionDiagramConfiguration | None = None
+    ) -> SuccessionDiagram:
+        """
+        Load a succession diagram saved by :meth:`save`.
+
+        If `config` is not given, the saved configuration is used. Raises
+        `ValueError` if the file is not a (supported) succession diagram file.
+
+        Parameters
+        ----------
+        path : str
+            The input file path.
+        config : SuccessionDiagramConfiguration | None
+            An optional configuration of the loaded diagram.
+
+        Returns
+        -------
+        SuccessionDiagram
+            The loaded succession diagram.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        return load_succession_diagram(data, config)
+
+    @staticmethod
+    def resume_from(
+        path: str,
+        size_limit: int | None = None,
+        parallel: int | Executor | None = None,
+    ) -> tuple[SuccessionDiagram, bool]:
+        """
+        Continue an expansion that was checkpointed into the given file.
+
+        The checkpoint is created by one of the expansion methods that support
+        the `checkpoint` argument (:meth:`expand_bfs`, :meth:`expand_dfs`,
+        :meth:`expand_scc` and :meth:`expand_attractor_seeds`). The method loads
+        the saved succession diagram and continues the same expansion algorithm
+        (with the same arguments) from the saved state, checkpointing into the same
+        file. If the saved expansion already finished, the saved diagram is
+        returned immediately.
+
+        If the saved configuration sets a `resident_node_limit`, the node data
+        are not loaded and the returned diagram is backed by the checkpoint file
+        instead (see :meth:`attach_store`).
+
+        Parameters
+        ----------
+        path : str
+            The checkpoint file.
+        size_limit : int | None
+            If given, this replaces the `size_limit` of the original expansion.
+            Otherwise, the original `size_limit` is used.
+        parallel : int | Executor | None
+            The `parallel` argument of :meth:`expand_bfs` or :meth:`expand_dfs`
+            (not saved in the checkpoint).
+
+        Returns
+        -------
+        tuple[SuccessionDiagram, bool]
+            The succession diagram and the result of the expansion algorithm.
+        """
+        store = SuccessionDiagramStore(path, cache_size=0)
+        expansion = store.expansion()
+        if expansion is None:
+            store.close()
+            raise KeyError(f"No expansion checkpoint found in {path}.")
+        if store.configuration()["resident_node_limit"] is None:
+            with store:
+                sd = store.load()
+        else:
+            # The resumed diagram stays backed by the checkpoint.
+            sd = store.load(attach=True)
+        if expansion["result"] is not None:
+            return (sd, expansion["result"])
+
+        algorithm = expansion["algorithm"]
+        arguments = expansion["arguments"]
+        state = expansion["state"]
+        if size_limit is None:
+            size_limit = arguments.get("size_limit")
+
+        if algorithm == "bfs":
+            result = expand_bfs(
+                sd,
+                arguments["node_id"],
+                arguments["bfs_level_limit"],
+                size_limit,
+                parallel,
+                path,
+                state,
+            )
+        elif algorithm == "dfs":
+            result = expand_dfs(
+                sd,
+                arguments["node_id"],
+                arguments["dfs_stack_limit"],
+                size_limit,
+                parallel,
+                path,
+                state,
+            )
+        elif algorithm == "scc":
+            result = expand_source_SCCs(
+                sd, arguments["check_maa"], checkpoint=path, resume=state
+            )
+        elif algorithm == "attractor_seeds":
+            result = expand_attractor_seeds(sd, size_limit, path, state)
+        else:
+            raise ValueError(f"Unknown expansion algorithm: {algorithm}")
+
+        return (sd, result)
+
+    def expanded_attractor_candidates(
+        self,
+        parallel: int | None = None,
+        worker_memory_limit: int | None = None,
+    ) -> dict[int, list[BooleanSpace]]:
         """
         Attractor candidates for each expanded node. The candidate list is
         computed for nodes where it is not known yet.
@@ -241,6 +530,9 @@ class SuccessionDiagram:
         be a complete accounting of attractors, since any node that isn't expanded
         is not included in the result.*
 
+        Nodes marked as `deferred` are skipped (see `NodeData.deferred`). This
+        includes nodes whose computation exceeds the per-node budget now.
+
         See also:
          - :meth:`expanded_attractor_seeds<SuccessionDiagram.expanded_attractor_seeds>`
          - :meth:`expanded_attractor_seeds<SuccessionDiagram.expanded_attractor_sets>`
@@ -248,6 +540,19 @@ class SuccessionDiagram:
          - :meth:`expanded_attractor_seeds<SuccessionDiagram.node_attractor_seeds>`
          - :meth:`expanded_attractor_seeds<SuccessionDiagram.node_attractor_sets>`
 
+        Parameters
+        ----------
+        parallel: int | None
+            If given, the attractor candidates of individual nodes are computed concurrently
+            using a pool of `parallel` worker processes. The results are stored
+            in the succession diagram in the same way as if they were computed
+            serially.
+        worker_memory_limit: int | None
+            Limit (in bytes) on the address space of each worker process (only
+            used together with `parallel`, and only supported on Unix systems). If
+            some node exceeds this limit, a `RuntimeError` is raised once the
+            remaining nodes are processed.
+
         Returns
         -------
         dict[int,list[BooleanSpace]]
@@ -272,16 +577,32 @@ class SuccessionDiagram:
         1: {'A': 0, 'B': 0, 'C': 1}
         2: {'A': 1, 'B': 1, 'C': 1}
         """
+        if parallel is not None:
+            compute_attractors_parallel(
+                self, self.expanded_ids(), "candidates", parallel, worker_memory_limit
+            )
+
         res: dict[int, list[BooleanSpace]] = {}
         for id in self.expanded_ids():
-            atts = self.node_attractor_candidates(id, compute=True)
+            if self.node_data(id)["deferred"]:
+                continue
+            try:
+                atts = self.node_attractor_candidates(id, compute=True)
+            except (TimeoutError, MemoryError):
+                if not self.node_data(id)["deferred"]:
+                    raise
+                continue
             if not atts:  # no attractors for this node
                 continue
             res[id] = atts
 
         return res
 
-    def expanded_attractor_seeds(self) -> dict[int, list[BooleanSpace]]:
+    def expanded_attractor_seeds(
+        self,
+        parallel: int | None = None,
+        worker_memory_limit: int | None = None,
+    ) -> dict[int, list[BooleanSpace]]:
         """
         Attractor seeds for each expanded node. The seed list is
         computed for nodes where it is not known yet.
@@ -293,6 +614,12 @@ class SuccessionDiagram:
         be a complete accounting of attractors, since any node that isn't expanded
         is not included in the result.*
 
+        Nodes marked as `deferred` are skipped (see `NodeData.deferred`). This
+        includes nodes whose computation exceeds the per-node budget now.
+        Nodes marked as `unresolved` without known seeds are skipped as well
+        (see `NodeData.unresolved`); their remaining attractor candidates are
+        available through :meth:`node_attractor_candidates`.
+
         See also:
          - :meth:`expanded_attractor_seeds<SuccessionDiagram.expanded_attractor_candidates>`
          - :meth:`expanded_attractor_seeds<SuccessionDiagram.expanded_attractor_sets>`
@@ -300,6 +627,19 @@ class SuccessionDiagram:
          - :meth:`expanded_attractor_seeds<SuccessionDiagram.node_attractor_seeds>`
          - :meth:`expanded_attractor_seeds<SuccessionDiagram.node_attractor_sets>`
 
+        Parameters
+        ----------
+        parallel: int | None
+            If given, the attractor seeds of individual nodes are computed concurrently
+            using a pool of `parallel` worker processes. The results are stored
+            in the succession diagram in the same way as if they were computed
+            serially.
+        worker_memory_limit: int | None
+            Limit (in bytes) on the address space of each worker process (only
+            used together with `parallel`, and only supported on Unix systems). If
+            some node exceeds this limit, a `RuntimeError` is raised once the
+            remaining nodes are processed.
+
         Returns
         -------
         dict[int,list[BooleanSpace]]
@@ -328,16 +668,32 @@ class SuccessionDiagram:
         1: {'A': 0, 'B': 0, 'C': 1}
         2: {'A': 1, 'B': 1, 'C': 1}
         """
+        if parallel is not None:
+            compute_attractors_parallel(
+                self, self.expanded_ids(), "seeds", parallel, worker_memory_limit
+            )
+
         res: dict[int, list[BooleanSpace]] = {}
         for id in self.expanded_ids():
-            atts = self.node_attractor_seeds(id, compute=True)
+            if self._is_skipped(id, "attractor_seeds"):
+                continue
+            try:
+                atts = self.node_attractor_seeds(id, compute=True)
+            except (TimeoutError, MemoryError, RuntimeError):
+                if not self._is_skipped(id, "attractor_seeds"):
+                    raise
+                continue
             if not atts:  # no attractors for this node
                 continue
             res[id] = atts
 
         return res
 
-    def expanded_attractor_sets(self) -> dict[int, list[VertexSet]]:
+    def expanded_attractor_sets(
+        self,
+        parallel: int | None = None,
+        worker_memory_limit: int | None = None,
+    ) -> dict[int, list[VertexSet]]:
         """
         Attractor sets for each expanded node. The sets are
         computed for nodes where they are not known yet.
@@ -352,6 +708,11 @@ class SuccessionDiagram:
         be a complete accounting of attractors, since any node that isn't expanded
         is not included in the result.*
 
+        Nodes marked as `deferred` are skipped (see `NodeData.deferred`). This
+        includes nodes whose computation exceeds the per-node budget now.
+        Nodes marked as `unresolved` without known sets are skipped as well
+        (see `NodeData.unresolved`).
+
         See also:
          - :meth:`expanded_attractor_seeds<SuccessionDiagram.expanded_attractor_candidates>`
          - :meth:`expanded_attractor_seeds<SuccessionDiagram.expanded_attractor_seeds>`
@@ -359,6 +720,19 @@ class SuccessionDiagram:
          - :meth:`expanded_attractor_seeds<SuccessionDiagram.node_attractor_seeds>`
          - :meth:`expanded_attractor_seeds<SuccessionDiagram.node_attractor_sets>`
 
+        Parameters
+        ----------
+        parallel: int | None
+            If given, the attractor sets of individual nodes are computed concurrently
+            using a pool of `parallel` worker processes. The results are stored
+            in the succession diagram in the same way as if they were computed
+            serially.
+        worker_memory_limit: int | None
+            Limit (in bytes) on the address space of each worker process (only
+            used together with `parallel`, and only supported on Unix systems). If
+            some node exceeds this limit, a `RuntimeError` is raised once the
+            remaining nodes are processed.
+
         Returns
         -------
         dict[int,list[biodivine_aeon.VertexSet]]
@@ -383,9 +757,21 @@ class SuccessionDiagram:
         1: VertexSet(cardinality=1, symbolic_size=5)
         2: VertexSet(cardinality=1, symbolic_size=5)
         """
+        if parallel is not None:
+            compute_attractors_parallel(
+                self, self.expanded_ids(), "sets", parallel, worker_memory_limit
+            )
+
         res: dict[int, list[VertexSet]] = {}
         for id in self.expanded_ids():
-            atts = self.node_attractor_sets(id, compute=True)
+            if self._is_skipped(id, "attractor_sets"):
+                continue
+            try:
+                atts = self.node_attractor_sets(id, compute=True)
+            except (TimeoutError, MemoryError, RuntimeError):
+                if not self._is_skipped(id, "attractor_sets"):
+                    raise
+                continue
             if not atts:  # no attractors for this node
                 continue
             res[id] = atts
@@ -405,6 +791,7 @@ class SuccessionDiagram:
             "Attractors in diagram:\n\n"
         )
         for node in self.node_ids():
+            self._enforce_resident_limit()
             try:
                 attrs = self.node_attractor_seeds(node, compute=False)
             except KeyError:
@@ -447,6 +834,7 @@ class SuccessionDiagram:
         """
         d = 0
         for node in cast(set[int], self.dag.nodes()):
+            self._enforce_resident_limit()
             d = max(d, self.node_data(int(node))["depth"])
         return d
 
@@ -462,6 +850,7 @@ class SuccessionDiagram:
         Iterator over all node IDs that are currently *not* expanded.
         """
         for i in range(len(self)):
+            self._enforce_resident_limit()
             if not self.node_data(i)["expanded"]:
                 yield i
 
@@ -470,9 +859,32 @@ class SuccessionDiagram:
         Iterator over all node IDs that are currently expanded.
         """
         for i in range(len(self)):
+            self._enforce_resident_limit()
             if self.node_data(i)["expanded"]:
                 yield i
 
+    def deferred_ids(self) -> Iterator[int]:
+        """
+        Iterator over all node IDs that are currently marked as deferred, i.e.
+        some computation on these nodes exceeded the per-node budget (see
+        `SuccessionDiagramConfiguration.node_time_limit`).
+        """
+        for i in range(len(self)):
+            self._enforce_resident_limit()
+            if self.node_data(i)["deferred"]:
+                yield i
+
+    def unresolved_ids(self) -> Iterator[int]:
+        """
+        Iterator over all node IDs that are currently marked as unresolved, i.e.
+        the symbolic attractor detection in these nodes exceeded its limits (see
+        `SuccessionDiagramConfiguration.symbolic_size_limit`).
+        """
+        for i in range(len(self)):
+            self._enforce_resident_limit()
+            if self.node_data(i)["unresolved"]:
+                yield i
+
     def minimal_trap_spaces(self) -> list[int]:
         """
         List of node IDs that represent the minimal trap spaces within this
@@ -499,13 +911,13 @@ class SuccessionDiagram:
             if no such node exists in this succession diagram.
         """
         try:
-            key = space_unique_key(node_space, self.network)  # throws IndexError
+            key = self.space_encoder.space_key(node_space)  # throws IndexError
             if key in self.node_indices:
                 return self.node_indices[key]
             else:
                 return None
         except IndexError:
-            # If `space_unique_key` finds a variable that does not exist in this
+            # If `space_key` finds a variable that does not exist in this
             # `SuccessionDiagram`, it throws an `IndexError`. This can happen
             # for example if we are comparing two succession diagrams based on
             # completely different networks.
@@ -610,9 +1022,107 @@ class SuccessionDiagram:
             The data associated with the provided `node_id`. Note that at
             runtime, this object is an untyped dictionary.
         """
-        return cast(NodeData, self.dag.nodes[node_id])
+        data = cast(dict[str, Any], self.dag.nodes[node_id])
+        if self.store is not None:
+            if len(data) == 0:
+                # The data were evicted (see `evict_node_data`).
+                data.update(self.store.node_data(node_id))
+            self.resident_nodes[node_id] = None
+            self.resident_nodes.move_to_end(node_id)
+        return cast(NodeData, data)
+
+    def attach_store(self, path: str):
+        """
+        Back the node data of this diagram by a
+        :class:`SuccessionDiagramStore<biobalm.succession_diagram_store.SuccessionDiagramStore>`
+        in the given file.
+
+        The diagram is written into the store (which must be either empty, or
+        contain a prefix of this diagram, see
+        :meth:`SuccessionDiagramStore.write<biobalm.succession_diagram_store.SuccessionDiagramStore.write>`).
+        Afterwards, the `NodeData` and stable motifs of the least recently used
+        nodes are removed from memory once the diagram exceeds the
+        `SuccessionDiagramConfiguration.resident_node_limit`. The removed data
+        are loaded from the store on demand, only the structure of the diagram
+        (i.e. `SuccessionDiagram.dag` without node data and
+        `SuccessionDiagram.node_indices`) is always kept in memory.
+
+        The limit is checked between the individual nodes processed by
+        the expansion methods, the `expanded_*` methods, the node ID iterators
+        (e.g. :meth:`expanded_ids`), and the other methods that process all
+        nodes. It is not checked by :meth:`node_data` itself, hence code that
+        reads the data of many nodes through :meth:`node_ids` should call
+        :meth:`evict_node_data` to release them.
+
+        The data that are not stored (percolated networks and Petri nets,
+        attractor sets) are recomputed when needed. An expansion of a
+        store-backed diagram can only be checkpointed into the backing store.
 
-    def reclaim_node_data(self):
+        Parameters
+        ----------
+        path : str
+            The path of the database file.
+        """
+        if self.store is not None:
+            raise RuntimeError(f"The diagram is already backed by {self.store}.")
+        store = SuccessionDiagramStore(path, cache_size=0)
+        try:
+            store.write(self)
+        except ValueError:
+            store.close()
+            raise
+        self.store = store
+        self.resident_nodes = OrderedDict(
+            (node_id, None) for node_id in self.node_ids()
+        )
+
+    def detach_store(self):
+        """
+        Load all node data evicted into the backing store (see
+        :meth:`attach_store`) back into memory and close the store.
+        """
+        if self.store is None:
+            return
+        self._load_evicted_data()
+        self.store.close()
+        self.store = None
+        self.resident_nodes.clear()
+
+    def evict_node_data(self, keep: int = 0):
+        """
+        Write the diagram into its backing store (see :meth:`attach_store`) and
+        remove the data of all but the `keep` most recently used nodes from
+        memory.
+
+        Note that `NodeData` dictionaries obtained before the eviction become
+        detached copies, i.e. changes made to them are lost.
+
+        Parameters
+        ----------
+        keep : int
+            The number of the most recently used nodes that keep their data.
+        """
+        if self.store is None:
+            raise RuntimeError("The diagram is not backed by a store.")
+        if len(self.resident_nodes) <= keep:
+            return
+        if len(self.modified_nodes) > 0:
+            self.store.write(self)
+        evicted = 0
+        while len(self.resident_nodes) > keep:
+            (node_id, _) = self.resident_nodes.popitem(last=False)
+            # The data are replaced (not cleared), such that `NodeData` obtained
+            # earlier stay readable.
+            self.dag._node[node_id] = {}  # type: ignore
+            for child_id in self.dag.successors(node_id):  # type: ignore
+                self.dag.edges[node_id, child_id].pop("motif", None)  # type: ignore
+            self.attractor_sets_lru.pop(node_id, None)
+            evicted += 1
+        self.instrumentation.count("evicted_nodes", evicted)
+        if self.config["debug"]:
+            print(f"Evicted data of {evicted} nodes.")
+
+    def reclaim_node_data(self, attractor_sets: bool = False):
         """
         Removes non-essential data from the `NodeData` dictionary of each node.
 
@@ -625,9 +1135,18 @@ class SuccessionDiagram:
         and the `percolated_nfvs`. Furthermore, if `attractor_seeds` are known,
         it erases the `attractor_candidates`, since seeds can be used for the
         same tasks.
+
+        Parameters
+        ----------
+        attractor_sets: bool
+            If `True`, the (non-empty) `attractor_sets` are erased as well. These
+            are recomputed from the `attractor_seeds` when needed.
         """
 
         for node_id in self.node_ids():
+            if len(self.dag.nodes[node_id]) == 0:  # type: ignore
+                # Evicted nodes (see `evict_node_data`) keep no data in memory.
+                continue
             data = self.node_data(node_id)
             data["percolated_network"] = None
             data["percolated_petri_net"] = None
@@ -635,6 +1154,11 @@ class SuccessionDiagram:
             if data["attractor_seeds"] is not None:
                 data["attractor_candidates"] = None
 
+        if attractor_sets:
+            for node_id in self.attractor_sets_lru:
+                self.node_data(node_id)["attractor_sets"] = None
+            self.attractor_sets_lru.clear()
+
     def node_is_minimal(self, node_id: int) -> bool:
         """
         True if the node represents a minimal trap space.
@@ -651,7 +1175,7 @@ class SuccessionDiagram:
             minimal trap space.
         """
         is_leaf: bool = self.dag.out_degree(node_id) == 0  # type: ignore
-        return is_leaf and self.dag.nodes[node_id]["expanded"]  # type: ignore
+        return is_leaf and self.node_data(node_id)["expanded"]
 
     def node_successors(self, node_id: int, compute: bool = False) -> list[int]:
         """
@@ -720,6 +1244,11 @@ class SuccessionDiagram:
         unexpanded nodes, if the nodes intersect), and (b) this data is erased if the
         node is later expanded.
 
+        If the computation exceeds the per-node budget (see
+        `SuccessionDiagramConfiguration.node_time_limit` and `node_memory_limit`),
+        the node is marked as deferred and `TimeoutError` (or `MemoryError`)
+        is raised.
+
         Parameters
         ----------
         node_id: int
@@ -755,14 +1284,21 @@ class SuccessionDiagram:
             raise KeyError(f"Attractor candidates not computed for node {node_id}.")
 
         if candidates is None:
-            candidates = compute_attractor_candidates(
-                self,
-                node_id,
-                greedy_asp_minification,
-                simulation_minification,
-                pint_minification,
-            )
+            with (
+                self._node_budget(node_id) as budget,
+                self.instrumentation.timer("attractor_candidates", node_id),
+            ):
+                candidates = compute_attractor_candidates(
+                    self,
+                    node_id,
+                    greedy_asp_minification,
+                    simulation_minification,
+                    pint_minification,
+                    budget,
+                )
+            self.instrumentation.count("candidate_states", len(candidates))
             node["attractor_candidates"] = candidates
+            self.modified_nodes.add(node_id)
 
             # If the computed candidates are actually valid as seeds, just
             # propagate the value so that it doesn't need to be computed later.
@@ -791,6 +1327,12 @@ class SuccessionDiagram:
         Note that the same considerations regarding attractors in unexpanded
         nodes apply as for :meth:`node_attractor_candidates`.
 
+        If the symbolic attractor detection exceeds its limits (see
+        `SuccessionDiagramConfiguration.symbolic_size_limit` and
+        `symbolic_time_limit`), the node is marked as unresolved, its attractor
+        candidates are replaced by the candidates that were not disproved yet,
+        and `RuntimeError` is raised.
+
         Parameters
         ----------
         node_id: int
@@ -812,6 +1354,7 @@ class SuccessionDiagram:
 
         if seeds is None:
             candidates = self.node_attractor_candidates(node_id, compute=True)
+            self.modified_nodes.add(node_id)
             # Typically, this should be done when computing the candidates, but just in case
             # something illegal happended... if we can show that the current candidate set
             # is optimal, we just keep it and don't compute the attractors symbolically.
@@ -824,14 +1367,28 @@ class SuccessionDiagram:
                 node["attractor_seeds"] = candidates
                 seeds = candidates
             else:
-                result = compute_attractors_symbolic(
-                    self, node_id, candidate_states=candidates, seeds_only=True
-                )
+                with (
+                    self._node_budget(node_id) as budget,
+                    self.instrumentation.timer("symbolic_reachability", node_id),
+                ):
+                    result = compute_attractors_symbolic(
+                        self,
+                        node_id,
+                        candidate_states=candidates,
+                        seeds_only=True,
+                        budget=budget,
+                        backward_pruning=self.config["symbolic_backward_pruning"],
+                        size_limit=self.config["symbolic_size_limit"],
+                        time_limit=self.config["symbolic_time_limit"],
+                    )
+                if result[2] is not None:
+                    raise self._mark_unresolved(node_id, result[2])
+                node["unresolved"] = False
                 node["attractor_seeds"] = result[0]
-                # At this point, attractor_sets could be `None`, but that
-                # is valid, as long as we actually compute them later when
-                # they are needed.
-                node["attractor_sets"] = result[1]
+                # The seeds-only detection never computes attractor_sets,
+                # but that is valid, as long as we actually compute them
+                # later when they are needed.
+                assert result[1] is None
                 seeds = result[0]
 
             # Release memory once attractor seeds are known. We might need these
@@ -858,6 +1415,16 @@ class SuccessionDiagram:
         Note that the same considerations regarding attractors in unexpanded
         nodes apply as for :meth:`node_attractor_candidates`.
 
+        If the symbolic attractor detection exceeds its limits, the node is
+        marked as unresolved and `RuntimeError` is raised (see
+        :meth:`node_attractor_seeds`).
+
+        The attractor sets of the least recently used nodes can be erased to
+        save memory (see `SuccessionDiagramConfiguration.attractor_sets_cache_size`).
+        In such case, they are recomputed from the attractor seeds. In general,
+        if the attractor seeds of the node are known, the missing attractor
+        sets are always recomputed, regardless of the `compute` flag.
+
         Parameters
         ----------
         node_id: int
@@ -874,22 +1441,71 @@ class SuccessionDiagram:
 
         sets = node["attractor_sets"]
 
-        if sets is None and not compute:
+        if sets is None and not compute and node["attractor_seeds"] is None:
             raise KeyError(f"Attractor sets not computed for node {node_id}.")
 
         if sets is None:
             seeds = self.node_attractor_seeds(node_id, compute=True)
-            result: tuple[list[BooleanSpace], list[VertexSet] | None] = ([], [])
+            result: tuple[
+                list[BooleanSpace], list[VertexSet] | None, list[BooleanSpace] | None
+            ] = ([], [], None)
             if len(seeds) > 0:
-                result = compute_attractors_symbolic(
-                    self, node_id, candidate_states=seeds
-                )
+                with (
+                    self._node_budget(node_id) as budget,
+                    self.instrumentation.timer("symbolic_reachability", node_id),
+                ):
+                    result = compute_attractors_symbolic(
+                        self,
+                        node_id,
+                        candidate_states=seeds,
+                        budget=budget,
+                        size_limit=self.config["symbolic_size_limit"],
+                        time_limit=self.config["symbolic_time_limit"],
+                    )
+            if result[2] is not None:
+                # The seeds are already known, hence the candidates are kept.
+                raise self._mark_unresolved(node_id, None)
+            node["unresolved"] = False
+            self.modified_nodes.add(node_id)
             assert result[1] is not None
-            node["attractor_sets"] = result[1]
+            self._store_attractor_sets(node_id, result[1])
             sets = result[1]
+        elif node_id in self.attractor_sets_lru:
+            self.attractor_sets_lru.move_to_end(node_id)
 
         return sets
 
+    def node_attractor_summaries(
+        self,
+        node_id: int,
+        compute: bool = False,
+    ) -> list[AttractorSummary]:
+        """
+        Return the list of attractor summaries for the given `node_id`, i.e.
+        the fixed and oscillating variables of each attractor and the number
+        of its states (see :class:`AttractorSummary<biobalm.types.AttractorSummary>`).
+
+        The summaries are computed from the attractor sets (see
+        :meth:`node_attractor_sets`), hence the same `compute` flag applies.
+        The summaries are not stored, and the attractor sets they were computed
+        from can be evicted from memory (see
+        `SuccessionDiagramConfiguration.attractor_sets_cache_size`).
+
+        Parameters
+        ----------
+        node_id: int
+            The ID of the node.
+        compute: bool
+            Whether to compute the attractor sets if they are not already known.
+
+        Returns
+        -------
+        list[AttractorSummary]
+            The list of attractor summaries, in the order of the attractor sets.
+        """
+        sets = self.node_attractor_sets(node_id, compute)
+        return [attractor_summary(self.symbolic, s) for s in sets]
+
     def node_percolated_nfvs(self, node_id: int, compute: bool = False) -> list[str]:
         """
         Approximate minimum negative feedback vertex set on the Boolean network
@@ -899,6 +1515,11 @@ class SuccessionDiagram:
         data if unknown, or throws an exception, depending on the `compute`
         flag.
 
+        If the NFVS of some parent node is known, the result is computed
+        incrementally from the parent NFVS. Results are also shared between
+        nodes with the same percolated regulatory graph (see
+        `SuccessionDiagram.nfvs_cache`).
+
         See :func:`biobalm.interaction_graph_utils.feedback_vertex_set` for
         further details.
 
@@ -925,13 +1546,29 @@ class SuccessionDiagram:
         if node["percolated_nfvs"] is None:
             percolated_network = self.node_percolated_network(node_id, compute)
             percolated_size = percolated_network.variable_count()
-            if percolated_size < self.config["nfvs_size_threshold"]:
-                # Computing the *negative* variant of the FVS is surprisingly costly.
-                # Hence it mostly makes sense for the smaller networks only.
-                nfvs = feedback_vertex_set(percolated_network, parity="negative")
-            else:
-                nfvs = feedback_vertex_set(percolated_network)
+            # The percolated network of a child node is a sub-network of its
+            # parent, hence the parent NFVS (restricted to the child) is a good
+            # starting point that typically needs very few repairs.
+            parent_nfvs: list[str] | None = None
+            for parent_id in self.dag.predecessors(node_id):  # type: ignore
+                parent_nfvs = self.node_data(parent_id)["percolated_nfvs"]
+                if parent_nfvs is not None:
+                    break
+            with self.instrumentation.timer("nfvs", node_id):
+                if (
+                    parent_nfvs is None
+                    and percolated_size >= self.config["nfvs_size_threshold"]
+                ):
+                    # Computing the *negative* variant of the FVS from scratch is
+                    # surprisingly costly. Hence it mostly makes sense for the smaller
+                    # networks only.
+                    nfvs = feedback_vertex_set(percolated_network)
+                else:
+                    nfvs = self.nfvs_cache.feedback_vertex_set(
+                        percolated_network, parent_nfvs
+                    )
             node["percolated_nfvs"] = nfvs
+            self.modified_nodes.add(node_id)
         else:
             nfvs = node["percolated_nfvs"]
 
@@ -976,9 +1613,10 @@ class SuccessionDiagram:
             raise KeyError(f"Percolated network not computed for node {node_id}.")
 
         if network is None:
-            network = percolate_network(
-                self.network, node_space, self.symbolic, remove_constants=True
-            )
+            with self.instrumentation.timer("network_percolation", node_id):
+                network = percolate_network(
+                    self.network, node_space, self.symbolic, remove_constants=True
+                )
             if self.config["debug"]:
                 print(
                     f"[{node_id}] Computed percolated network with {network.variable_count()} variables (vs {self.network.variable_count()})."
@@ -992,7 +1630,7 @@ class SuccessionDiagram:
         node_id: int,
         compute: bool = False,
         parent_id: int | None = None,
-    ) -> nx.DiGraph:
+    ) -> PetriNet:
         """
         The Petri net representation of the Boolean network percolated to the
         node's sub-space (with constant variables removed).
@@ -1015,8 +1653,8 @@ class SuccessionDiagram:
 
         Returns
         -------
-        networkx.DiGraph
-            The percolated Boolean network.
+        PetriNet
+            The percolated Petri net.
         """
 
         assert node_id in self.dag.nodes
@@ -1028,7 +1666,7 @@ class SuccessionDiagram:
 
         if len(node_space) == self.network.variable_count():
             # If fixed point, the result is always empty.
-            return nx.DiGraph()
+            return PetriNet([])
 
         if percolated_pn is None and not compute:
             raise KeyError(f"Percolated network not computed for node {node_id}.")
@@ -1042,11 +1680,12 @@ class SuccessionDiagram:
                     base_pn = parent_pn
                     percolate_space = node_space
 
-            percolated_pn = restrict_petrinet_to_subspace(base_pn, percolate_space)
+            with self.instrumentation.timer("petri_net_restriction", node_id):
+                percolated_pn = restrict_petrinet_to_subspace(base_pn, percolate_space)
 
             if self.config["debug"]:
                 print(
-                    f"[{node_id}] Generated Petri net restriction with {len(percolated_pn.nodes)} nodes and {len(percolated_pn.edges)} edges."
+                    f"[{node_id}] Generated Petri net restriction with {percolated_pn.place_count()} places and {percolated_pn.transition_count()} transitions."
                 )
 
             node["percolated_petri_net"] = percolated_pn
@@ -1082,17 +1721,25 @@ class SuccessionDiagram:
             The stable motif (maximal trap space) represented by the edge.
         """
 
+        edge = cast(dict[str, Any], self.dag.edges[parent_id, child_id])
+        if "motif" in edge:
+            motif = cast(BooleanSpace, edge["motif"])
+        else:
+            # The motif was evicted (see `evict_node_data`).
+            assert self.store is not None
+            motif = self.store.edge_stable_motif(parent_id, child_id)
+
         if reduced:
             return cast(
                 BooleanSpace,
                 {
                     k: v
-                    for k, v in self.dag.edges[parent_id, child_id]["motif"].items()  # type: ignore
+                    for k, v in motif.items()
                     if k not in self.node_data(parent_id)["space"]
                 },
             )
         else:
-            return cast(BooleanSpace, self.dag.edges[parent_id, child_id]["motif"])
+            return motif
 
     def component_subdiagram(
         self,
@@ -1175,19 +1822,45 @@ class SuccessionDiagram:
         for component_variables in source_scc_list:
             yield self.component_subdiagram(component_variables, node_id)
 
-    def build(self):
+    def build(self, parallel: int | None = None):
         """
         Expand the succession diagram and search for attractors using default methods.
+
+        If `parallel` is given, the attractor search in individual nodes is performed
+        using a pool of `parallel` worker processes (see also :meth:`expanded_attractor_seeds`).
+
+        Nodes that exceed the per-node budget are marked as deferred and skipped
+        (see `SuccessionDiagramConfiguration.node_time_limit`). Similarly, nodes
+        that exceed the symbolic reachability limits are marked as unresolved
+        (see `SuccessionDiagramConfiguration.symbolic_size_limit`).
         """
         self.expand_scc()
+        if parallel is not None:
+            compute_attractors_parallel(self, self.node_ids(), "seeds", parallel)
         for node_id in self.node_ids():
-            self.node_attractor_seeds(node_id, compute=True)
+            self._enforce_resident_limit()
+            if self._is_skipped(node_id, "attractor_seeds"):
+                continue
+            try:
+                self.node_attractor_seeds(node_id, compute=True)
+            except (TimeoutError, MemoryError, RuntimeError):
+                if not self._is_skipped(node_id, "attractor_seeds"):
+                    raise
 
-    def expand_scc(self, find_motif_avoidant_attractors: bool = True) -> bool:
+    def expand_scc(
+        self,
+        find_motif_avoidant_attractors: bool = True,
+        checkpoint: str | None = None,
+    ) -> bool:
         """
         Expand the succession diagram using the source SCC method.
+
+        If `checkpoint` is given, the succession diagram and the state of the
+        expansion are periodically saved into this file (see :meth:`resume_from`).
         """
-        return expand_source_SCCs(self, check_maa=find_motif_avoidant_attractors)
+        return expand_source_SCCs(
+            self, check_maa=find_motif_avoidant_attractors, checkpoint=checkpoint
+        )
 
     def expand_block(self, find_motif_avoidant_attractors: bool = True) -> bool:
         """
@@ -1206,6 +1879,8 @@ class SuccessionDiagram:
         node_id: int | None = None,
         bfs_level_limit: int | None = None,
         size_limit: int | None = None,
+        parallel: int | Executor | None = None,
+        checkpoint: str | None = None,
     ) -> bool:
         """
         Explore the succession diagram in a BFS manner.
@@ -1233,14 +1908,32 @@ class SuccessionDiagram:
         Also note that the `size_limit` is only a soft limit: for each node, we
         always have to create all child nodes when expanding it. Hence the
         procedure can only check the condition in between expanding new nodes.
-        """
-        return expand_bfs(self, node_id, bfs_level_limit, size_limit)
+
+        If `parallel` is given, the stable motifs of all nodes on the same BFS
+        level are computed concurrently, either using a new process pool with
+        `parallel` workers, or using the given `concurrent.futures.Executor`.
+        The child nodes are still created in the same order as in the serial
+        case, meaning the resulting succession diagram (including node IDs) is
+        the same regardless of the number of workers.
+
+        If `checkpoint` is given, the succession diagram and the state of the
+        search are periodically saved into this file (see
+        `SuccessionDiagramConfiguration.checkpoint_interval`), as well as when
+        the search is stopped by the `size_limit` or finished. The search can be
+        then continued using :meth:`resume_from`. Any data that is already in
+        the `checkpoint` file is removed when the search starts.
+        """
+        return expand_bfs(
+            self, node_id, bfs_level_limit, size_limit, parallel, checkpoint
+        )
 
     def expand_dfs(
         self,
         node_id: int | None = None,
         dfs_stack_limit: int | None = None,
         size_limit: int | None = None,
+        parallel: int | Executor | None = None,
+        checkpoint: str | None = None,
     ) -> bool:
         """
         Similar to `expand_bfs`, but uses DFS instead of BFS.
@@ -1250,8 +1943,18 @@ class SuccessionDiagram:
         than this limit are left unexpanded. Note that this stack size is
         technically *some* form of distance from the initial node, but not
         necessarily the minimal distance.
+
+        If `parallel` is given, the stable motifs of each newly discovered
+        node are computed ahead of time using a process pool (see also
+        `expand_bfs`). The resulting succession diagram is the same as in the
+        serial case, but the workers may perform some unnecessary work if the
+        exploration is cut short by one of the limits.
+
+        The `checkpoint` works the same as in `expand_bfs`.
         """
-        return expand_dfs(self, node_id, dfs_stack_limit, size_limit)
+        return expand_dfs(
+            self, node_id, dfs_stack_limit, size_limit, parallel, checkpoint
+        )
 
     def expand_minimal_spaces(self, size_limit: int | None = None) -> bool:
         """
@@ -1271,7 +1974,9 @@ class SuccessionDiagram:
         """
         return expand_minimal_spaces(self, size_limit)
 
-    def expand_attractor_seeds(self, size_limit: int | None = None) -> bool:
+    def expand_attractor_seeds(
+        self, size_limit: int | None = None, checkpoint: str | None = None
+    ) -> bool:
         """
         Expands the succession diagram such that for every asynchronous
         attractor, there is at least one expanded trap space which is the
@@ -1283,8 +1988,10 @@ class SuccessionDiagram:
         expanded nodes. Note that this method does not perform exact attractor
         identification. It is possible that some nodes are expanded spuriously
         and the succession diagram is thus larger than necessary.
+
+        The `checkpoint` works the same as in `expand_bfs`.
         """
-        return expand_attractor_seeds(self, size_limit)
+        return expand_attractor_seeds(self, size_limit, checkpoint)
 
     def expand_to_target(
         self, target: BooleanSpace, size_limit: int | None = None
@@ -1308,46 +2015,31 @@ class SuccessionDiagram:
         Note that the depth can only increase.
         """
         assert self.dag.edges[parent_id, node_id] is not None
-        parent_depth = cast(int, self.dag.nodes[parent_id]["depth"])
-        current_depth = cast(int, self.dag.nodes[node_id]["depth"])
-        self.dag.nodes[node_id]["depth"] = max(current_depth, parent_depth + 1)
+        parent_depth = self.node_data(parent_id)["depth"]
+        current_depth = self.node_data(node_id)["depth"]
+        if parent_depth + 1 > current_depth:
+            self.node_data(node_id)["depth"] = parent_depth + 1
+            self.modified_nodes.add(node_id)
 
-    def _expand_one_node(self, node_id: int):
+    def _stable_motif_query(self, node_id: int) -> dict[str, Any] | None:
         """
-        An internal method that expands a single node of the succession diagram.
-
-        This entails computing the maximal trap spaces within the node (stable
-        motifs) and creating a node for the result (if it does not exist yet).
+        An internal method that prepares the arguments of the `trappist` call
+        which computes the stable motifs of the given node.
 
-        If the node is already expanded, the method does nothing.
+        Returns `None` if the node is already expanded or deferred, or if it is
+        a fixed-point (in which case no solver call is necessary).
 
-        If there are already some attractor data for this node (stub nodes can
-        have associated attractor data), this data is erased.
+        The result only contains picklable values, so the query can be also
+        evaluated in a different process (see `_sd_algorithms.parallel_expansion`).
         """
-        node = cast(dict[str, Any], self.dag.nodes[node_id])
-        if node["expanded"]:
-            return
-
-        # If the node had any attractor data computed as unexpanded, these are
-        # no longer valid and need to be erased.
-        node["attractor_seeds"] = None
-        node["attractor_candidates"] = None
-        node["attractor_sets"] = None
+        node = self.node_data(node_id)
+        if node["expanded"] or node["deferred"]:
+            return None
 
         current_space = node["space"]
 
-        if self.config["debug"]:
-            print(
-                f"[{node_id}] Expanding: {len(self.node_data(node_id)['space'])} fixed vars."
-            )
-
         if len(current_space) == self.network.variable_count():
-            # This node is a fixed-point. Trappist would just
-            # return this fixed-point again. No need to continue.
-            if self.config["debug"]:
-                print(f"[{node_id}] Found fixed-point: {current_space}.")
-            node["expanded"] = True
-            return
+            return None
 
         # We use the non-propagated Petri net for backwards-compatibility reasons here.
         # The SD created from the restricted Petri net is technically correct, but can
@@ -1356,65 +2048,266 @@ class SuccessionDiagram:
         if node_id == self.root():
             source_nodes = extract_source_variables(self.petri_net)
 
-        sub_spaces: list[BooleanSpace]
-
         # Only use the percolated PN if it is already known.
         pn = node["percolated_petri_net"]
         if pn is not None:
             # We have a pre-propagated PN for this sub-space, hence we can use
             # that to compute the trap spaces.
-            partial_sub_spaces = trappist(
-                pn,
-                problem="max",
-                optimize_source_variables=source_nodes,
-                solution_limit=self.config["max_motifs_per_node"],
-            )
-            sub_spaces = [(s | current_space) for s in partial_sub_spaces]
+            return {
+                "network": pn,
+                "problem": "max",
+                "optimize_source_variables": source_nodes,
+                "solution_limit": self.config["max_motifs_per_node"],
+                "time_limit": self.config["node_time_limit"],
+                "memory_limit": self.config["node_memory_limit"],
+            }
         else:
             # If we (for whatever reason) don't have the pre-propagated PN,
             # we can still use the "global" PN and let trappist deal with the restriction.
-            sub_spaces = trappist(
-                self.petri_net,
-                problem="max",
-                ensure_subspace=current_space,
-                optimize_source_variables=source_nodes,
-                solution_limit=self.config["max_motifs_per_node"],
-            )
+            return {
+                "network": self.petri_net,
+                "problem": "max",
+                "ensure_subspace": current_space,
+                "optimize_source_variables": source_nodes,
+                "solution_limit": self.config["max_motifs_per_node"],
+                "time_limit": self.config["node_time_limit"],
+                "memory_limit": self.config["node_memory_limit"],
+            }
+
+    @contextmanager
+    def _node_budget(self, node_id: int) -> Iterator[Budget | None]:
+        """
+        An internal method that creates the budget of a single computation on
+        the given node (or `None` if the configuration sets no per-node limits).
+        If the computation exceeds the budget, the node is marked as deferred.
+        """
+        budget = Budget.from_config(self.config)
+        try:
+            yield budget
+        except (TimeoutError, MemoryError) as error:
+            if budget is not None:
+                self._defer_node(node_id, str(error))
+            raise
 
-        # Release the Petri net once the sub_spaces are computed.
-        # It might be needed later for attractor computation, but it
-        # uses a lot of memory in large diagrams to keep all the nets
-        # in memory.
-        node["percolated_petri_net"] = None
+    def _enforce_resident_limit(self):
+        """
+        An internal method that evicts the data of the least recently used
+        nodes if the diagram is backed by a store and exceeds the
+        `SuccessionDiagramConfiguration.resident_node_limit`.
 
-        if len(sub_spaces) == self.config["max_motifs_per_node"]:
-            raise RuntimeError(
-                f"Exceeded the maximum amount of stable motifs per node ({self.config['max_motifs_per_node']}; see `SuccessionDiagramConfiguration.max_motifs_per_node`)."
-            )
+        This is only called between the steps of operations that process many
+        nodes (i.e. when no `NodeData` are being modified), never in `node_data`.
+        """
+        limit = self.config["resident_node_limit"]
+        if (
+            self.store is not None
+            and limit is not None
+            and len(self.resident_nodes) > limit
+        ):
+            self.evict_node_data(limit // 2)
 
-        # Sort the spaces based on a unique key in case trappist is not always
-        # sorted deterministically.
-        sub_spaces = sorted(
-            sub_spaces, key=lambda space: space_unique_key(space, self.network)
-        )
+    def _load_evicted_data(self):
+        """
+        An internal method that loads all node data and stable motifs evicted
+        into the backing store (see `evict_node_data`) back into memory.
+        """
+        if self.store is None:
+            return
+        for node_id in self.node_ids():
+            self.node_data(node_id)
+            for child_id in self.dag.successors(node_id):  # type: ignore
+                edge = cast(dict[str, Any], self.dag.edges[node_id, child_id])
+                if "motif" not in edge:
+                    edge["motif"] = self.store.edge_stable_motif(node_id, child_id)
 
-        if len(sub_spaces) == 0:
+    def _defer_node(self, node_id: int, reason: str):
+        """
+        An internal method that marks the given node as deferred, because
+        some computation on this node exceeded its budget.
+        """
+        self.node_data(node_id)["deferred"] = True
+        self.modified_nodes.add(node_id)
+        self.instrumentation.count("deferred_nodes")
+        if self.config["debug"]:
+            print(f"[{node_id}] Node deferred: {reason}")
+
+    def _store_attractor_sets(self, node_id: int, sets: list[VertexSet]):
+        """
+        An internal method that saves the attractor sets of the given node,
+        possibly evicting the least recently used attractor sets of other nodes
+        (see `SuccessionDiagramConfiguration.attractor_sets_cache_size`).
+        """
+        self.node_data(node_id)["attractor_sets"] = sets
+        if len(sets) == 0:
+            # Empty lists are never evicted, since they use no memory.
+            return
+        self.attractor_sets_lru[node_id] = None
+        self.attractor_sets_lru.move_to_end(node_id)
+        capacity = self.config["attractor_sets_cache_size"]
+        if capacity is None:
+            return
+        while len(self.attractor_sets_lru) > capacity:
+            (evicted, _) = self.attractor_sets_lru.popitem(last=False)
+            self.node_data(evicted)["attractor_sets"] = None
+            self.instrumentation.count("evicted_attractor_sets")
             if self.config["debug"]:
-                print(f"[{node_id}] Found minimum trap space: {current_space}.")
-            node["expanded"] = True
+                print(f"[{evicted}] Attractor sets evicted.")
+
+    def _mark_unresolved(
+        self, node_id: int, candidates: list[BooleanSpace] | None
+    ) -> RuntimeError:
+        """
+        An internal method that marks the given node as unresolved, because
+        the symbolic attractor detection exceeded its limits. If `candidates`
+        are given, they replace the attractor candidates of the node.
+
+        Returns the error that should be raised by the caller.
+        """
+        node = self.node_data(node_id)
+        node["unresolved"] = True
+        if candidates is not None:
+            node["attractor_candidates"] = candidates
+        self.modified_nodes.add(node_id)
+        self.instrumentation.count("unresolved_nodes")
+        return RuntimeError(
+            f"Symbolic attractor detection exceeded its limits in node {node_id} (see `SuccessionDiagramConfiguration.symbolic_size_limit` and `SuccessionDiagramConfiguration.symbolic_time_limit`)."
+        )
+
+    def _is_skipped(
+        self, node_id: int, data: Literal["attractor_seeds", "attractor_sets"]
+    ) -> bool:
+        """
+        An internal method that checks whether the given attractor `data` of
+        the node should be skipped by the methods that process all nodes,
+        i.e. the node is deferred, or it is unresolved and the data is unknown.
+        """
+        node = self.node_data(node_id)
+        if node["deferred"]:
+            return True
+        return node["unresolved"] and node[data] is None
+
+    def _expand_one_node(
+        self, node_id: int, sub_spaces: Iterable[BooleanSpace] | None = None
+    ):
+        """
+        An internal method that expands a single node of the succession diagram.
+
+        This entails computing the maximal trap spaces within the node (stable
+        motifs) and creating a node for the result (if it does not exist yet).
+
+        If `sub_spaces` is given, it must be the result of evaluating
+        `_stable_motif_query` for this node (e.g. in a worker process), and
+        the solver is not called again.
+
+        If the node is already expanded or deferred, the method does nothing.
+        If the stable motif enumeration exceeds the per-node budget (see
+        `SuccessionDiagramConfiguration.node_time_limit`), the node is marked
+        as deferred and remains unexpanded.
+
+        If there are already some attractor data for this node (stub nodes can
+        have associated attractor data), this data is erased.
+
+        If the diagram is backed by a store and exceeds the
+        `SuccessionDiagramConfiguration.resident_node_limit`, the data of
+        the least recently used nodes are evicted before the expansion (see
+        `_enforce_resident_limit`).
+        """
+        self._enforce_resident_limit()
+
+        node = cast(dict[str, Any], self.node_data(node_id))
+        if node["expanded"] or node["deferred"]:
             return
 
-        if self.config["debug"]:
-            print(f"[{node_id}] Found sub-spaces: {len(sub_spaces)}")
+        self.instrumentation.count("expanded_nodes")
+        self.modified_nodes.add(node_id)
+        with self.instrumentation.timer("expansion", node_id):
+            # If the node had any attractor data computed as unexpanded, these are
+            # no longer valid and need to be erased.
+            node["attractor_seeds"] = None
+            node["attractor_candidates"] = None
+            node["attractor_sets"] = None
+            self.attractor_sets_lru.pop(node_id, None)
+
+            current_space = node["space"]
+
+            if self.config["debug"]:
+                print(
+                    f"[{node_id}] Expanding: {len(self.node_data(node_id)['space'])} fixed vars."
+                )
+
+            if len(current_space) == self.network.variable_count():
+                # This node is a fixed-point. Trappist would just
+                # return this fixed-point again. No need to continue.
+                if self.config["debug"]:
+                    print(f"[{node_id}] Found fixed-point: {current_space}.")
+                node["expanded"] = True
+                return
+
+            if sub_spaces is None:
+                query = self._stable_motif_query(node_id)
+                assert query is not None
+                sub_spaces = iter_trap_spaces(
+                    **query, instrumentation=self.instrumentation
+                )
 
-        for sub_space in sub_spaces:
-            child_id = self._ensure_node(node_id, sub_space)
+            # The motifs are consumed one by one as they are found by the solver and
+            # stored as compact bitmasks (not dictionaries), so that nodes with many
+            # stable motifs do not need to keep all the dictionaries in memory.
+            # Trap spaces of the percolated PN only contain the free variables.
+            encoder = self.space_encoder
+            compact_space = encoder.encode(current_space)
+            max_motifs = self.config["max_motifs_per_node"]
+            compact_sub_spaces: list[CompactSpace] = []
+            try:
+                with self.instrumentation.timer("trappist", node_id):
+                    for sub_space in sub_spaces:
+                        compact_sub_space = encoder.encode(sub_space).intersect(
+                            compact_space
+                        )
+                        assert compact_sub_space is not None
+                        compact_sub_spaces.append(compact_sub_space)
+                        if len(compact_sub_spaces) == max_motifs:
+                            raise RuntimeError(
+                                f"Exceeded the maximum amount of stable motifs per node ({max_motifs}; see `SuccessionDiagramConfiguration.max_motifs_per_node`)."
+                            )
+            except (TimeoutError, MemoryError) as error:
+                config = self.config
+                if (
+                    config["node_time_limit"] is None
+                    and config["node_memory_limit"] is None
+                ):
+                    raise
+                self._defer_node(node_id, str(error))
+                return
+            self.instrumentation.count("stable_motifs", len(compact_sub_spaces))
+
+            # Release the Petri net once the sub_spaces are computed.
+            # It might be needed later for attractor computation, but it
+            # uses a lot of memory in large diagrams to keep all the nets
+            # in memory.
+            node["percolated_petri_net"] = None
+
+            # Sort the spaces based on a unique key in case trappist is not always
+            # sorted deterministically.
+            compact_sub_spaces.sort(key=encoder.unique_key)
+
+            if len(compact_sub_spaces) == 0:
+                if self.config["debug"]:
+                    print(f"[{node_id}] Found minimum trap space: {current_space}.")
+                node["expanded"] = True
+                return
 
             if self.config["debug"]:
-                print(f"[{node_id}] Created edge into node {child_id}.")
+                print(f"[{node_id}] Found sub-spaces: {len(compact_sub_spaces)}")
+
+            for compact_sub_space in compact_sub_spaces:
+                child_id = self._ensure_node(node_id, encoder.decode(compact_sub_space))
 
-        # If everything else worked out, we can mark the node as expanded.
-        node["expanded"] = True
+                if self.config["debug"]:
+                    print(f"[{node_id}] Created edge into node {child_id}.")
+
+            # If everything else worked out, we can mark the node as expanded.
+            node["expanded"] = True
 
     def _ensure_node(self, parent_id: int | None, stable_motif: BooleanSpace) -> int:
         """
@@ -1429,9 +2322,10 @@ class SuccessionDiagram:
         considered to be zero (i.e. the node is the root).
         """
 
-        fixed_vars = percolate_space(self.symbolic, stable_motif)
+        with self.instrumentation.timer("percolation", parent_id):
+            fixed_vars = self.percolation_cache.percolate(stable_motif)
 
-        key = space_unique_key(fixed_vars, self.network)
+        key = self.space_encoder.space_key(fixed_vars)
 
         child_id = None
         if key not in self.node_indices:
@@ -1443,6 +2337,8 @@ class SuccessionDiagram:
                 space=fixed_vars,
                 depth=0,
                 expanded=False,
+                deferred=False,
+                unresolved=False,
                 percolated_network=None,
                 percolated_petri_net=None,
                 percolated_nfvs=None,
@@ -1451,6 +2347,7 @@ class SuccessionDiagram:
                 attractor_sets=None,
             )
             self.node_indices[key] = child_id
+            self.modified_nodes.add(child_id)
         else:
             child_id = self.node_indices[key]
 
@@ -1473,4 +2370,5 @@ class SuccessionDiagram:
         # can be reached through multiple stable motifs. Not sure how to
         # approach these... but this is probably good enough for now.
         self.dag.add_edge(parent_id, child_id, motif=stable_motif)  # type: ignore
+        self.modified_nodes.add(parent_id)
         self._update_node_depth(child_id, parent_id)
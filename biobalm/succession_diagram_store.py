@@ -0,0 +1,549 @@
+"""
+A persistent on-disk store for succession diagrams.
+
+A :class:`SuccessionDiagramStore` saves the nodes, edges, stable motifs and
+attractor data of a :class:`SuccessionDiagram<biobalm.SuccessionDiagram>` into
+an SQLite database. Unlike pickling, writing into the store is incremental:
+new nodes and edges are appended, and only the existing nodes that were
+modified since the last write (see `SuccessionDiagram.modified_nodes`) are
+updated. The stored diagram can then be either inspected lazily (node data is
+loaded on demand and only a bounded working set is kept in memory), or loaded
+back into a full `SuccessionDiagram` to continue the computation.
+
+A `SuccessionDiagram` can be also backed by a store (see
+:meth:`SuccessionDiagram.attach_store<biobalm.SuccessionDiagram.attach_store>`).
+In that case, only the structure of the diagram and the data of recently used
+nodes are kept in memory, and the data of the remaining nodes are loaded from
+the store on demand. The number of such nodes is bounded by the
+`SuccessionDiagramConfiguration.resident_node_limit` between the individual
+steps of the methods that process many nodes (expansion, attractor detection,
+node ID iterators), but not while reading individual nodes through
+:meth:`SuccessionDiagram.node_data<biobalm.SuccessionDiagram.node_data>`.
+
+The percolated networks and Petri nets of individual nodes, as well as
+the symbolic `attractor_sets`, are not stored, since they can be recomputed
+when needed (see also :meth:`SuccessionDiagram.reclaim_node_data<biobalm.SuccessionDiagram.reclaim_node_data>`).
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import uuid
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator
+
+    from biobalm.succession_diagram import SuccessionDiagram
+    from biobalm.types import BooleanSpace, SuccessionDiagramConfiguration
+
+import networkx as nx  # type: ignore
+from biodivine_aeon import BooleanNetwork
+
+from biobalm.compact_space import SpaceEncoder
+from biobalm.types import NodeData
+
+STORE_VERSION = 3
+"""The version of the database schema written by :class:`SuccessionDiagramStore`."""
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    """
+    CREATE TABLE IF NOT EXISTS nodes (
+        id INTEGER PRIMARY KEY,
+        space BLOB NOT NULL UNIQUE,
+        depth INTEGER NOT NULL,
+        expanded INTEGER NOT NULL,
+        deferred INTEGER NOT NULL,
+        unresolved INTEGER NOT NULL,
+        percolated_nfvs TEXT,
+        attractor_candidates BLOB,
+        attractor_seeds BLOB
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS edges (
+        parent INTEGER NOT NULL,
+        child INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        motif BLOB NOT NULL,
+        PRIMARY KEY (parent, child)
+    ) WITHOUT ROWID
+    """,
+]
+
+
+class SuccessionDiagramStore:
+    """
+    An SQLite-backed store of succession diagram data.
+
+    Use :meth:`write` to (incrementally) save a `SuccessionDiagram` into the
+    store and :meth:`load` to restore it. The methods :meth:`node_data`,
+    :meth:`node_successors`, :meth:`edge_stable_motif` and :meth:`find_node`
+    read the stored diagram directly, keeping at most `cache_size` recently
+    used node data objects in memory.
+
+    A store only holds data of a single network. Writing a diagram of a different
+    network into an existing store raises a `ValueError`.
+
+    Parameters
+    ----------
+    path : str
+        The path of the database file. Use `":memory:"` for a temporary
+        in-memory database.
+    cache_size : int
+        The maximal number of node data objects kept in memory.
+    """
+
+    def __init__(self, path: str, cache_size: int = 10_000):
+        self.path = path
+        self.cache_size = cache_size
+        self.connection = sqlite3.connect(path)
+        for statement in _SCHEMA:
+            self.connection.execute(statement)
+        self.connection.commit()
+
+        version = self._meta("version")
+        if version is not None and int(version) != STORE_VERSION:
+            raise ValueError(
+                f"Unsupported store version {version} (expected {STORE_VERSION})."
+            )
+
+        self.cache: OrderedDict[int, NodeData] = OrderedDict()
+        self._encoder: SpaceEncoder | None = None
+
+    def __repr__(self) -> str:
+        return f"SuccessionDiagramStore({self.path!r})"
+
+    def __len__(self) -> int:
+        """
+        The number of stored nodes.
+        """
+        row = self.connection.execute("SELECT COUNT(*) FROM nodes").fetchone()
+        return int(row[0])
+
+    def __enter__(self) -> SuccessionDiagramStore:
+        return self
+
+    def __exit__(self, *args: Any):
+        self.close()
+
+    def close(self):
+        """
+        Close the underlying database connection.
+        """
+        self.connection.close()
+
+    @property
+    def encoder(self) -> SpaceEncoder:
+        """
+        The encoder used to store the spaces of the network.
+
+        Raises `KeyError` if the store is empty.
+        """
+        if self._encoder is None:
+            variables = self._meta("variables")
+            if variables is None:
+                raise KeyError("The store contains no succession diagram.")
+            self._encoder = SpaceEncoder(json.loads(variables))
+        return self._encoder
+
+    def write(self, sd: SuccessionDiagram, expansion: dict[str, Any] | None = None):
+        """
+        Save the current state of the given succession diagram into the store.
+
+        Nodes and edges that are not in the store yet are appended. For the
+        existing nodes, only the depth, expansion and deferral status, attractor
+        data and outgoing edges are updated. Note that the nodes of a single
+        diagram can only be added, never removed, hence the node IDs in the
+        store stay valid.
+
+        If the diagram was last written into (or loaded from) this store, and
+        the store was not written since, only the new nodes and the nodes in
+        `SuccessionDiagram.modified_nodes` (together with their outgoing edges)
+        are written. Changes made directly to the `NodeData` dictionaries (i.e.
+        not through the methods of the diagram) are not tracked.
+
+        Otherwise, all nodes are written, and the stored nodes must be
+        a prefix of the diagram, i.e. every stored node ID must belong to a node
+        with the same space in the diagram. If this is not the case (e.g. the
+        store contains a diagram created by a different expansion algorithm),
+        a `ValueError` is raised and the store is not modified.
+
+        If `expansion` is given, it is saved (as JSON) together with the diagram
+        and can be later retrieved using :meth:`expansion`. This is used to
+        checkpoint the state of expansion algorithms (see
+        :meth:`SuccessionDiagram.resume_from<biobalm.SuccessionDiagram.resume_from>`).
+        The whole write is a single transaction, i.e. the stored diagram and
+        the expansion state are always consistent.
+        """
+        meta: list[tuple[str, str]] = []
+        network_rules = sd.network.to_aeon()
+        stored_rules = self._meta("network_rules")
+        if stored_rules is None:
+            variables = sd.network.variable_names()
+            self._encoder = SpaceEncoder(variables)
+            meta.append(("version", str(STORE_VERSION)))
+            meta.append(("network_rules", network_rules))
+            meta.append(("variables", json.dumps(variables)))
+        elif stored_rules != network_rules:
+            raise ValueError("The store contains a diagram of a different network.")
+        # Every write creates a new revision (see `SuccessionDiagram.synced_revision`).
+        revision = uuid.uuid4().hex
+        meta.append(("revision", revision))
+        meta.append(("config", json.dumps(sd.config)))
+        meta.append(("nfvs", json.dumps(sd.nfvs)))
+        if expansion is not None:
+            meta.append(("expansion", json.dumps(expansion)))
+
+        encoder = self.encoder
+        stored_count = len(self)
+        if sd.synced_revision is not None and sd.synced_revision == self._meta(
+            "revision"
+        ):
+            written: Iterable[int] = sorted(
+                {n for n in sd.modified_nodes if n < stored_count}
+            ) + list(range(stored_count, len(sd)))
+        else:
+            self._check_prefix(sd)
+            written = sd.node_ids()
+
+        new_nodes: list[tuple[Any, ...]] = []
+        updated_nodes: list[tuple[Any, ...]] = []
+        edges: list[tuple[int, int, int, bytes]] = []
+        for node_id in written:
+            data = sd.node_data(node_id)
+            row = (
+                data["depth"],
+                int(data["expanded"]),
+                int(data["deferred"]),
+                int(data["unresolved"]),
+                _pack_json(data["percolated_nfvs"]),
+                _pack_spaces(encoder, data["attractor_candidates"]),
+                _pack_spaces(encoder, data["attractor_seeds"]),
+            )
+            if node_id >= stored_count:
+                space = encoder.pack(encoder.encode(data["space"]))
+                new_nodes.append((node_id, space) + row)
+            else:
+                updated_nodes.append(row + (node_id,))
+            # The position ensures the successors are restored in the same order.
+            for position, child_id in enumerate(sd.dag.successors(node_id)):  # type: ignore
+                motif = sd.edge_stable_motif(node_id, child_id)
+                motif_data = encoder.pack(encoder.encode(motif))
+                edges.append((node_id, child_id, position, motif_data))
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta
+            )
+            self.connection.executemany(
+                """
+                INSERT INTO nodes (id, space, depth, expanded, deferred,
+                    unresolved, percolated_nfvs, attractor_candidates, attractor_seeds)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                new_nodes,
+            )
+            self.connection.executemany(
+                """
+                UPDATE nodes SET depth = ?, expanded = ?, deferred = ?,
+                    unresolved = ?, percolated_nfvs = ?, attractor_candidates = ?, attractor_seeds = ?
+                WHERE id = ?
+                """,
+                updated_nodes,
+            )
+            # The rewritten edges replace all stored edges of the updated nodes.
+            self.connection.executemany(
+                "DELETE FROM edges WHERE parent = ?",
+                [(row[-1],) for row in updated_nodes],
+            )
+            self.connection.executemany(
+                """
+                INSERT INTO edges (parent, child, position, motif)
+                VALUES (?, ?, ?, ?)
+                """,
+                edges,
+            )
+
+        # The cached data may be outdated.
+        self.cache.clear()
+        sd.modified_nodes.clear()
+        sd.synced_revision = revision
+
+    def clear(self):
+        """
+        Remove all data from the store.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM edges")
+            self.connection.execute("DELETE FROM nodes")
+            self.connection.execute("DELETE FROM meta")
+        self.cache.clear()
+        self._encoder = None
+
+    def configuration(self) -> SuccessionDiagramConfiguration:
+        """
+        The configuration of the stored diagram (completed by the default
+        values of options that are not stored).
+        """
+        from biobalm.succession_diagram import SuccessionDiagram
+
+        config = SuccessionDiagram.default_config()
+        stored_config = self._meta("config")
+        if stored_config is not None:
+            config.update(json.loads(stored_config))
+        return config
+
+    def load(
+        self,
+        config: SuccessionDiagramConfiguration | None = None,
+        attach: bool = False,
+    ) -> SuccessionDiagram:
+        """
+        Load the stored succession diagram into memory.
+
+        If `config` is not given, the stored configuration is used. Raises
+        `KeyError` if the store is empty.
+
+        If `attach` is set, only the structure of the diagram is loaded, and
+        the diagram is backed by this store (see
+        :meth:`SuccessionDiagram.attach_store<biobalm.SuccessionDiagram.attach_store>`),
+        i.e. the node data and stable motifs are loaded on demand. The store
+        then belongs to the diagram and must not be closed.
+
+        Parameters
+        ----------
+        config : SuccessionDiagramConfiguration | None
+            An optional configuration of the loaded diagram.
+        attach : bool
+            Whether the loaded diagram should be backed by this store.
+
+        Returns
+        -------
+        SuccessionDiagram
+            The loaded succession diagram.
+        """
+        from biobalm.petri_net_translation import network_to_petrinet
+        from biobalm.succession_diagram import SuccessionDiagram
+
+        network_rules = self._meta("network_rules")
+        if network_rules is None:
+            raise KeyError("The store contains no succession diagram.")
+
+        if config is None:
+            config = self.configuration()
+
+        encoder = self.encoder
+        dag = nx.DiGraph()
+        node_indices: dict[int, int] = {}
+        if attach:
+            # Nodes and edges without data are loaded on demand.
+            for node_id, space in self.connection.execute(
+                "SELECT id, space FROM nodes ORDER BY id"
+            ):
+                dag.add_node(node_id)  # type: ignore
+                node_indices[encoder.unique_key(encoder.unpack(space))] = node_id
+            for parent_id, child_id in self.connection.execute(
+                "SELECT parent, child FROM edges ORDER BY parent, position"
+            ):
+                dag.add_edge(parent_id, child_id)  # type: ignore
+        else:
+            for row in self.connection.execute(
+                f"SELECT {_NODE_COLUMNS} FROM nodes ORDER BY id"
+            ):
+                node_id = row[0]
+                dag.add_node(node_id, **self._row_to_node_data(row))  # type: ignore
+                node_indices[encoder.unique_key(encoder.unpack(row[1]))] = node_id
+            for parent_id, child_id, motif in self.connection.execute(
+                "SELECT parent, child, motif FROM edges ORDER BY parent, position"
+            ):
+                motif_space = encoder.decode(encoder.unpack(motif))
+                dag.add_edge(parent_id, child_id, motif=motif_space)  # type: ignore
+
+        stored_nfvs = self._meta("nfvs")
+        sd = SuccessionDiagram.__new__(SuccessionDiagram)
+        sd.__setstate__(
+            {
+                "network_rules": network_rules,
+                "petri_net": network_to_petrinet(
+                    BooleanNetwork.from_aeon(network_rules)
+                ),
+                "nfvs": None if stored_nfvs is None else json.loads(stored_nfvs),
+                "dag": dag,
+                "node_indices": node_indices,
+                "config": config,
+                # The loaded diagram is identical to the stored one.
+                "modified_nodes": set(),
+                "synced_revision": self._meta("revision"),
+            }
+        )
+        if attach:
+            sd.store = self
+        return sd
+
+    def expansion(self) -> dict[str, Any] | None:
+        """
+        The expansion state saved by the last :meth:`write`, or `None` if
+        no state was saved.
+        """
+        expansion = self._meta("expansion")
+        return None if expansion is None else json.loads(expansion)
+
+    def node_ids(self) -> Iterator[int]:
+        """
+        Iterator over all stored node IDs.
+        """
+        for row in self.connection.execute("SELECT id FROM nodes ORDER BY id"):
+            yield row[0]
+
+    def node_data(self, node_id: int) -> NodeData:
+        """
+        Get the stored data of the given node.
+
+        The result has the same format as :meth:`SuccessionDiagram.node_data<biobalm.SuccessionDiagram.node_data>`,
+        but the data which is not stored (percolated network and Petri net,
+        attractor sets) is always `None`. Raises `KeyError` if the node does
+        not exist.
+        """
+        data = self.cache.get(node_id)
+        if data is not None:
+            self.cache.move_to_end(node_id)
+            return data
+
+        row = self.connection.execute(
+            f"SELECT {_NODE_COLUMNS} FROM nodes WHERE id = ?", (node_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Node {node_id} is not in the store.")
+        data = self._row_to_node_data(row)
+        if self.cache_size > 0:
+            self.cache[node_id] = data
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return data
+
+    def node_successors(self, node_id: int) -> list[int]:
+        """
+        The stored successors of the given node.
+
+        For nodes that are not expanded, the result is always empty.
+        """
+        return [
+            row[0]
+            for row in self.connection.execute(
+                "SELECT child FROM edges WHERE parent = ? ORDER BY position",
+                (node_id,),
+            )
+        ]
+
+    def edge_stable_motif(self, parent_id: int, child_id: int) -> BooleanSpace:
+        """
+        The stable motif of the stored edge between the given nodes.
+
+        Raises `KeyError` if the edge does not exist.
+        """
+        row = self.connection.execute(
+            "SELECT motif FROM edges WHERE parent = ? AND child = ?",
+            (parent_id, child_id),
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Edge {parent_id} -> {child_id} is not in the store.")
+        return self.encoder.decode(self.encoder.unpack(row[0]))
+
+    def find_node(self, node_space: BooleanSpace) -> int | None:
+        """
+        Return the ID of the stored node with the given space, or `None` if
+        no such node is stored.
+        """
+        try:
+            space = self.encoder.pack(self.encoder.encode(node_space))
+        except IndexError:
+            return None
+        row = self.connection.execute(
+            "SELECT id FROM nodes WHERE space = ?", (space,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def _check_prefix(self, sd: SuccessionDiagram):
+        """
+        Raise `ValueError` unless every stored node has the same space as
+        the node with the same ID in the given diagram.
+        """
+        encoder = self.encoder
+        for node_id, space in self.connection.execute(
+            "SELECT id, space FROM nodes ORDER BY id"
+        ):
+            if (
+                node_id >= len(sd)
+                or encoder.pack(encoder.encode(sd.node_data(node_id)["space"])) != space
+            ):
+                raise ValueError(
+                    f"The store contains a different succession diagram (node {node_id} does not match)."
+                )
+
+    def _row_to_node_data(self, row: tuple[Any, ...]) -> NodeData:
+        encoder = self.encoder
+        # Note: this must match the fields of the `NodeData` class
+        return cast(
+            NodeData,
+            {
+                "space": encoder.decode(encoder.unpack(row[1])),
+                "depth": row[2],
+                "expanded": bool(row[3]),
+                "deferred": bool(row[4]),
+                "unresolved": bool(row[5]),
+                "percolated_network": None,
+                "percolated_petri_net": None,
+                "percolated_nfvs": None if row[6] is None else json.loads(row[6]),
+                "attractor_candidates": _unpack_spaces(encoder, row[7]),
+                "attractor_seeds": _unpack_spaces(encoder, row[8]),
+                "attractor_sets": None,
+            },
+        )
+
+    def _meta(self, key: str) -> str | None:
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+
+_NODE_COLUMNS = (
+    "id, space, depth, expanded, deferred, unresolved, percolated_nfvs, "
+    "attractor_candidates, attractor_seeds"
+)
+
+
+def _pack_json(value: Any) -> str | None:
+    return None if value is None else json.dumps(value)
+
+
+def _pack_spaces(
+    encoder: SpaceEncoder, spaces: list[BooleanSpace] | None
+) -> bytes | None:
+    """
+    Pack a list of spaces into a single byte string (prefixed by the number of
+    spaces), or `None` if the list is `None`.
+    """
+    if spaces is None:
+        return None
+    data = [len(spaces).to_bytes(4, "little")]
+    for space in spaces:
+        data.append(encoder.pack(encoder.encode(space)))
+    return b"".join(data)
+
+
+def _unpack_spaces(
+    encoder: SpaceEncoder, data: bytes | None
+) -> list[BooleanSpace] | None:
+    """
+    The inverse of :func:`_pack_spaces`.
+    """
+    if data is None:
+        return None
+    count = int.from_bytes(data[:4], "little")
+    size = 2 * encoder.byte_width()
+    return [encoder.decode(encoder.unpack(data, 4 + i * size)) for i in range(count)]
@@ -7,11 +7,11 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Literal, cast
 
 if TYPE_CHECKING:
-    from biodivine_aeon import Bdd, SymbolicContext
+    from biodivine_aeon import AsynchronousGraph, Bdd, SymbolicContext, VertexSet
 
 from biodivine_aeon import BddVariableSet, BddValuation
 
-from biobalm.types import BooleanSpace
+from biobalm.types import AttractorSummary, BooleanSpace
 
 
 def state_to_bdd(
@@ -152,3 +152,45 @@ def valuation_to_state(ctx: SymbolicContext, valuation: BddValuation) -> Boolean
             result[ctx.get_network_variable_name(n_var)] = cast(Literal[0, 1], int(val))
 
     return result
+
+
+def attractor_summary(
+    graph: AsynchronousGraph, attractor: VertexSet
+) -> AttractorSummary:
+    """
+    Compute the compact summary of an attractor set, i.e. its fixed and
+    oscillating variables, and its cardinality.
+
+    Parameters
+    ----------
+    graph : AsynchronousGraph
+        The symbolic representation of the network in which the
+        attractor is represented.
+    attractor : VertexSet
+        The set of attractor states.
+
+    Returns
+    -------
+    AttractorSummary
+        The summary of the attractor set.
+    """
+    ctx = graph.symbolic_context()
+    bdd = attractor.to_bdd()
+
+    fixed: BooleanSpace = {}
+    oscillating: list[str] = []
+    for name in graph.network_variable_names():
+        bdd_var = ctx.find_network_bdd_variable(name)
+        assert bdd_var is not None
+        if bdd.r_select({bdd_var: 1}).is_false():
+            fixed[name] = 0
+        elif bdd.r_select({bdd_var: 0}).is_false():
+            fixed[name] = 1
+        else:
+            oscillating.append(name)
+
+    return {
+        "fixed": fixed,
+        "oscillating": oscillating,
+        "cardinality": attractor.cardinality(),
+    }
@@ -8,20 +8,25 @@ but has been significantly modified to better suite this project.
 
 from __future__ import annotations
 
+import time
+from contextlib import nullcontext
 from typing import TYPE_CHECKING, Literal
 
 if TYPE_CHECKING:
-    from typing import Callable
+    from typing import Callable, Generator, Iterator
 
     from clingo import Model
 
+    from biobalm.instrumentation import Instrumentation
     from biobalm.types import BooleanSpace
 
 from biodivine_aeon import BooleanNetwork
-from clingo import Control, SolveHandle
+from clingo import Control, Function, SolveHandle, Symbol
 from networkx import DiGraph  # type: ignore
 
+from biobalm._budget import Budget
 from biobalm.petri_net_translation import (
+    PetriNet,
     extract_source_variables,
     extract_variable_names,
     network_to_petrinet,
@@ -30,27 +35,37 @@ from biobalm.petri_net_translation import (
 )
 
 
-def trappist_async(
-    network: BooleanNetwork | DiGraph,
-    on_solution: Callable[[BooleanSpace], bool],
+def iter_trap_spaces(
+    network: BooleanNetwork | PetriNet | DiGraph,
     problem: Literal["min", "max", "fix"] = "min",
     reverse_time: bool = False,
+    solution_limit: int | None = None,
     ensure_subspace: BooleanSpace | None = None,
     avoid_subspaces: list[BooleanSpace] | None = None,
     optimize_source_variables: list[str] | None = None,
-):
+    use_backend: bool = True,
+    time_limit: float | None = None,
+    memory_limit: int | None = None,
+    instrumentation: Instrumentation | None = None,
+) -> Generator[BooleanSpace, None, None]:
     """
-    Asynchronous version of the :func:`trappist` method.
+    Generator version of the :func:`trappist` method.
 
-    *Note that "asynchronous" refers to the execution of this function, not to
-    the update scheme used (which does not affect the trap spaces in any case).*
+    The same as the :func:`trappist` method, but the spaces are yielded one by
+    one as they are found by the solver. As such, the solutions never have to be
+    stored in memory at the same time, and the enumeration can be stopped
+    at any point (e.g. by breaking out of the loop or by calling `close` on the
+    generator). The solver is only created once the first solution is requested.
 
-    The same as the :func:`trappist` method, but instead of returning a list of spaces
-    as a result, the spaces are returned to the supplied `on_solution` callback.
-    You can stop the enumeration by returning `False` from this callback.
+    If `instrumentation` is given, the grounding of the logic program
+    is measured as the `grounding` phase.
 
     See :func:`trappist` for details.
     """
+    budget: Budget | None = None
+    if time_limit is not None or memory_limit is not None:
+        budget = Budget(time_limit, memory_limit)
+
     if ensure_subspace is None:
         ensure_subspace = {}
     if avoid_subspaces is None:
@@ -61,9 +76,7 @@ def trappist_async(
         petri_net = network_to_petrinet(network)
     else:
         bn = None
-        petri_net = network
-
-    assert isinstance(petri_net, DiGraph)
+        petri_net = _as_petri_net(network)
 
     if bn is None:
         variables = extract_variable_names(petri_net)
@@ -81,26 +94,88 @@ def trappist_async(
         ensure_subspace,
         avoid_subspaces,
         optimize_source_variables,
+        use_backend,
     )
 
-    ctl.ground()
+    if instrumentation is None:
+        ctl.ground()
+    else:
+        with instrumentation.timer("grounding"):
+            ctl.ground()
+
+    if budget is None:
+        yield from _iter_solutions(ctl, solution_limit)
+        return
+
+    budget.check()
+    with budget.interrupt(ctl):
+        for space in _iter_solutions(ctl, solution_limit):
+            budget.check()
+            yield space
+    budget.check()
+
+
+def _iter_solutions(ctl: Control, solution_limit: int | None) -> Iterator[BooleanSpace]:
     result = ctl.solve(yield_=True)
     if isinstance(result, SolveHandle):
+        count = 0
         with result as iterator:
             for model in iterator:
-                if not on_solution(_clingo_model_to_space(model)):
+                yield _clingo_model_to_space(model)
+                count += 1
+                if solution_limit is not None and count >= solution_limit:
                     break
     # Else: unsat, hence we don't do anything.
 
 
+def trappist_async(
+    network: BooleanNetwork | PetriNet | DiGraph,
+    on_solution: Callable[[BooleanSpace], bool],
+    problem: Literal["min", "max", "fix"] = "min",
+    reverse_time: bool = False,
+    ensure_subspace: BooleanSpace | None = None,
+    avoid_subspaces: list[BooleanSpace] | None = None,
+    optimize_source_variables: list[str] | None = None,
+    use_backend: bool = True,
+):
+    """
+    Asynchronous version of the :func:`trappist` method.
+
+    *Note that "asynchronous" refers to the execution of this function, not to
+    the update scheme used (which does not affect the trap spaces in any case).*
+
+    The same as the :func:`trappist` method, but instead of returning a list of spaces
+    as a result, the spaces are returned to the supplied `on_solution` callback.
+    You can stop the enumeration by returning `False` from this callback.
+
+    See :func:`trappist` for details.
+    """
+    spaces = iter_trap_spaces(
+        network,
+        problem=problem,
+        reverse_time=reverse_time,
+        ensure_subspace=ensure_subspace,
+        avoid_subspaces=avoid_subspaces,
+        optimize_source_variables=optimize_source_variables,
+        use_backend=use_backend,
+    )
+    for space in spaces:
+        if not on_solution(space):
+            spaces.close()
+            break
+
+
 def trappist(
-    network: BooleanNetwork | DiGraph,
+    network: BooleanNetwork | PetriNet | DiGraph,
     problem: Literal["min", "max", "fix"] = "min",
     reverse_time: bool = False,
     solution_limit: int | None = None,
     ensure_subspace: BooleanSpace | None = None,
     avoid_subspaces: list[BooleanSpace] | None = None,
     optimize_source_variables: list[str] | None = None,
+    use_backend: bool = True,
+    time_limit: float | None = None,
+    memory_limit: int | None = None,
 ) -> list[BooleanSpace]:
     """
     Trap space solver for Boolean networks.
@@ -115,7 +190,8 @@ def trappist(
 
     The result is a list of spaces represented as :class:`BooleanSpace<biobalm.types.BooleanSpace>`
     dictionaries. If you want to avoid enumerating all solutions explicitly as one list, you can use
-    :func:`trappist_async` which has a similar API but can yield solutions one by one.
+    :func:`iter_trap_spaces` (a generator) or :func:`trappist_async` (a callback), which have a similar
+    API but yield solutions one by one.
 
     Finally, recall that the supplied network must have its names sanitized (see
     :mod:`petri_net_translation<biobalm.petri_net_translation>` module).
@@ -123,10 +199,11 @@ def trappist(
 
     Parameters
     ----------
-    network : BooleanNetwork | DiGraph
+    network : BooleanNetwork | PetriNet | DiGraph
         A Boolean network or a Petri net compatible with the encoding in
-        :mod:`petri_net_translation<biobalm.petri_net_translation>` module. The behaviour is undefined for other
-        `DiGraph` instances.
+        :mod:`petri_net_translation<biobalm.petri_net_translation>` module. A `DiGraph`
+        is converted using :meth:`PetriNet.from_networkx<biobalm.petri_net_translation.PetriNet.from_networkx>`.
+        The behaviour is undefined for other `DiGraph` instances.
     problem : Literal["min", "max", "fix"], optional
         The problem to solve. Finds all minimal trap spaces (`"min"`), maximal
         trap spaces (`"max"`), or fixed points (`"fix"`). The default is `"min"`.
@@ -146,6 +223,19 @@ def trappist(
         purposes of trap space identification. Fixed values of these variables
         will be considered together, reducing the number of trap spaces
         associated with `k` source nodes to `2**k` from `(2**k)*k!`.
+    use_backend : bool, optional
+        If `True`, the logic program is passed to `clingo` directly through its
+        backend API. Otherwise, the program is built as text and then parsed and
+        grounded by `clingo`, which is considerably slower for large networks.
+        Both options give the same solutions, but possibly in a different order.
+        Default: `True`.
+    time_limit : float, optional
+        If given, the computation raises `TimeoutError` once it takes more than
+        the given number of seconds. Default: `None`.
+    memory_limit : int, optional
+        If given, the computation raises `MemoryError` once the memory usage of
+        the process increases by more than the given number of bytes.
+        Default: `None`.
 
     Returns
     -------
@@ -153,32 +243,21 @@ def trappist(
         The :class:`BooleanSpace<biobalm.types.BooleanSpace>` objects
         describing the trap spaces that solve the specified problem.
     """
-    if ensure_subspace is None:
-        ensure_subspace = {}
-    if avoid_subspaces is None:
-        avoid_subspaces = []
-
-    results: list[BooleanSpace] = []
-
-    def save_result(x: BooleanSpace) -> bool:
-        results.append(x)
-        if solution_limit is None:
-            return True
-        else:
-            return len(results) < solution_limit
-
-    trappist_async(
-        network,
-        on_solution=save_result,
-        problem=problem,
-        reverse_time=reverse_time,
-        ensure_subspace=ensure_subspace,
-        avoid_subspaces=avoid_subspaces,
-        optimize_source_variables=optimize_source_variables,
+    return list(
+        iter_trap_spaces(
+            network,
+            problem=problem,
+            reverse_time=reverse_time,
+            solution_limit=solution_limit,
+            ensure_subspace=ensure_subspace,
+            avoid_subspaces=avoid_subspaces,
+            optimize_source_variables=optimize_source_variables,
+            use_backend=use_backend,
+            time_limit=time_limit,
+            memory_limit=memory_limit,
+        )
     )
 
-    return results
-
 
 def _clingo_model_to_space(model: Model) -> BooleanSpace:
     space: BooleanSpace = {}
@@ -198,12 +277,13 @@ def _clingo_model_to_space(model: Model) -> BooleanSpace:
 
 def _create_clingo_constraints(
     variables: list[str],
-    petri_net: DiGraph,
+    petri_net: PetriNet,
     problem: str = "min",
     reverse_time: bool = False,
     ensure_subspace: BooleanSpace | None = None,
     avoid_subspaces: list[BooleanSpace] | None = None,
     optimize_source_variables: list[str] | None = None,
+    use_backend: bool = True,
 ) -> Control:
     """
     Translate the given Petri net into a logic program that solves
@@ -229,6 +309,46 @@ def _create_clingo_constraints(
     # TODO: Explain what remaining options mean and why we need them?
     ctl = Control(["0", "--heuristic=Domain", "--enum-mod=domRec", dom_mod])
 
+    if use_backend:
+        _add_backend_rules(
+            ctl,
+            variables,
+            petri_net,
+            problem,
+            reverse_time,
+            ensure_subspace,
+            avoid_subspaces,
+            optimize_source_variables,
+        )
+    else:
+        _add_text_rules(
+            ctl,
+            variables,
+            petri_net,
+            problem,
+            reverse_time,
+            ensure_subspace,
+            avoid_subspaces,
+            optimize_source_variables,
+        )
+
+    return ctl
+
+
+def _add_text_rules(
+    ctl: Control,
+    variables: list[str],
+    petri_net: PetriNet,
+    problem: str,
+    reverse_time: bool,
+    ensure_subspace: BooleanSpace,
+    avoid_subspaces: list[BooleanSpace],
+    optimize_source_variables: list[str],
+):
+    """
+    Add the rules of the logic program created by :func:`_create_clingo_constraints`
+    as text (which is then parsed and grounded by `clingo`).
+    """
     # Declare places and their conflicts based on network variables.
     for var_name in variables:
         p_name = variable_to_place(var_name, positive=True)
@@ -255,31 +375,30 @@ def _create_clingo_constraints(
         fixed_vars = ", ".join(fixed_list)
         ctl.add(f":- {fixed_vars}.")
 
+    names = petri_net.place_names()
     free_places: list[str] = []
-    for node, kind in petri_net.nodes(data="kind"):  # type: ignore # noqa
-        assert isinstance(node, str)
-        if kind == "place":
-            if place_to_variable(node)[0] not in ensure_subspace:
-                free_places.append(node)
-        elif kind == "transition":
-            if not reverse_time:
-                # Compute siphons.
-                predecessors: list[str] = list(petri_net.predecessors(node))  # type: ignore # noqa
-                p_disjunction = "; ".join(predecessors)
-                for successor in petri_net.successors(node):  # type: ignore # noqa
-                    if (
-                        successor not in predecessors
-                    ):  # optimize obvious tautologies # noqa
-                        ctl.add(f"{p_disjunction} :- {successor}.")
-            else:
-                # Compute traps.
-                successors = list(petri_net.successors(node))  # type: ignore # noqa
-                s_disjunction = "; ".join(successors)  # type: ignore # noqa
-                for predecessor in petri_net.predecessors(node):  # type: ignore # noqa
-                    if predecessor not in successors:
-                        ctl.add(f"{s_disjunction} :- {predecessor}.")
+    for var, p_name, n_name in zip(
+        petri_net.variables, names[1::2], names[0::2], strict=True
+    ):
+        if var not in ensure_subspace:
+            free_places.append(p_name)
+            free_places.append(n_name)
+
+    for t in range(petri_net.transition_count()):
+        predecessors = [names[p] for p in petri_net.pre_set(t)]
+        successors = [names[p] for p in petri_net.post_set(t)]
+        if not reverse_time:
+            # Compute siphons.
+            p_disjunction = "; ".join(predecessors)
+            for successor in successors:
+                if successor not in predecessors:  # optimize obvious tautologies
+                    ctl.add(f"{p_disjunction} :- {successor}.")
         else:
-            raise Exception(f"Unexpected node kind: `{kind}`.")
+            # Compute traps.
+            s_disjunction = "; ".join(successors)
+            for predecessor in predecessors:
+                if predecessor not in successors:
+                    ctl.add(f"{s_disjunction} :- {predecessor}.")
 
     # For maximal trap spaces, we need an extra condition.
     if problem == "max" and len(free_places) > 0:
@@ -295,7 +414,92 @@ def _create_clingo_constraints(
                     f"{variable_to_place(variable, True)}; {variable_to_place(variable, False)}."
                 )
 
-    return ctl
+
+def _add_backend_rules(
+    ctl: Control,
+    variables: list[str],
+    petri_net: PetriNet,
+    problem: str,
+    reverse_time: bool,
+    ensure_subspace: BooleanSpace,
+    avoid_subspaces: list[BooleanSpace],
+    optimize_source_variables: list[str],
+):
+    """
+    Add the rules of the logic program created by :func:`_create_clingo_constraints`
+    directly through the `clingo` backend API.
+
+    The resulting program is the same as in :func:`_add_text_rules`, but no
+    text has to be generated, parsed, or grounded.
+    """
+    with ctl.backend() as backend:
+        atoms: dict[str, int] = {}
+
+        def atom(place: str) -> int:
+            literal = atoms.get(place)
+            if literal is None:
+                literal = backend.add_atom(Function(place))
+                atoms[place] = literal
+            return literal
+
+        # Declare places and their conflicts based on network variables.
+        for var_name in variables:
+            p_atom = atom(variable_to_place(var_name, positive=True))
+            n_atom = atom(variable_to_place(var_name, positive=False))
+            backend.add_rule([p_atom], choice=True)
+            backend.add_rule([n_atom], choice=True)
+            backend.add_rule([], [p_atom, n_atom])
+            if problem == "fix":
+                backend.add_rule([p_atom, n_atom])
+
+        for fixed_var, value in ensure_subspace.items():
+            backend.add_rule([atom(variable_to_place(fixed_var, value != 1))])
+
+        for to_avoid in avoid_subspaces:
+            body = [
+                atom(variable_to_place(var, to_avoid[var] != 1)) for var in to_avoid
+            ]
+            backend.add_rule([], body)
+
+        places = [atom(name) for name in petri_net.place_names()]
+        free_places: list[int] = []
+        for i, var in enumerate(petri_net.variables):
+            if var not in ensure_subspace:
+                free_places.append(places[2 * i + 1])
+                free_places.append(places[2 * i])
+
+        for t in range(petri_net.transition_count()):
+            pre_set = petri_net.pre_set(t)
+            post_set = petri_net.post_set(t)
+            if not reverse_time:
+                # Compute siphons.
+                head = [places[p] for p in pre_set]
+                for successor in post_set:
+                    if successor not in pre_set:
+                        backend.add_rule(head, [places[successor]])
+            else:
+                # Compute traps.
+                head = [places[p] for p in post_set]
+                for predecessor in pre_set:
+                    if predecessor not in post_set:
+                        backend.add_rule(head, [places[predecessor]])
+
+        if problem == "max" and len(free_places) > 0:
+            backend.add_rule(free_places)
+            for variable in optimize_source_variables:
+                if variable not in ensure_subspace:
+                    backend.add_rule(
+                        [
+                            atom(variable_to_place(variable, True)),
+                            atom(variable_to_place(variable, False)),
+                        ]
+                    )
+
+
+def _as_petri_net(petri_net: PetriNet | DiGraph) -> PetriNet:
+    if isinstance(petri_net, PetriNet):
+        return petri_net
+    return PetriNet.from_networkx(petri_net)
 
 
 def _clingo_model_to_fixed_point(model: Model) -> BooleanSpace:
@@ -311,6 +515,9 @@ def _clingo_model_to_fixed_point(model: Model) -> BooleanSpace:
 
     for atom in model.symbols(atoms=True):
         atom_str = str(atom)
+        if not atom_str.startswith(("b0_", "b1_")):
+            # Auxiliary (external) atoms which do not represent places.
+            continue
         (variable, is_positive) = place_to_variable(atom_str)
 
         # This should be prevented by the "conflic-free" property of the result,
@@ -326,77 +533,214 @@ def _clingo_model_to_fixed_point(model: Model) -> BooleanSpace:
     return space
 
 
-def _create_clingo_fixed_point_constraints(
-    variables: list[str],
-    petri_net: DiGraph,
-    ensure_subspace: BooleanSpace | None = None,
-    avoid_subspaces: list[BooleanSpace] | None = None,
-) -> Control:
+class FixedPointSession:
     """
-    Generate the ASP characterizing all deadlocks of the Petri net (equivalently all
-    fixed points of the Boolean network).
+    A persistent `clingo` session for repeated fixed-point queries on the same
+    Petri-net-encoded Boolean network.
+
+    The logic program describing the fixed points of the Petri net is only
+    created and grounded once. Individual queries (see :meth:`solve_async` and
+    :meth:`solve`) then differ only in the solver assumptions:
+
+     - The `retained_set` disables transitions using external atoms instead of
+       modifying the Petri net.
+     - The `ensure_subspace` is enforced through assumptions on the place atoms.
+     - Each unique subspace in `avoid_subspaces` is grounded once (as a constraint
+       guarded by an external atom) and then enabled only for the queries
+       that need it.
+
+    This is substantially faster than :func:`compute_fixed_point_reduced_STG`
+    when many queries are evaluated for the same Petri net, e.g. while
+    optimizing the retained set of a succession diagram node.
+
+    If `instrumentation` is given, the grounding of the logic program is
+    measured as the `grounding` phase and every query as the
+    `candidate_enumeration` phase (of the given `node_id`). If `budget` is
+    given, the queries raise `TimeoutError` or `MemoryError` once the budget
+    is exceeded.
     """
-    if ensure_subspace is None:
-        ensure_subspace = {}
-    if avoid_subspaces is None:
-        avoid_subspaces = []
-    dom_mod = "--dom-mod=3, 16"  # for fixed points
 
-    # "0" specifies that all solutions should be listed (we implement the limit
-    # later using callbacks).
-    # TODO: Explain what remaining options mean and why we need them?
-    ctl = Control(["0", "--heuristic=Domain", "--enum-mod=domRec", dom_mod])
-
-    # Declare places and their conflicts based on network variables.
-    for node in variables:
-        p_name = variable_to_place(node, positive=True)
-        n_name = variable_to_place(node, positive=False)
-
-        # Declare a positive and negative symbol.
-        ctl.add("base", [], f"{{{p_name}}}.")
-        ctl.add("base", [], f"{{{n_name}}}.")
-
-        # Assert there is a fixed point.
-        ctl.add("base", [], f":- {p_name}, {n_name}.")
-        ctl.add("base", [], f"{p_name} ; {n_name}.")
-
-    for node, kind in petri_net.nodes(data="kind"):  # type: ignore
-        if kind == "place":
-            continue
-        elif kind == "transition":
-            preds = list(petri_net.predecessors(node))  # type: ignore
+    def __init__(
+        self,
+        petri_net: PetriNet | DiGraph,
+        instrumentation: Instrumentation | None = None,
+        node_id: int | None = None,
+        budget: Budget | None = None,
+    ):
+        petri_net = _as_petri_net(petri_net)
+        self.variables = set(petri_net.variables)
+        self.avoid_guards: dict[frozenset[tuple[str, int]], Symbol] = {}
+        self.instrumentation = instrumentation
+        self.node_id = node_id
+        self.budget = budget
+
+        dom_mod = "--dom-mod=3, 16"  # for fixed points
+
+        # "0" specifies that all solutions should be listed (we implement the limit
+        # later using callbacks).
+        # TODO: Explain what remaining options mean and why we need them?
+        self.ctl = Control(["0", "--heuristic=Domain", "--enum-mod=domRec", dom_mod])
+
+        # Declare places and their conflicts based on network variables.
+        for node in sorted(self.variables):
+            p_name = variable_to_place(node, positive=True)
+            n_name = variable_to_place(node, positive=False)
+
+            # Declare a positive and negative symbol.
+            self.ctl.add("base", [], f"{{{p_name}}}.")
+            self.ctl.add("base", [], f"{{{n_name}}}.")
+
+            # Assert there is a fixed point.
+            self.ctl.add("base", [], f":- {p_name}, {n_name}.")
+            self.ctl.add("base", [], f"{p_name} ; {n_name}.")
+
+            # Declare the atoms which disable the transitions of this variable
+            # when it is in the retained set.
+            self.ctl.add("base", [], f"#external {_retained_atom(node, 0)}.")
+            self.ctl.add("base", [], f"#external {_retained_atom(node, 1)}.")
+
+        names = petri_net.place_names()
+        for t in range(petri_net.transition_count()):
+            pre = petri_net.pre_set(t)
+            pred_rhs = "; ".join(names[p] for p in pre)
+            # The transition is removed if its variable is retained with
+            # the value of the place that is consumed by the transition
+            # (which is always the first place of the pre-set).
+            consumed = pre[0]
+            var = petri_net.variables[consumed >> 1]
+            guard = f"not {_retained_atom(var, consumed & 1)}"
+            self.ctl.add("base", [], f":- {pred_rhs}; {guard}.")
+
+        self._ground([("base", [])])
+
+    def solve_async(
+        self,
+        on_solution: Callable[[BooleanSpace], bool],
+        retained_set: BooleanSpace | None = None,
+        ensure_subspace: BooleanSpace | None = None,
+        avoid_subspaces: list[BooleanSpace] | None = None,
+    ):
+        """
+        Asynchronous version of :meth:`solve`. The fixed points are returned
+        to the supplied `on_solution` callback. You can stop the enumeration by
+        returning `False` from this callback.
+        """
+        if retained_set is None:
+            retained_set = {}
+        if ensure_subspace is None:
+            ensure_subspace = {}
+        if avoid_subspaces is None:
+            avoid_subspaces = []
+
+        # The retained set and the avoided subspaces are enabled by setting
+        # the corresponding external atoms to true (and they are reset
+        # once the query is finished).
+        enabled: list[Symbol] = []
+        for var, value in retained_set.items():
+            if var not in self.variables:
+                continue
+            enabled.append(Function(_retained_atom(var, value)))
+
+        for to_avoid in avoid_subspaces:
+            enabled.append(self._avoid_guard(to_avoid))
+
+        # Variables that do not appear in the Petri net at all are simply
+        # added to each solution.
+        extra_space: BooleanSpace = {}
+        assumptions: list[tuple[Symbol, bool]] = []
+        for var, value in ensure_subspace.items():
+            if var not in self.variables:
+                extra_space[var] = value
+                continue
+            place_name = variable_to_place(var, positive=bool(value))
+            assumptions.append((Function(place_name), True))
+
+        for atom in enabled:
+            self.ctl.assign_external(atom, True)
+        start = time.perf_counter()
+        budget = self.budget
+        try:
+            if budget is not None:
+                budget.check()
+            with nullcontext() if budget is None else budget.interrupt(self.ctl):
+                result = self.ctl.solve(yield_=True, assumptions=assumptions)
+                if isinstance(result, SolveHandle):
+                    with result as iterator:
+                        for model in iterator:
+                            space = _clingo_model_to_fixed_point(model)
+                            if not on_solution(space | extra_space):
+                                break
+                # Else: unsat, hence we don't do anything.
+            if budget is not None:
+                budget.check()
+        finally:
+            for atom in enabled:
+                self.ctl.assign_external(atom, False)
+            if self.instrumentation is not None:
+                self.instrumentation.record(
+                    "candidate_enumeration", time.perf_counter() - start, self.node_id
+                )
 
-            pred_rhs = "; ".join(preds)  # type: ignore
-            ctl.add("base", [], f":- {pred_rhs}.")
+    def solve(
+        self,
+        retained_set: BooleanSpace | None = None,
+        ensure_subspace: BooleanSpace | None = None,
+        avoid_subspaces: list[BooleanSpace] | None = None,
+        solution_limit: int | None = None,
+    ) -> list[BooleanSpace]:
+        """
+        Compute the fixed points of the Petri net modified by the given `retained_set`.
+
+        The meaning of all parameters is the same as in :func:`compute_fixed_point_reduced_STG`.
+        """
+        results: list[BooleanSpace] = []
+
+        def save_result(x: BooleanSpace) -> bool:
+            results.append(x)
+            if solution_limit is None:
+                return True
+            else:
+                return len(results) < solution_limit
+
+        self.solve_async(save_result, retained_set, ensure_subspace, avoid_subspaces)
+        return results
+
+    def _avoid_guard(self, to_avoid: BooleanSpace) -> Symbol:
+        """
+        Return an external atom which (when true) ensures that fixed points
+        can't lie in the given subspace. The corresponding constraint is
+        grounded when the subspace is first seen.
+        """
+        key = frozenset(to_avoid.items())
+        if key in self.avoid_guards:
+            return self.avoid_guards[key]
+
+        name = f"avoid_{len(self.avoid_guards)}"
+        # Note that this is opposite to the case of trap spaces.
+        # m(x) = 0 ~ place b0_x and m(x) = 1 ~ place b1_x
+        fixed_list = [variable_to_place(var, (to_avoid[var] == 1)) for var in to_avoid]
+        self.ctl.add(name, [], f"#external {name}.")
+        self.ctl.add(name, [], f":- {', '.join(fixed_list + [name])}.")
+        self._ground([(name, [])])
+
+        guard = Function(name)
+        self.avoid_guards[key] = guard
+        return guard
+
+    def _ground(self, parts: list[tuple[str, list[Symbol]]]):
+        if self.instrumentation is None:
+            self.ctl.ground(parts)
         else:
-            raise Exception(f"Unexpected node kind: `{kind}`.")
+            with self.instrumentation.timer("grounding", self.node_id):
+                self.ctl.ground(parts)
 
-    # Ensure that solutions must have desired variables fixed based on `ensure_subspace`.
-    for fixed_var, value in ensure_subspace.items():
-        place_name = variable_to_place(fixed_var, positive=bool(value))
-        ctl.add("base", [], f"{place_name}.")
 
-    # Ensure that fixed points can't lie in either subspace in `avoid_subspaces`.
-    for to_avoid in avoid_subspaces:
-        if len(to_avoid) > 0:
-            """
-            Note that this is opposite to the case of trap spaces.
-            m(x) = 0 ~ place b0_x and m(x) = 1 ~ place b1_x
-            """
-            fixed_list = [
-                variable_to_place(var, (to_avoid[var] == 1)) for var in to_avoid
-            ]
-            fixed_vars = ", ".join(fixed_list)
-            ctl.add("base", [], f":- {fixed_vars}.")
-        else:
-            ctl.add("base", [], "#false.")
-            break  # There is no solution and we do not need to process more.
-
-    return ctl
+def _retained_atom(variable: str, value: int) -> str:
+    return f"retained{value}_{variable}"
 
 
 def compute_fixed_point_reduced_STG_async(
-    petri_net: DiGraph,
+    petri_net: PetriNet | DiGraph,
     retained_set: BooleanSpace,
     on_solution: Callable[[BooleanSpace], bool],
     ensure_subspace: BooleanSpace | None = None,
@@ -414,48 +758,15 @@ def compute_fixed_point_reduced_STG_async(
     `on_solution` callback. You can stop the enumeration by
     returning `False` from this callback.
 
-    See :func:`compute_fixed_point_reduced_STG` for details.
+    See :func:`compute_fixed_point_reduced_STG` for details. If you need to
+    evaluate many queries on the same Petri net, use :class:`FixedPointSession`.
     """
-    if ensure_subspace is None:
-        ensure_subspace = {}
-    if avoid_subspaces is None:
-        avoid_subspaces = []
-
-    # Build a copy of the original Petri net where the
-    # variables in the retained set can only change their
-    # value towards the "retain value".
-    reduced_petri_net: DiGraph = petri_net.copy()  # type: ignore
-    for node in retained_set.keys():
-        b_i = retained_set[node]
-        source_place = variable_to_place(node, positive=(b_i == 1))
-
-        preds = list(reduced_petri_net.predecessors(source_place))  # type: ignore # noqa
-        succs = list(reduced_petri_net.successors(source_place))  # type: ignore # noqa
-
-        deleted_transitions = list(set(succs) - set(preds))  # type: ignore # noqa
-
-        for trans in deleted_transitions:  # type: ignore # noqa
-            reduced_petri_net.remove_node(trans)  # type: ignore # noqa
-
-    ctl = _create_clingo_fixed_point_constraints(
-        extract_variable_names(reduced_petri_net),
-        reduced_petri_net,
-        ensure_subspace,
-        avoid_subspaces,
-    )
-
-    ctl.ground([("base", [])])
-    result = ctl.solve(yield_=True)
-    if isinstance(result, SolveHandle):
-        with result as iterator:
-            for model in iterator:
-                if not on_solution(_clingo_model_to_fixed_point(model)):
-                    break
-    # Else: unsat, hence we don't do anything.
+    session = FixedPointSession(petri_net)
+    session.solve_async(on_solution, retained_set, ensure_subspace, avoid_subspaces)
 
 
 def compute_fixed_point_reduced_STG(
-    petri_net: DiGraph,
+    petri_net: PetriNet | DiGraph,
     retained_set: BooleanSpace = {},
     ensure_subspace: BooleanSpace = {},
     avoid_subspaces: list[BooleanSpace] = [],
@@ -473,7 +784,7 @@ def compute_fixed_point_reduced_STG(
 
     Parameters
     ----------
-    petri_net : DiGraph
+    petri_net : PetriNet | DiGraph
         The Petri net which was created by the implicant encoding from a
         Boolean network. See :mod:`petri_net_translation<biobalm.petri_net_translation>`
         for details.
@@ -5,6 +5,8 @@ from typing import Literal, TypeAlias, TypedDict
 import networkx as nx  # type: ignore
 import biodivine_aeon as ba
 
+from biobalm.petri_net_translation import PetriNet
+
 BooleanSpace: TypeAlias = dict[str, Literal[0, 1]]
 """Type alias for `dict[str, Literal[0, 1]]`. Represents a Boolean subspace, which is defined by a set of fixed node values."""
 SubspaceSuccession: TypeAlias = list[BooleanSpace]
@@ -23,7 +25,7 @@ class SuccessionDiagramState(TypedDict):
     The network rules as an `.aeon` formatted string.
     """
 
-    petri_net: nx.DiGraph
+    petri_net: PetriNet
     """
     The Petri net representation of the network rules (see :mod:`biobalm.petri_net_translation`).
     """
@@ -50,6 +52,17 @@ class SuccessionDiagramState(TypedDict):
     "Global" configuration of a succession diagram.
     """
 
+    modified_nodes: set[int]
+    """
+    The IDs of nodes modified since the diagram was last written into a store
+    (see :class:`biobalm.succession_diagram_store.SuccessionDiagramStore`).
+    """
+
+    synced_revision: str | None
+    """
+    The store revision created by the last write of the diagram.
+    """
+
 
 class NodeData(TypedDict):
     """
@@ -83,6 +96,32 @@ class NodeData(TypedDict):
     and included in the succession diagram.
     """
 
+    deferred: bool
+    """
+    Whether a computation on this node (stable motif enumeration or attractor
+    detection) exceeded the per-node budget (see
+    `SuccessionDiagramConfiguration.node_time_limit` and
+    `SuccessionDiagramConfiguration.node_memory_limit`).
+
+    A deferred node is not expanded again, i.e. the expansion algorithms treat
+    it as a leaf, and its attractors are skipped by the methods that collect
+    attractors of the whole diagram. Set to `False` to allow the computation
+    to be retried.
+    """
+
+    unresolved: bool
+    """
+    Whether the symbolic attractor detection of this node exceeded the symbolic
+    reachability limits (see `SuccessionDiagramConfiguration.symbolic_size_limit`
+    and `SuccessionDiagramConfiguration.symbolic_time_limit`).
+
+    The `attractor_candidates` of an unresolved node only contain the candidates
+    that could not be decided (including the attractor seeds found before the
+    limit was reached), and the node is skipped by the methods that collect
+    attractors of the whole diagram. Computing the attractor seeds of this node
+    again retries the symbolic detection.
+    """
+
     percolated_network: ba.BooleanNetwork | None
     """
     The AEON `BooleanNetwork` that has variables fixed and percolated
@@ -93,7 +132,7 @@ class NodeData(TypedDict):
     often used instead).
     """
 
-    percolated_petri_net: nx.DiGraph | None
+    percolated_petri_net: PetriNet | None
     """
     The Petri net representation of the network rules percolated to the
     node's sub-space (i.e. a Petri net encoding of the `percolated_network`).
@@ -155,8 +194,9 @@ class NodeData(TypedDict):
     value of each variable in the attractor states, or the presence of
     particular oscillation patterns.
 
-    If `None`, these have not been computed, and the node may or may not
-    have associated attractors.
+    If `None`, these have not been computed (or they were erased to save
+    memory, see `SuccessionDiagramConfiguration.attractor_sets_cache_size`), and
+    the node may or may not have associated attractors.
     """
 
 
@@ -193,7 +233,8 @@ class SuccessionDiagramConfiguration(TypedDict):
     """
     For networks larger than this threshold, we only run FVS detection
     instead of NFVS detection. This is still correct, but can produce
-    a larger node set.
+    a larger node set. The threshold only applies to nodes whose NFVS
+    cannot be computed incrementally from a parent node (e.g. the root).
 
 
     There is a trade-off between the speed gains from a smaller node set
@@ -242,3 +283,150 @@ class SuccessionDiagramConfiguration(TypedDict):
     in the recent round. That is, if simulation has actively eliminated some candidates in
     the recent round, it will still continue regardless of the budget limit.
     """
+
+    simulation_walks: int
+    """
+    The number of independent random walks that are used to simulate each
+    attractor candidate state (see `minimum_simulation_budget`). A candidate is
+    eliminated as soon as any of its walks reaches a child space or another
+    candidate. The walks are simulated together in a single bit-sliced batch,
+    hence each walk counts towards the simulation budget. Ensembles are only
+    used in spaces that have child spaces. Default: `1`.
+    """
+
+    symbolic_backward_pruning: bool
+    """
+    If `True`, the symbolic attractor detection first computes the set of
+    states that can reach any child space of the node (a single backward
+    reachability fixpoint) and discards all candidate states in this set
+    before testing the remaining candidates one by one. This is typically
+    faster in nodes where most candidates eventually reach a child space,
+    but the backward fixpoint can be expensive when the child spaces are
+    only reachable from few states. Default: `False`.
+    """
+
+    percolation_cache_size: int
+    """
+    The maximal number of percolated spaces that are cached by the succession
+    diagram (see :class:`biobalm.space_utils.PercolationCache`). The cache is
+    used when creating new nodes and is also shared with the control algorithms
+    (see :func:`biobalm.control.succession_control`). Set to `0` to disable
+    the cache.
+    """
+
+    nfvs_cache_size: int
+    """
+    The maximal number of negative feedback vertex sets of percolated node
+    networks that are cached by the succession diagram (see
+    :class:`biobalm.interaction_graph_utils.FeedbackVertexSetCache`). Set to
+    `0` to disable the cache.
+    """
+
+    attractor_sets_cache_size: int | None
+    """
+    The maximal number of nodes whose (non-empty) `attractor_sets` are kept in
+    memory. Once the limit is exceeded, the attractor sets of the least recently
+    used node are erased, and they are recomputed from the `attractor_seeds` if
+    they are needed again (see
+    :meth:`biobalm.SuccessionDiagram.node_attractor_sets`). Default: `None`
+    (no limit).
+    """
+
+    resident_node_limit: int | None
+    """
+    The maximal number of nodes whose `NodeData` are kept in memory while
+    the diagram is backed by a store (see
+    :meth:`biobalm.SuccessionDiagram.attach_store`). Once the limit is exceeded
+    by an operation that processes many nodes (e.g. expansion or attractor
+    detection in all nodes), the diagram is written into the store and the data
+    of the least recently used nodes are removed from memory until only half of
+    the limit remains. Such data are then loaded from the store on demand.
+    Default: `None` (no limit).
+    """
+
+    checkpoint_interval: int
+    """
+    The minimal number of seconds between two checkpoints of an expansion
+    algorithm (see :meth:`biobalm.SuccessionDiagram.resume_from`). Set to `0` to
+    save a checkpoint after every expanded node.
+    """
+
+    node_time_limit: float | None
+    """
+    The maximal number of seconds that can be spent on a single stable motif
+    enumeration or attractor computation of one node. If the limit is exceeded,
+    the node is marked as `deferred` (see :class:`biobalm.types.NodeData`) and
+    the computation continues with the remaining nodes. Methods that compute
+    the attractors of a single node (e.g.
+    :meth:`biobalm.SuccessionDiagram.node_attractor_seeds`) raise `TimeoutError`
+    after marking the node. Default: `None` (no limit).
+    """
+
+    node_memory_limit: int | None
+    """
+    The maximal number of bytes by which the memory usage of the process can
+    increase during a single stable motif enumeration or attractor computation
+    of one node. If the limit is exceeded, the node is marked as `deferred` (same
+    as for `node_time_limit`, but `MemoryError` is raised). Default: `None`
+    (no limit).
+    """
+
+    symbolic_size_limit: int | None
+    """
+    The maximal size (in BDD nodes) of a set of states that is computed by the
+    symbolic attractor detection of one node. If the limit is exceeded, the
+    node is marked as `unresolved` (see :class:`biobalm.types.NodeData`) and
+    the computation continues with the remaining nodes. Methods that compute
+    the attractors of a single node (e.g.
+    :meth:`biobalm.SuccessionDiagram.node_attractor_seeds`) raise `RuntimeError`
+    after marking the node. Default: `None` (no limit).
+    """
+
+    symbolic_time_limit: float | None
+    """
+    The maximal number of seconds that can be spent in the symbolic reachability
+    procedures of one node (the rest of the symbolic attractor detection, e.g.
+    building the symbolic sets, does not count). If the limit is exceeded,
+    the node is marked as `unresolved` (same as for `symbolic_size_limit`).
+    Default: `None` (no limit).
+    """
+
+
+class PhaseStatistics(TypedDict):
+    """
+    A `TypedDict` class that stores the statistics of one computation phase
+    measured by :class:`biobalm.instrumentation.Instrumentation`.
+    """
+
+    calls: int
+    """
+    The number of times the phase was executed.
+    """
+
+    seconds: float
+    """
+    The total time spent in the phase (in seconds).
+    """
+
+
+class AttractorSummary(TypedDict):
+    """
+    A `TypedDict` class that stores a compact description of one attractor set,
+    which can be used instead of the full `biodivine_aeon.VertexSet` (see
+    :meth:`biobalm.SuccessionDiagram.node_attractor_summaries`).
+    """
+
+    fixed: BooleanSpace
+    """
+    The variables that have the same value in all attractor states.
+    """
+
+    oscillating: list[str]
+    """
+    The variables that change their value within the attractor.
+    """
+
+    cardinality: int
+    """
+    The number of attractor states.
+    """
@@ -0,0 +1,136 @@
+from biodivine_aeon import AsynchronousGraph, BooleanNetwork, ColoredVertexSet
+
+from biobalm._sd_attractors.attractor_symbolic import (
+    SymbolicReachability,
+    compute_attractors_symbolic,
+)
+from biobalm.succession_diagram import SuccessionDiagram
+from biobalm.symbolic_utils import state_list_to_bdd
+from biobalm.types import BooleanSpace
+
+
+def test_symbolic_reachability():
+    # A complex attractor in `c=0` and a fixed-point `a=0,b=0,c=1`.
+    bn = BooleanNetwork.from_bnet(
+        """
+        a, !b & !c
+        b, a & !c
+        c, c & !a & !b
+        """
+    )
+    graph = AsynchronousGraph(bn)
+    ctx = graph.symbolic_context()
+    candidates: list[BooleanSpace] = [
+        {"a": 1, "b": 0, "c": 0},
+        {"a": 1, "b": 1, "c": 0},
+        {"a": 1, "b": 0, "c": 1},
+        {"a": 0, "b": 0, "c": 1},
+    ]
+    # The second candidate is not in the avoid set (otherwise, the first
+    # test would fail by reaching it).
+    avoid_states = [candidates[0], candidates[2], candidates[3]]
+    avoid = ColoredVertexSet(ctx, state_list_to_bdd(ctx, avoid_states))
+    engine = SymbolicReachability(graph, avoid)
+
+    attractor = engine.attractor_test(candidates[0])
+    assert attractor is not None and attractor.cardinality() == 4
+    # The second candidate lies in the known attractor.
+    assert engine.attractor_test(candidates[1]) is None
+    # The third candidate can reach the first attractor.
+    assert engine.attractor_test(candidates[2]) is None
+    fixed_point = engine.attractor_test(candidates[3])
+    assert fixed_point is not None and fixed_point.cardinality() == 1
+    assert engine.closures == [attractor, fixed_point]
+
+    # Without the individual closures, the results are the same.
+    avoid = ColoredVertexSet(ctx, state_list_to_bdd(ctx, avoid_states))
+    engine = SymbolicReachability(graph, avoid, keep_closures=False)
+    assert engine.attractor_test(candidates[0]) == attractor
+    assert engine.attractor_test(candidates[1]) is None
+    assert engine.attractor_test(candidates[2]) is None
+    assert engine.attractor_test(candidates[3]) == fixed_point
+    assert engine.closures == []
+
+
+def test_seeds_only(network_file: str):
+    bn = BooleanNetwork.from_file(network_file)
+    sd = SuccessionDiagram(bn)
+    if not sd.expand_bfs(size_limit=100):
+        return
+
+    for node_id in sd.node_ids():
+        candidates = sd.node_attractor_candidates(node_id, compute=True)
+        if len(candidates) == 0:
+            continue
+        (seeds, sets, _) = compute_attractors_symbolic(sd, node_id, candidates)
+        (fast_seeds, fast_sets, _) = compute_attractors_symbolic(
+            sd, node_id, candidates, seeds_only=True
+        )
+        assert sets is not None and len(sets) == len(seeds)
+        assert fast_sets is None
+        # The last candidate of a minimal node is not tested.
+        if not sd.node_is_minimal(node_id):
+            assert fast_seeds == seeds
+
+
+def test_symbolic_limits():
+    bn = BooleanNetwork.from_bnet(
+        """
+        a, !b
+        b, a
+        """
+    )
+    graph = AsynchronousGraph(bn)
+    avoid = graph.mk_empty_colored_vertices()
+
+    engine = SymbolicReachability(graph, avoid, size_limit=1)
+    assert engine.attractor_test({"a": 0, "b": 0}) is None
+    assert engine.interrupted is not None
+    # Once interrupted, the engine does not continue with other tests.
+    assert engine.attractor_test({"a": 1, "b": 1}) is None
+    assert engine.closures == []
+
+    engine = SymbolicReachability(graph, avoid, time_limit=0.0)
+    assert engine.attractor_test({"a": 0, "b": 0}) is None
+    assert engine.interrupted is not None
+
+    engine = SymbolicReachability(graph, avoid, size_limit=100, time_limit=60.0)
+    attractor = engine.attractor_test({"a": 0, "b": 0})
+    assert attractor is not None and attractor.cardinality() == 4
+    assert engine.interrupted is None
+
+
+def test_backward_pruning(network_file: str):
+    bn = BooleanNetwork.from_file(network_file)
+    sd = SuccessionDiagram(bn)
+    if not sd.expand_bfs(size_limit=1000):
+        return
+    config = SuccessionDiagram.default_config()
+    config["symbolic_backward_pruning"] = True
+    pruned = SuccessionDiagram(bn, config)
+    assert pruned.expand_bfs(size_limit=1000)
+
+    for node_id in sd.node_ids():
+        assert pruned.node_attractor_seeds(
+            node_id, compute=True
+        ) == sd.node_attractor_seeds(node_id, compute=True)
+
+
+def test_prune_basin():
+    # Every state except the fixed-point `a=1,b=1` can reach the child space `c=1`.
+    bn = BooleanNetwork.from_bnet(
+        """
+        a, a
+        b, b
+        c, c | !a | !b
+        """
+    )
+    graph = AsynchronousGraph(bn)
+    children = graph.mk_subspace({"c": 1})
+    engine = SymbolicReachability(graph, children)
+
+    basin = engine.prune_basin(children)
+    assert basin is not None and basin.cardinality() == 7
+    assert not engine.avoid.intersect(graph.mk_subspace({"a": 0, "c": 0})).is_empty()
+    attractor = engine.attractor_test({"a": 1, "b": 1, "c": 0})
+    assert attractor is not None and attractor.cardinality() == 1
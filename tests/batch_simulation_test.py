@@ -0,0 +1,84 @@
+import random
+
+from biodivine_aeon import AsynchronousGraph, Attractors, BooleanNetwork
+
+from biobalm._sd_attractors.batch_simulation import BatchSimulator, minify_candidates
+from biobalm.interaction_graph_utils import cleanup_network
+from biobalm.symbolic_utils import state_list_to_bdd
+from biobalm.types import BooleanSpace
+
+
+def test_batch_simulation_encoding(network_file: str):
+    bn = cleanup_network(BooleanNetwork.from_file(network_file))
+    simulator = BatchSimulator(AsynchronousGraph(bn))
+    names = bn.variable_names()
+
+    generator = random.Random(1234)
+    for _ in range(20):
+        state: BooleanSpace = {var: generator.choice([0, 1]) for var in names}
+        assert simulator.decode(simulator.encode(state)) == state
+
+
+def test_batch_simulation_minification():
+    bn = BooleanNetwork.from_bnet(
+        """
+        a, !b
+        b, a
+        c, c | a & b
+        d, !d & c
+        """
+    )
+    graph = AsynchronousGraph(bn)
+    simulator = BatchSimulator(graph)
+    names = graph.network_variable_names()
+
+    # All states, where `c=1` is the avoided space.
+    states = [{var: (i >> j) & 1 for j, var in enumerate(names)} for i in range(16)]
+    candidates = [simulator.encode(state) for state in states]  # type: ignore
+    avoid = simulator.compile(state_list_to_bdd(graph.symbolic_context(), [{"c": 1}]))
+    assert minify_candidates(simulator, candidates, avoid, 64, random.Random(1)) == []
+
+    # Without the avoided space, the complex attractor in `c=1` must keep
+    # at least one candidate.
+    result = minify_candidates(simulator, candidates, None, 64, random.Random(1))
+    assert len(result) >= 1
+    attractor_bdds = [a.to_bdd() for a in Attractors.attractors(graph)]
+    for attractor in attractor_bdds:
+        result_bdd = state_list_to_bdd(
+            graph.symbolic_context(), [simulator.decode(s) for s in result]
+        )
+        assert not attractor.l_and(result_bdd).is_false()
+
+
+def test_batch_simulation_ensemble(network_file: str):
+    # Every attractor that contains a candidate must keep a candidate, regardless
+    # of the number of walks.
+    bn = cleanup_network(BooleanNetwork.from_file(network_file))
+    if bn.variable_count() > 12:
+        return
+    graph = AsynchronousGraph(bn)
+    ctx = graph.symbolic_context()
+    simulator = BatchSimulator(graph)
+    names = graph.network_variable_names()
+    attractor_bdds = [a.to_bdd() for a in Attractors.attractors(graph)]
+
+    generator = random.Random(1234)
+    states: list[BooleanSpace] = [
+        {var: generator.choice([0, 1]) for var in names} for _ in range(100)
+    ]
+    candidates = [simulator.encode(state) for state in states]
+    avoid_bdd = state_list_to_bdd(ctx, [{names[0]: 1}])
+    candidates_bdd = state_list_to_bdd(ctx, states)
+    for walks in [1, 4]:
+        avoid = simulator.compile(avoid_bdd)
+        result = minify_candidates(
+            simulator, candidates, avoid, 32, random.Random(1), walks
+        )
+        assert len(result) <= len(candidates)
+        result_bdd = state_list_to_bdd(ctx, [simulator.decode(s) for s in result])
+        for attractor in attractor_bdds:
+            if (
+                attractor.l_and(avoid_bdd).is_false()
+                and not attractor.l_and(candidates_bdd).is_false()
+            ):
+                assert not attractor.l_and(result_bdd).is_false()
@@ -0,0 +1,64 @@
+import itertools
+
+from biodivine_aeon import AsynchronousGraph, BooleanNetwork
+
+from biobalm.compact_space import CompactSpace, SpaceEncoder
+from biobalm.space_utils import intersect, is_subspace, space_unique_key
+from biobalm.types import BooleanSpace
+
+
+def all_spaces(variables: list[str]) -> list[BooleanSpace]:
+    spaces: list[BooleanSpace] = []
+    for values in itertools.product([None, 0, 1], repeat=len(variables)):
+        spaces.append({v: x for v, x in zip(variables, values) if x is not None})  # type: ignore
+    return spaces
+
+
+def test_compact_space_operations():
+    bn = BooleanNetwork.from_bnet(
+        """
+        a, c & b
+        b, !a
+        c, c
+    """
+    )
+    encoder = SpaceEncoder.from_network(bn)
+    assert encoder.variables == ["a", "b", "c"]
+    assert str(encoder) == str(SpaceEncoder.from_network(AsynchronousGraph(bn)))
+
+    spaces = all_spaces(encoder.variables)
+    for x in spaces:
+        cx = encoder.encode(x)
+        assert encoder.decode(cx) == x
+        assert cx.fixed_count() == len(x)
+        assert encoder.unpack(encoder.pack(cx)) == cx
+        assert encoder.unique_key(cx) == space_unique_key(x, bn)
+        for y in spaces:
+            cy = encoder.encode(y)
+            assert (cx == cy) == (x == y)
+            assert cx.is_subspace(cy) == is_subspace(x, y)
+            xy = intersect(x, y)
+            cxy = cx.intersect(cy)
+            if xy is None:
+                assert cxy is None
+            else:
+                assert cxy is not None
+                assert encoder.decode(cxy) == xy
+
+    assert encoder.encode({}) == CompactSpace(0, 0)
+    try:
+        encoder.encode({"d": 1})
+        raise AssertionError("Unknown variable not detected.")
+    except IndexError:
+        pass
+
+
+def test_compact_space_large_network():
+    # Make sure that keys work beyond the size of a single machine word.
+    variables = [f"x_{i}" for i in range(200)]
+    bn = BooleanNetwork.from_bnet("\n".join(f"{v}, {v}" for v in variables))
+    encoder = SpaceEncoder.from_network(bn)
+    for i in range(0, 200, 7):
+        space: BooleanSpace = {variables[i]: 1, variables[199 - i]: 0}
+        assert encoder.space_key(space) == space_unique_key(space, bn)
+        assert encoder.decode(encoder.encode(space)) == space
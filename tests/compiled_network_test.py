@@ -0,0 +1,157 @@
+import random
+
+from biodivine_aeon import AsynchronousGraph, BooleanNetwork
+
+from biobalm.compact_space import CompactSpace
+from biobalm.compiled_network import CompiledNetwork
+from biobalm.drivers import find_single_node_LDOIs
+from biobalm.interaction_graph_utils import cleanup_network
+from biobalm.space_utils import (
+    percolate_space,
+    percolate_space_strict,
+    percolation_conflicts,
+)
+from biobalm.symbolic_utils import function_eval
+from biobalm.types import BooleanSpace
+
+
+def percolate_space_strict_bdd(
+    graph: AsynchronousGraph, space: BooleanSpace
+) -> BooleanSpace:
+    # A reference implementation of strict percolation which evaluates the
+    # update function BDDs directly.
+    result: BooleanSpace = {}
+    restriction: BooleanSpace = dict(space)
+    candidates = set(graph.network_variable_names())
+    for var in graph.network_variable_names():
+        fn_bdd = graph.mk_update_function(var)
+        if fn_bdd.is_true() or fn_bdd.is_false():
+            candidates.remove(var)
+
+    done = False
+    while not done:
+        done = True
+        for var in sorted(candidates):
+            fn_value = function_eval(graph.mk_update_function(var), restriction)
+            if fn_value is not None:
+                if var not in restriction or restriction[var] == fn_value:
+                    done = False
+                    restriction[var] = fn_value
+                    result[var] = fn_value
+                candidates.remove(var)
+    return result
+
+
+def test_compiled_percolation(network_file: str):
+    # The compiled network must give the same results as the BDD-based
+    # percolation, including spaces that conflict with the network.
+    bn = cleanup_network(BooleanNetwork.from_file(network_file))
+    graph = AsynchronousGraph(bn)
+    compiled = CompiledNetwork(graph)
+    # Without cube tables, all functions are evaluated using BDDs.
+    compiled_bdd = CompiledNetwork(graph, cube_limit=0)
+    encoder = compiled.encoder
+    names = graph.network_variable_names()
+
+    generator = random.Random(1234)
+    for _ in range(20):
+        size = generator.randint(0, min(5, len(names)))
+        space: BooleanSpace = {
+            var: generator.choice([0, 1]) for var in generator.sample(names, size)
+        }
+        compact = encoder.encode(space)
+
+        expected = percolate_space(graph, space)
+        assert encoder.decode(compiled.percolate(compact)) == expected
+        assert encoder.decode(compiled_bdd.percolate(compact)) == expected
+
+        expected = percolate_space_strict_bdd(graph, space)
+        assert encoder.decode(compiled.percolate_strict(compact)) == expected
+        assert encoder.decode(compiled_bdd.percolate_strict(compact)) == expected
+        assert percolate_space_strict(graph, space) == expected
+        assert percolate_space_strict(graph, space, compiled) == expected
+        assert percolation_conflicts(graph, space) == percolation_conflicts(
+            graph, space, compiled=compiled
+        )
+
+        for var in graph.network_variables():
+            fn_bdd = graph.mk_update_function(var)
+            expected_value = function_eval(fn_bdd, space)
+            assert compiled.eval_space(int(var), compact) == expected_value
+            assert compiled_bdd.eval_space(int(var), compact) == expected_value
+
+
+def test_compiled_evaluation(network_file: str):
+    # Single states and batches of states must evaluate the same as the BDDs.
+    bn = cleanup_network(BooleanNetwork.from_file(network_file))
+    graph = AsynchronousGraph(bn)
+    compiled = CompiledNetwork(graph)
+    encoder = compiled.encoder
+    names = graph.network_variable_names()
+
+    generator = random.Random(1234)
+    states: list[BooleanSpace] = [
+        {var: generator.choice([0, 1]) for var in names} for _ in range(30)
+    ]
+    encoded = [encoder.encode(state).values for state in states]
+    slices = compiled.to_slices(encoded)
+    assert compiled.from_slices(slices, list(range(len(states)))) == encoded
+    assert compiled.from_slices(slices, [3, 1]) == [encoded[3], encoded[1]]
+
+    full = (1 << len(states)) - 1
+    for var in graph.network_variables():
+        fn_bdd = graph.mk_update_function(var)
+        batch = compiled.eval_batch(int(var), slices, full)
+        for k, state in enumerate(states):
+            expected = function_eval(fn_bdd, state)
+            assert compiled.eval_state(int(var), encoded[k]) == expected
+            assert (batch >> k) & 1 == expected
+
+
+def test_compiled_parity_function():
+    # The cube tables of a wide parity function are never built.
+    inputs = [f"x{i}" for i in range(18)]
+    rules = [f"{x}, {x}" for x in inputs] + [f"y, {' ^ '.join(inputs)}"]
+    graph = AsynchronousGraph(BooleanNetwork.from_bnet("\n".join(rules)))
+    compiled = CompiledNetwork(graph)
+    y = compiled.encoder.indices["y"]
+
+    ldoi = compiled.percolate_strict(compiled.encoder.encode({"x0": 1}))
+    assert compiled.encoder.decode(ldoi) == {"x0": 1}
+    assert compiled.cubes(y) is None
+    assert compiled.cubes(0) is not None
+
+    fixed = {x: 1 for x in inputs}
+    expected: BooleanSpace = {"y": 0, **fixed}
+    assert (
+        compiled.encoder.decode(
+            compiled.percolate_strict(compiled.encoder.encode(fixed))
+        )
+        == expected
+    )
+    assert compiled.eval_state(y, compiled.encoder.encode(fixed).values) == 0
+
+
+def test_compiled_single_node_LDOIs():
+    bn = BooleanNetwork.from_bnet(
+        """
+        a, !b
+        b, a
+        c, a & c & d | b & !c | c & !d
+        d, !a | d
+        e, true
+        """
+    )
+    graph = AsynchronousGraph(bn)
+    compiled = CompiledNetwork(graph)
+
+    assert compiled.constants == [4]
+    assert compiled.constant_space == CompactSpace(0b10000, 0b10000)
+    LDOIs = compiled.single_node_LDOIs()
+    assert LDOIs == find_single_node_LDOIs(graph)
+    assert set(LDOIs) == {(v, x) for v in ["a", "b", "c", "d"] for x in [0, 1]}
+    for (var, value), ldoi in LDOIs.items():
+        assert ldoi == percolate_space_strict_bdd(graph, {var: value})  # type: ignore
+    assert compiled.encoder.decode(
+        compiled.percolate_strict(compiled.encoder.encode({"a": 1}))
+    ) == {"b": 1, "c": 1}
@@ -183,6 +183,13 @@ def test_all_succession_control():
     for intervention in interventions:
         assert intervention in true_interventions
 
+    # Both successions start with the same node, so the percolation
+    # results of its drivers are reused.
+    hits = sd.percolation_cache.hits
+    assert hits > 0
+    assert succession_control(sd, target, strategy="all") == interventions
+    assert sd.percolation_cache.hits > hits
+
 
 def test_forbidden_drivers():
     sd = SuccessionDiagram.from_rules(
@@ -1,7 +1,11 @@
 from biodivine_aeon import BooleanNetwork, AsynchronousGraph
 from networkx import DiGraph  # type:ignore
 
-from biobalm.interaction_graph_utils import feedback_vertex_set, source_nodes
+from biobalm.interaction_graph_utils import (
+    FeedbackVertexSetCache,
+    feedback_vertex_set,
+    source_nodes,
+)
 from biobalm.space_utils import percolate_network, percolate_space
 
 # There should be a negative cycle between b_1 and b_2,
@@ -453,3 +457,33 @@ def test_fvs_determinism_SIPC():
     for _i in range(10):
         nfvs = feedback_vertex_set(bn_real, "negative")
         assert nfvs == nfvs_mtsNFVS
+
+
+def test_fvs_cache():
+    cache = FeedbackVertexSetCache(2, parity="negative")
+
+    # Every set of vertices is an FVS of the full graph, hence it is
+    # a valid hint. Only the necessary vertices are kept.
+    names = CYCLES_BN.variable_names()
+    nfvs = cache.feedback_vertex_set(CYCLES_BN, names)
+    assert len(nfvs) == 2
+    assert ("b_1" in nfvs) or ("b_2" in nfvs)
+    remaining = [x for x in names if x not in nfvs]
+    assert feedback_vertex_set(CYCLES_BN, parity="negative", subgraph=remaining) == []
+
+    # Without the negative "b" cycle, only the "d" cycle must be repaired.
+    bn = CYCLES_BN.to_aeon().replace("b_2 -| b_1", "")
+    bn = BooleanNetwork.from_aeon(bn)
+    sub_nfvs = cache.feedback_vertex_set(bn, nfvs)
+    assert len(sub_nfvs) == 1 and sub_nfvs[0] in nfvs
+
+    # Networks with the same regulatory graph share the result.
+    assert (
+        cache.feedback_vertex_set(BooleanNetwork.from_aeon(CYCLES_BN.to_aeon())) == nfvs
+    )
+    assert cache.hits == 1
+    assert cache.misses == 2
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == 0 and cache.misses == 0
@@ -4,8 +4,11 @@ from biodivine_aeon import BooleanNetwork
 from networkx import DiGraph, is_isomorphic  # type: ignore
 
 from biobalm.petri_net_translation import (
+    PetriNet,
+    extract_source_variables,
     extract_variable_names,
     network_to_petrinet,
+    restrict_petrinet_to_subspace,
     sanitize_network_names,
 )
 
@@ -70,4 +73,91 @@ def test_translation():
 
     pn = network_to_petrinet(bn)
     assert ["A", "B"] == extract_variable_names(pn)
-    assert is_isomorphic(pn, expected)
+    assert is_isomorphic(pn.to_networkx(), expected)
+
+
+def test_restriction():
+    bn = BooleanNetwork.from_bnet(
+        """
+        A, !A & B
+        B, !B & !A
+    """
+    )
+    pn = network_to_petrinet(bn)
+    pn_graph = pn.to_networkx()
+    pn_size = (pn.place_count(), pn.transition_count())
+
+    # With A=0, B can still go up and down.
+    expected = DiGraph()
+    expected.add_node("b0_B", kind="place")
+    expected.add_node("b1_B", kind="place")
+    expected.add_node("tr_B_up_1", kind="transition")
+    expected.add_edge("b0_B", "tr_B_up_1")
+    expected.add_edge("tr_B_up_1", "b1_B")
+    expected.add_node("tr_B_down_1", kind="transition")
+    expected.add_edge("b1_B", "tr_B_down_1")
+    expected.add_edge("tr_B_down_1", "b0_B")
+
+    restricted = restrict_petrinet_to_subspace(pn, {"A": 0, "C": 1})
+    assert isinstance(restricted, PetriNet)
+    assert ["B"] == extract_variable_names(restricted)
+    restricted_graph = restricted.to_networkx()
+    assert is_isomorphic(restricted_graph, expected)
+    for node in restricted_graph.nodes:
+        assert restricted_graph.nodes[node] == pn_graph.nodes[node]
+        assert list(restricted_graph.pred[node]) == [
+            x for x in pn_graph.pred[node] if x in restricted_graph.nodes
+        ]
+        assert list(restricted_graph.succ[node]) == [
+            x for x in pn_graph.succ[node] if x in restricted_graph.nodes
+        ]
+
+    # The `DiGraph` representation is restricted the same way.
+    restricted_nx = restrict_petrinet_to_subspace(pn_graph, {"A": 0, "C": 1})
+    assert isinstance(restricted_nx, DiGraph)
+    assert list(restricted_nx.nodes(data=True)) == list(
+        restricted_graph.nodes(data=True)
+    )
+    assert list(restricted_nx.edges) == list(restricted_graph.edges)
+
+    # With A=1, B can only go down.
+    expected.remove_node("tr_B_up_1")
+    restricted = restrict_petrinet_to_subspace(pn, {"A": 1})
+    assert is_isomorphic(restricted.to_networkx(), expected)
+
+    # The original Petri net is not modified.
+    assert (pn.place_count(), pn.transition_count()) == pn_size
+
+
+def test_petri_net_structure():
+    bn = BooleanNetwork.from_bnet(
+        """
+        A, A
+        B, A & C
+        C, !B
+    """
+    )
+    pn = network_to_petrinet(bn)
+    assert pn.variables == ["A", "B", "C"]
+    assert pn.place_names() == ["b0_A", "b1_A", "b0_B", "b1_B", "b0_C", "b1_C"]
+    assert extract_source_variables(pn) == ["A"]
+    assert list(pn.variable_transitions(0)) == []
+
+    for var in range(len(pn.variables)):
+        for t in pn.variable_transitions(var):
+            assert pn.transition_variable(t) == var
+            # The changed place is always the first place of both sets,
+            # the remaining places are read-only.
+            pre = pn.pre_set(t)
+            post = pn.post_set(t)
+            assert pre[0] >> 1 == var and post[0] == pre[0] ^ 1
+            assert sorted(pre[1:]) == sorted(post[1:])
+            assert all(p >> 1 != var for p in pre[1:])
+
+    # Converting to `DiGraph` and back gives the same Petri net.
+    copy = PetriNet.from_networkx(pn.to_networkx())
+    assert copy.variables == pn.variables
+    assert copy.transitions == pn.transitions
+    for t in range(pn.transition_count()):
+        assert copy.pre_set(t) == pn.pre_set(t)
+        assert copy.post_set(t) == pn.post_set(t)
@@ -1,6 +1,7 @@
 from biodivine_aeon import AsynchronousGraph, BooleanExpression, BooleanNetwork
 
 from biobalm.space_utils import (
+    PercolationCache,
     expression_to_space_list,
     is_subspace,
     percolate_network,
@@ -72,6 +73,32 @@ def test_space_percolation():
     assert {"b": 1, "c": 1} == percolate_space_strict(graph, {"a": 1})
 
 
+def test_percolation_cache():
+    bn = BooleanNetwork.from_bnet(
+        """
+    a, !b
+    b, a
+    c, a & c & d | b & !c | c & !d
+    d, !a | d
+    """
+    )
+    graph = AsynchronousGraph(bn)
+    cache = PercolationCache(graph, 2)
+
+    for space in [{"a": 1}, {"d": 1}, {"a": 1}, {"a": 0, "c": 1}, {"d": 1}]:
+        result = cache.percolate(space)  # type: ignore
+        assert result == percolate_space(graph, space)  # type: ignore
+        # Modifying the result must not modify the cached value.
+        result["b"] = 0
+
+    assert cache.hits == 1
+    assert cache.misses == 4
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == 0 and cache.misses == 0
+
+
 def test_constant_percolation():
     bn = BooleanNetwork.from_bnet(
         """
@@ -0,0 +1,189 @@
+import pickle
+from pathlib import Path
+
+import pytest
+from biodivine_aeon import BooleanNetwork
+
+from biobalm.succession_diagram import SuccessionDiagram
+from biobalm.succession_diagram_store import SuccessionDiagramStore
+
+
+def test_store_incremental_write(tmp_path: Path):
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+    sd = SuccessionDiagram(bn)
+    path = str(tmp_path / "sd.sqlite")
+
+    with SuccessionDiagramStore(path) as store:
+        assert not sd.expand_bfs(bfs_level_limit=3)
+        store.write(sd)
+        assert len(store) == len(sd)
+
+        assert sd.expand_bfs(bfs_level_limit=10)
+        for node_id in sd.minimal_trap_spaces():
+            sd.node_attractor_seeds(node_id, compute=True)
+        store.write(sd)
+        assert len(store) == len(sd)
+
+    # Reading the stored data lazily.
+    with SuccessionDiagramStore(path, cache_size=10) as store:
+        for node_id in sd.node_ids():
+            data = sd.node_data(node_id)
+            stored = store.node_data(node_id)
+            assert stored["space"] == data["space"]
+            assert stored["depth"] == data["depth"]
+            assert stored["expanded"] == data["expanded"]
+            assert stored["deferred"] == data["deferred"]
+            assert stored["unresolved"] == data["unresolved"]
+            assert stored["attractor_seeds"] == data["attractor_seeds"]
+            assert store.find_node(data["space"]) == node_id
+            successors = sd.node_successors(node_id)
+            assert store.node_successors(node_id) == successors
+            for child_id in successors:
+                assert store.edge_stable_motif(
+                    node_id, child_id
+                ) == sd.edge_stable_motif(node_id, child_id)
+        assert len(store.cache) == 10
+        assert store.find_node({"unknown": 1}) is None
+        with pytest.raises(KeyError):
+            store.node_data(len(sd))
+
+        # Loading the whole diagram.
+        loaded = store.load()
+        assert loaded.is_isomorphic(sd)
+        assert loaded.config == sd.config
+        assert loaded.summary() == sd.summary()
+        for node_id in sd.node_ids():
+            assert loaded.node_successors(node_id) == sd.node_successors(node_id)
+        assert loaded.expanded_attractor_seeds() == sd.expanded_attractor_seeds()
+
+
+def test_store_network_mismatch():
+    sd1 = SuccessionDiagram.from_rules("A, B\nB, A")
+    sd2 = SuccessionDiagram.from_rules("A, B\nB, A\nC, C & B")
+    with SuccessionDiagramStore(":memory:") as store:
+        with pytest.raises(KeyError):
+            store.load()
+        store.write(sd1)
+        with pytest.raises(ValueError):
+            store.write(sd2)
+
+
+def test_store_writes_modified_nodes():
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+    sd = SuccessionDiagram(bn)
+    assert not sd.expand_bfs(bfs_level_limit=3)
+
+    with SuccessionDiagramStore(":memory:") as store:
+        store.write(sd)
+        assert len(sd.modified_nodes) == 0
+        assert sd.synced_revision is not None
+
+        # Nothing changed, hence only the revision, configuration and NFVS
+        # are rewritten.
+        changes = store.connection.total_changes
+        store.write(sd)
+        assert store.connection.total_changes - changes == 3
+
+        node_id = sd.minimal_trap_spaces()[0]
+        sd.node_attractor_seeds(node_id, compute=True)
+        assert sd.modified_nodes == {node_id}
+        store.write(sd)
+        assert store.node_data(node_id)["attractor_seeds"] == sd.node_attractor_seeds(
+            node_id
+        )
+
+        # A diagram loaded from the store is synchronized with it.
+        loaded = store.load()
+        assert loaded.synced_revision == sd.synced_revision
+        assert len(loaded.modified_nodes) == 0
+
+    # Another store receives the whole diagram.
+    synced_revision = sd.synced_revision
+    with SuccessionDiagramStore(":memory:") as other:
+        other.write(sd)
+        assert len(other) == len(sd)
+        assert sd.synced_revision != synced_revision
+
+
+def test_store_different_diagrams(tmp_path: Path):
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+    sd_bfs = SuccessionDiagram(bn)
+    assert not sd_bfs.expand_bfs(size_limit=200)
+    sd_dfs = SuccessionDiagram(bn)
+    assert not sd_dfs.expand_dfs(size_limit=200)
+    path = str(tmp_path / "sd.sqlite")
+
+    with SuccessionDiagramStore(path) as store:
+        store.write(sd_bfs)
+
+    # The node IDs of the two diagrams do not match.
+    with SuccessionDiagramStore(path) as store:
+        with pytest.raises(ValueError):
+            store.write(sd_dfs)
+        loaded = store.load()
+        assert loaded.is_isomorphic(sd_bfs)
+        assert loaded.node_indices == sd_bfs.node_indices
+
+    # A larger diagram created by the same algorithm extends the stored one.
+    sd = SuccessionDiagram(bn)
+    assert sd.expand_bfs()
+    with SuccessionDiagramStore(path) as store:
+        store.write(sd)
+        loaded = store.load()
+        assert loaded.is_isomorphic(sd)
+        for node_id in sd.node_ids():
+            assert loaded.node_successors(node_id) == sd.node_successors(node_id)
+
+
+def test_store_backed_diagram(tmp_path: Path):
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+    expected = SuccessionDiagram(bn)
+    assert expected.expand_bfs()
+
+    config = SuccessionDiagram.default_config()
+    config["resident_node_limit"] = 20
+    sd = SuccessionDiagram(bn, config)
+    path = str(tmp_path / "sd.sqlite")
+    sd.attach_store(path)
+    with pytest.raises(ValueError):
+        sd.expand_bfs(checkpoint=str(tmp_path / "other.sqlite"))
+    assert sd.expand_bfs(checkpoint=path)
+
+    # Only the recently used nodes keep their data in memory.
+    assert sd.instrumentation.counters["evicted_nodes"] > 0
+    assert len(sd.resident_nodes) < len(sd)
+    assert sd.node_indices == expected.node_indices
+    assert sd.is_isomorphic(expected)
+    for node_id in expected.node_ids():
+        assert sd.node_data(node_id)["depth"] == expected.node_data(node_id)["depth"]
+        for child_id in expected.node_successors(node_id):
+            assert sd.edge_stable_motif(
+                node_id, child_id
+            ) == expected.edge_stable_motif(node_id, child_id)
+
+    # Pickling loads all evicted data.
+    sd.evict_node_data()
+    assert len(sd.resident_nodes) == 0
+    assert pickle.loads(pickle.dumps(sd)).is_isomorphic(expected)
+
+    sd.evict_node_data()
+    assert sd.expanded_attractor_seeds() == expected.expanded_attractor_seeds()
+    # Queries over all nodes also keep only a bounded working set in memory.
+    assert len(sd.resident_nodes) < 100
+    assert sd.expanded_attractor_seeds() == expected.expanded_attractor_seeds()
+    assert len(sd.resident_nodes) < 100
+    sd.detach_store()
+    assert sd.store is None
+
+    # A checkpoint of a store-backed diagram is resumed as store-backed.
+    path = str(tmp_path / "resumed.sqlite")
+    sd = SuccessionDiagram(bn, config)
+    sd.attach_store(path)
+    assert not sd.expand_bfs(size_limit=200, checkpoint=path)
+    sd.detach_store()
+    (sd, result) = SuccessionDiagram.resume_from(path, size_limit=500)
+    assert result
+    assert sd.store is not None
+    assert sd.node_indices == expected.node_indices
+    assert sd.is_isomorphic(expected)
+    sd.detach_store()
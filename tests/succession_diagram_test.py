@@ -1,9 +1,17 @@
+import os
 import unittest
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any
 
+import pytest
 from biodivine_aeon import AsynchronousGraph, Attractors, BooleanNetwork
 
 import biobalm
 import biobalm.succession_diagram
+from biobalm._sd_attractors import attractor_parallel
+from biobalm.instrumentation import logging_callback
+from biobalm.interaction_graph_utils import feedback_vertex_set
 from biobalm.succession_diagram import SuccessionDiagram
 from biobalm.types import BooleanSpace
 
@@ -116,6 +124,88 @@ def test_state():
     assert sd1.summary() == sd2.summary()
 
 
+def test_old_state():
+    # States pickled by older versions miss some of the newer data.
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+    sd = SuccessionDiagram(bn)
+    sd.build()
+    state: dict[str, Any] = dict(sd.__getstate__())
+    old_options = [
+        "debug",
+        "max_motifs_per_node",
+        "nfvs_size_threshold",
+        "pint_goal_size_limit",
+        "attractor_candidates_limit",
+        "retained_set_optimization_threshold",
+        "minimum_simulation_budget",
+    ]
+    state["config"] = {k: sd.config[k] for k in old_options}  # type: ignore
+    state["petri_net"] = sd.petri_net.to_networkx()
+    state["dag"] = sd.dag.copy()  # type: ignore
+    for node_id in sd.node_ids():
+        node = state["dag"].nodes[node_id]
+        del node["deferred"]
+        del node["unresolved"]
+        if node["percolated_petri_net"] is not None:
+            node["percolated_petri_net"] = node["percolated_petri_net"].to_networkx()
+    old = SuccessionDiagram.__new__(SuccessionDiagram)
+    old.__setstate__(state)  # type: ignore
+    assert old.config == sd.config
+    assert set(old.petri_net.to_networkx().edges) == set(  # type: ignore
+        sd.petri_net.to_networkx().edges  # type: ignore
+    )
+    assert old.expanded_attractor_seeds() == sd.expanded_attractor_seeds()
+
+
+def test_save_load(tmp_path: Path):
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+    sd = SuccessionDiagram(bn)
+    assert not sd.expand_bfs(bfs_level_limit=4)
+    for node_id in sd.minimal_trap_spaces():
+        sd.node_attractor_seeds(node_id, compute=True)
+    sd.node_percolated_nfvs(sd.root(), compute=True)
+
+    path = str(tmp_path / "sd.bin")
+    sd.save(path)
+    loaded = SuccessionDiagram.load(path)
+    assert loaded.config == sd.config
+    assert loaded.nfvs == sd.nfvs
+    assert loaded.node_indices == sd.node_indices
+    assert str(loaded.petri_net) == str(sd.petri_net)
+    assert loaded.summary() == sd.summary()
+    for node_id in sd.node_ids():
+        data = sd.node_data(node_id)
+        loaded_data = loaded.node_data(node_id)
+        for key in ["space", "depth", "expanded", "percolated_nfvs"]:
+            assert loaded_data[key] == data[key]
+        assert loaded_data["attractor_seeds"] == data["attractor_seeds"]
+        if not data["expanded"]:
+            continue
+        assert loaded.node_successors(node_id) == sd.node_successors(node_id)
+        for child_id in sd.node_successors(node_id):
+            assert loaded.edge_stable_motif(node_id, child_id) == sd.edge_stable_motif(
+                node_id, child_id
+            )
+
+    # The loaded diagram can be expanded further.
+    assert loaded.expand_bfs()
+    assert sd.expand_bfs()
+    assert loaded.is_isomorphic(sd)
+
+    try:
+        sd.save(path, compress=True)
+    except RuntimeError:
+        # The `zstandard` package is not installed.
+        pass
+    else:
+        assert SuccessionDiagram.load(path).is_isomorphic(sd)
+
+    with open(path, "wb") as file:
+        file.write(b"not a succession diagram")
+    with pytest.raises(ValueError):
+        SuccessionDiagram.load(path)
+
+
 def test_expansion_depth_limit_bfs():
     bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
 
@@ -317,3 +407,339 @@ def test_attractor_extraction():
     sd.build()
     eas = sd.expanded_attractor_seeds()
     assert eas == {1: [{"A": 0, "B": 0, "C": 1}], 2: [{"A": 1, "B": 1, "C": 1}]}
+
+
+def test_expansion_parallel():
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+
+    sd_serial = SuccessionDiagram(bn)
+    assert sd_serial.expand_bfs()
+
+    sd_bfs = SuccessionDiagram(bn)
+    assert sd_bfs.expand_bfs(parallel=2)
+    assert len(sd_bfs) == 432
+    # Parallel expansion must create exactly the same nodes in the same order.
+    assert sd_bfs.node_indices == sd_serial.node_indices
+    assert sd_bfs.is_isomorphic(sd_serial)
+
+    sd_dfs = SuccessionDiagram(bn)
+    assert not sd_dfs.expand_dfs(size_limit=200, parallel=2)
+    assert sd_dfs.expand_dfs(parallel=2)
+    assert sd_dfs.is_isomorphic(sd_serial)
+
+
+def test_attractors_parallel():
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+
+    sd_serial = SuccessionDiagram(bn)
+    sd_serial.build()
+
+    sd = SuccessionDiagram(bn)
+    sd.build(parallel=2)
+    assert sd.expanded_attractor_seeds() == sd_serial.expanded_attractor_seeds()
+
+    sd = SuccessionDiagram(bn)
+    sd.expand_bfs()
+    candidates = sd.expanded_attractor_candidates(parallel=2)
+    seeds = sd.expanded_attractor_seeds(parallel=2)
+    sets = sd.expanded_attractor_sets(parallel=2)
+    assert candidates.keys() == seeds.keys() == sets.keys()
+    for node_id, node_sets in sets.items():
+        assert len(node_sets) == len(seeds[node_id])
+        for seed, node_set in zip(seeds[node_id], node_sets):
+            assert sd.symbolic.mk_subspace_vertices(seed).is_subset(node_set)
+
+
+def _crash_worker(node_id: int, data: str):
+    os._exit(1)
+
+
+def test_attractors_parallel_crash(monkeypatch: pytest.MonkeyPatch):
+    # A crashed worker is reported with a generic message (no memory limit).
+    monkeypatch.setattr(attractor_parallel, "_node_attractor_job", _crash_worker)
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+    sd = SuccessionDiagram(bn)
+    sd.expand_bfs()
+    with pytest.raises(RuntimeError, match="failed in a worker process") as error:
+        sd.expanded_attractor_seeds(parallel=2)
+    assert isinstance(error.value.__cause__, BrokenProcessPool)
+
+
+def test_expansion_checkpoint(tmp_path: Path):
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+
+    sd_bfs = SuccessionDiagram(bn)
+    assert sd_bfs.expand_bfs()
+    sd_dfs = SuccessionDiagram(bn)
+    assert sd_dfs.expand_dfs()
+
+    # Expansion stopped by the size limit continues where it stopped.
+    path = str(tmp_path / "bfs.sqlite")
+    sd = SuccessionDiagram(bn)
+    assert not sd.expand_bfs(size_limit=200, checkpoint=path)
+    (sd, result) = SuccessionDiagram.resume_from(path, size_limit=300)
+    assert not result
+    assert len(sd) >= 300
+    (sd, result) = SuccessionDiagram.resume_from(path, size_limit=500)
+    assert result
+    assert sd.node_indices == sd_bfs.node_indices
+    assert sd.is_isomorphic(sd_bfs)
+    # The finished expansion is not repeated.
+    (sd, result) = SuccessionDiagram.resume_from(path)
+    assert result and len(sd) == 432
+
+    path = str(tmp_path / "dfs.sqlite")
+    sd = SuccessionDiagram(bn)
+    assert not sd.expand_dfs(size_limit=200, checkpoint=path)
+    (sd, result) = SuccessionDiagram.resume_from(path, size_limit=500)
+    assert result
+    assert sd.node_indices == sd_dfs.node_indices
+    assert sd.is_isomorphic(sd_dfs)
+
+
+def test_expansion_checkpoint_reused_path(tmp_path: Path):
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+    expected = SuccessionDiagram(bn)
+    assert expected.expand_dfs()
+
+    # A stale checkpoint of a different algorithm is replaced by a new expansion.
+    path = str(tmp_path / "sd.sqlite")
+    sd = SuccessionDiagram(bn)
+    assert not sd.expand_bfs(size_limit=200, checkpoint=path)
+    sd = SuccessionDiagram(bn)
+    assert not sd.expand_dfs(size_limit=200, checkpoint=path)
+    (sd, result) = SuccessionDiagram.resume_from(path, size_limit=500)
+    assert result
+    assert sd.node_indices == expected.node_indices
+    assert sd.is_isomorphic(expected)
+
+
+def test_expansion_checkpoint_crash(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Simulate an expansion which crashes after a fixed number of steps, with
+    # a checkpoint created after every step.
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+    config = SuccessionDiagram.default_config()
+    config["checkpoint_interval"] = 0
+
+    expand_one_node = SuccessionDiagram._expand_one_node  # type: ignore
+    calls = [0]
+
+    def crashing_expand_one_node(self: SuccessionDiagram, *args: Any):
+        calls[0] += 1
+        if calls[0] > 30:
+            raise KeyboardInterrupt()
+        expand_one_node(self, *args)
+
+    for method in ["bfs", "scc", "attractor_seeds"]:
+        expected = SuccessionDiagram(bn, config)
+        sd = SuccessionDiagram(bn, config)
+        path = str(tmp_path / f"{method}.sqlite")
+        calls[0] = 0
+        monkeypatch.setattr(
+            SuccessionDiagram, "_expand_one_node", crashing_expand_one_node
+        )
+        with pytest.raises(KeyboardInterrupt):
+            if method == "bfs":
+                sd.expand_bfs(checkpoint=path)
+            elif method == "scc":
+                sd.expand_scc(checkpoint=path)
+            else:
+                sd.expand_attractor_seeds(checkpoint=path)
+        monkeypatch.undo()
+
+        if method == "bfs":
+            assert expected.expand_bfs()
+        elif method == "scc":
+            assert expected.expand_scc()
+        else:
+            assert expected.expand_attractor_seeds()
+
+        (sd, result) = SuccessionDiagram.resume_from(path)
+        assert result
+        assert sd.is_isomorphic(expected)
+        assert sd.expanded_attractor_seeds() == expected.expanded_attractor_seeds()
+
+
+def test_instrumentation():
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+    sd = SuccessionDiagram(bn)
+    finished: list[tuple[str, int | None]] = []
+    sd.instrumentation.add_callback(
+        lambda phase, node_id, _: finished.append((phase, node_id))  # type: ignore
+    )
+    sd.instrumentation.add_callback(logging_callback())
+    # Drop the data measured while creating the root node.
+    sd.instrumentation.clear()
+    assert sd.expand_bfs()
+    for node_id in sd.node_ids():
+        sd.node_attractor_seeds(node_id, compute=True)
+
+    report = sd.instrumentation.report()
+    for phase in ["expansion", "trappist", "grounding", "nfvs", "attractor_candidates"]:
+        assert report["phases"][phase]["calls"] > 0
+    assert report["counters"]["expanded_nodes"] == len(sd)
+    assert ("expansion", sd.root()) in finished
+    assert len(finished) == sum(x["calls"] for x in report["phases"].values())
+
+    # The nested phases are not counted twice in the node totals.
+    root = report["nodes"][sd.root()]
+    assert root["total"] >= root["expansion"] >= root["trappist"]
+    assert isinstance(sd.instrumentation.summary(), str)
+
+    # The report is a copy and the data can be cleared.
+    sd.instrumentation.clear()
+    assert len(report["phases"]) > 0
+    assert sd.instrumentation.report()["phases"] == {}
+
+
+def test_node_budget(tmp_path: Path):
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+
+    # A node which cannot be expanded within its budget is deferred,
+    # but the expansion still finishes.
+    config = SuccessionDiagram.default_config()
+    config["node_time_limit"] = 0.0
+    sd = SuccessionDiagram(bn, config)
+    assert sd.expand_bfs()
+    assert list(sd.deferred_ids()) == [sd.root()]
+    assert sd.node_successors(sd.root(), compute=True) == []
+
+    # The same applies to the attractor detection of an expanded node.
+    sd = SuccessionDiagram(bn)
+    assert sd.expand_bfs()
+    sd.config["node_time_limit"] = 0.0
+    with pytest.raises(TimeoutError):
+        sd.node_attractor_seeds(sd.root(), compute=True)
+    assert list(sd.deferred_ids()) == [sd.root()]
+    # The remaining nodes are deferred as well, but no error is raised.
+    assert sd.root() not in sd.expanded_attractor_seeds()
+    deferred = list(sd.deferred_ids())
+    assert sd.instrumentation.report()["counters"]["deferred_nodes"] == len(deferred)
+
+    path = str(tmp_path / "sd.bin")
+    sd.save(path)
+    assert list(SuccessionDiagram.load(path).deferred_ids()) == deferred
+
+
+def test_symbolic_limits(tmp_path: Path):
+    # The root node contains a motif-avoidant attractor.
+    bn = BooleanNetwork.from_bnet(
+        """
+        A, !A & !B | C
+        B, !A & !B | C
+        C, A & B
+        """
+    )
+
+    # Once the limit is exceeded, the node is unresolved, but other
+    # nodes are still processed.
+    config = SuccessionDiagram.default_config()
+    config["symbolic_size_limit"] = 1
+    sd = SuccessionDiagram(bn, config)
+    sd.build()
+    assert list(sd.unresolved_ids()) == [sd.root()]
+    assert len(sd.node_attractor_candidates(sd.root())) > 0
+    seeds = sd.expanded_attractor_seeds()
+    assert sd.root() not in seeds and len(seeds) == 1
+    with pytest.raises(RuntimeError):
+        sd.node_attractor_seeds(sd.root(), compute=True)
+    assert sd.instrumentation.report()["counters"]["unresolved_nodes"] == 2
+
+    path = str(tmp_path / "sd.bin")
+    sd.save(path)
+    assert list(SuccessionDiagram.load(path).unresolved_ids()) == [sd.root()]
+
+    # Nodes computed by worker processes are marked in the same way.
+    parallel_sd = SuccessionDiagram(bn, config)
+    parallel_sd.build(parallel=2)
+    assert list(parallel_sd.unresolved_ids()) == [sd.root()]
+    assert parallel_sd.expanded_attractor_seeds() == seeds
+
+    # With a sufficient limit, the node is resolved.
+    sd.config["symbolic_size_limit"] = None
+    sd.config["symbolic_time_limit"] = 60.0
+    assert len(sd.node_attractor_seeds(sd.root(), compute=True)) == 1
+    assert list(sd.unresolved_ids()) == []
+
+
+def test_attractor_sets_eviction():
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+    sd = SuccessionDiagram(bn)
+    sd.build()
+    expected = sd.expanded_attractor_sets()
+    assert len(expected) > 1
+
+    config = SuccessionDiagram.default_config()
+    config["attractor_sets_cache_size"] = 1
+    evicting = SuccessionDiagram(bn, config)
+    evicting.build()
+    for node_id, sets in expected.items():
+        assert evicting.node_attractor_sets(node_id, compute=True) == sets
+        assert list(evicting.attractor_sets_lru) == [node_id]
+    evicted = evicting.instrumentation.report()["counters"]["evicted_attractor_sets"]
+    assert evicted == len(expected) - 1
+
+    # Evicted sets are recomputed on demand.
+    (first, last) = (min(expected), max(expected))
+    assert evicting.node_data(first)["attractor_sets"] is None
+    assert evicting.node_attractor_sets(first) == expected[first]
+    assert evicting.node_data(last)["attractor_sets"] is None
+    assert evicting.node_attractor_summaries(last) == sd.node_attractor_summaries(
+        last
+    )
+
+    # Sets of nodes without known seeds are not computed.
+    fresh = SuccessionDiagram(bn, config)
+    fresh.build()
+    unknown = [
+        node_id
+        for node_id in fresh.node_ids()
+        if fresh.node_data(node_id)["attractor_seeds"] is None
+    ]
+    with pytest.raises(KeyError):
+        fresh.node_attractor_sets(unknown[0])
+
+    sd.reclaim_node_data(attractor_sets=True)
+    assert len(sd.attractor_sets_lru) == 0
+    assert sd.node_data(last)["attractor_sets"] is None
+
+
+def test_attractor_summaries():
+    # A complex attractor in `c=0` and a fixed-point `a=0,b=0,c=1`.
+    bn = BooleanNetwork.from_bnet(
+        """
+        a, !b & !c
+        b, a & !c
+        c, c & !a & !b
+        """
+    )
+    sd = SuccessionDiagram(bn)
+    sd.build()
+    summaries = {
+        node_id: sd.node_attractor_summaries(node_id, compute=True)
+        for node_id in sd.node_ids()
+    }
+    assert sorted(
+        (sorted(s["fixed"].items()), s["oscillating"], s["cardinality"])
+        for node_summaries in summaries.values()
+        for s in node_summaries
+    ) == [
+        ([("a", 0), ("b", 0), ("c", 1)], [], 1),
+        ([("c", 0)], ["a", "b"], 4),
+    ]
+
+
+def test_percolated_nfvs():
+    # The incrementally computed NFVS of every node must be a valid NFVS
+    # of the percolated network, with every vertex on some negative cycle.
+    bn = BooleanNetwork.from_file("models/bbm-bnet-inputs-true/033.bnet")
+    sd = SuccessionDiagram(bn)
+    assert sd.expand_bfs()
+    for node_id in sd.node_ids():
+        nfvs = sd.node_percolated_nfvs(node_id, compute=True)
+        network = sd.node_percolated_network(node_id)
+        remaining = [x for x in network.variable_names() if x not in nfvs]
+        assert feedback_vertex_set(network, "negative", remaining) == []
+        for var in nfvs:
+            assert network.shortest_cycle(var, "negative", remaining + [var])
+    assert sd.nfvs_cache.misses > 0
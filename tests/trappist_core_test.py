@@ -2,7 +2,12 @@ from biodivine_aeon import AsynchronousGraph, BooleanNetwork, FixedPoints
 
 from biobalm.interaction_graph_utils import cleanup_network
 from biobalm.petri_net_translation import network_to_petrinet
-from biobalm.trappist_core import compute_fixed_point_reduced_STG, trappist
+from biobalm.trappist_core import (
+    FixedPointSession,
+    compute_fixed_point_reduced_STG,
+    iter_trap_spaces,
+    trappist,
+)
 from biobalm.types import BooleanSpace
 
 
@@ -124,3 +129,91 @@ def test_network_fixed_point_reduced_STG():
         avoid_subspaces=[avoid_subspace_3],
     )
     assert len(candidate_set) == 1  # candidate_set = {10}
+
+
+def test_fixed_point_session(network_file: str):
+    # A single session must give the same results as independent queries,
+    # regardless of the order in which the queries are evaluated.
+    bn = cleanup_network(BooleanNetwork.from_file(network_file))
+    petri_net = network_to_petrinet(bn)
+    variables = sorted(bn.get_variable_name(v) for v in bn.variables())
+
+    def normalize(spaces: list[BooleanSpace]) -> list[list[tuple[str, int]]]:
+        return sorted(sorted(s.items()) for s in spaces)
+
+    fixed_points = trappist(petri_net, problem="fix")
+
+    queries: list[tuple[BooleanSpace, BooleanSpace, list[BooleanSpace]]] = [
+        ({}, {}, []),
+    ]
+    for var in variables[:5]:
+        queries.append(({var: 0}, {}, []))
+        queries.append(({var: 1}, {}, [{var: 0}]))
+        queries.append(({v: 1 for v in variables}, {var: 1}, [{var: 0}, {}]))
+
+    session = FixedPointSession(petri_net)
+    for retained_set, ensure_subspace, avoid_subspaces in queries + queries:
+        expected = compute_fixed_point_reduced_STG(
+            petri_net,
+            retained_set,
+            ensure_subspace=ensure_subspace,
+            avoid_subspaces=avoid_subspaces,
+        )
+        result = session.solve(
+            retained_set,
+            ensure_subspace=ensure_subspace,
+            avoid_subspaces=avoid_subspaces,
+        )
+        assert normalize(result) == normalize(expected)
+        if len(retained_set) == 0 and len(avoid_subspaces) == 0:
+            assert normalize(result) == normalize(fixed_points)
+        if {} in avoid_subspaces:
+            assert len(result) == 0
+
+
+def test_backend_encoding(network_file: str):
+    # The backend and text encodings must produce the same solutions
+    # (the order of the solutions can be different).
+    bn = cleanup_network(BooleanNetwork.from_file(network_file))
+    petri_net = network_to_petrinet(bn)
+    variables = bn.variable_names()
+
+    def normalize(spaces: list[BooleanSpace]) -> list[list[tuple[str, int]]]:
+        return sorted(sorted(s.items()) for s in spaces)
+
+    ensure_subspace: BooleanSpace = {variables[0]: 1}
+    avoid_subspaces: list[BooleanSpace] = [{variables[-1]: 0}]
+    for problem in ["min", "max", "fix"]:
+        for reverse_time in [False, True]:
+            for ensure, avoid in [({}, []), (ensure_subspace, avoid_subspaces)]:
+                results = [
+                    trappist(
+                        petri_net,
+                        problem=problem,  # type: ignore
+                        reverse_time=reverse_time,
+                        ensure_subspace=ensure,
+                        avoid_subspaces=avoid,
+                        use_backend=use_backend,
+                    )
+                    for use_backend in [True, False]
+                ]
+                assert normalize(results[0]) == normalize(results[1])
+
+
+def test_iter_trap_spaces(network_file: str):
+    bn = cleanup_network(BooleanNetwork.from_file(network_file))
+    petri_net = network_to_petrinet(bn)
+
+    for problem in ["min", "max", "fix"]:
+        expected = trappist(petri_net, problem=problem)  # type: ignore
+        assert list(iter_trap_spaces(petri_net, problem=problem)) == expected  # type: ignore
+        assert (
+            list(iter_trap_spaces(petri_net, problem=problem, solution_limit=2))  # type: ignore
+            == expected[:2]
+        )
+
+        # The enumeration can be stopped at any point.
+        spaces = iter_trap_spaces(petri_net, problem=problem)  # type: ignore
+        first = next(spaces, None)
+        spaces.close()
+        assert first == (expected[0] if len(expected) > 0 else None)